@@ -29,6 +29,14 @@ from fastapi.middleware.cors import CORSMiddleware
 # from parentdashboard.api.routes import router as parent_router
 from therapygeneration.api.routes import router as therapy_router
 
+# The pronunciation service needs its audio/ML stack (librosa, scikit-learn, ...);
+# without it the rest of the API still starts
+try:
+    from voice_pronounciation_detection.api import router as pronunciation_router
+except ImportError as e:
+    pronunciation_router = None
+    print(f"[WARN] Pronunciation API disabled: {e}")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Parent Dashboard API",
@@ -48,6 +56,8 @@ app.add_middleware(
 # Include routers
 # app.include_router(parent_router)
 app.include_router(therapy_router)
+if pronunciation_router is not None:
+    app.include_router(pronunciation_router)
 
 
 @app.get("/")
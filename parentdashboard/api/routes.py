@@ -38,16 +38,20 @@ async def ask_question(request: QuestionRequest):
 
 
 @router.post("/reload")
-async def reload_knowledge_base():
+async def reload_knowledge_base(force: bool = False):
     """
     Reload the knowledge base from PDFs.
     This endpoint allows refreshing the vector store with updated PDFs.
+    Only new or changed PDFs are re-embedded; chunks of removed PDFs are deleted.
+    
+    Args:
+        force: Re-index every PDF from scratch (query parameter)
     
     Returns:
-        Status message
+        Status message with the added, updated and removed PDFs
     """
     try:
-        result = qa_service.reload_knowledge_base()
+        result = qa_service.reload_knowledge_base(force=force)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reloading knowledge base: {str(e)}")
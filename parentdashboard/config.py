@@ -27,6 +27,14 @@ PDFS_DIR = BASE_DIR / "parentdashboard" / "data" / "pdfs"
 # Chroma DB directory
 CHROMA_DB_DIR = BASE_DIR / "chroma_db"
 
+# Record of what is indexed per PDF (content hash, pages, chunk IDs), kept next to Chroma DB
+KB_MANIFEST_PATH = CHROMA_DB_DIR / "kb_manifest.json"
+
+# Derived data that can be rebuilt from the PDFs (e.g. extracted page text), safe to delete
+CACHE_DIR = BASE_DIR / "cache"
+PDF_TEXT_CACHE_DIR = CACHE_DIR / "pdf_text"
+EMBEDDING_CACHE_DIR = CACHE_DIR / "embeddings"
+
 # API Configuration
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
@@ -49,6 +57,17 @@ CHUNK_OVERLAP = 200  # Overlap between chunks
 EMBEDDING_MODEL = "intfloat/multilingual-e5-large"  # Multilingual model supporting Sinhala + English
 TOP_K_RETRIEVAL = 5  # Increased to get more context for better answers
 
+# PDF text extraction: processes used when indexing, and pages per task so large PDFs are split across them
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(8, os.cpu_count() or 1))))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+
+# Chunks embedded and written to the vector store at a time when indexing; progress is
+# checkpointed after each batch, so an interrupted re-index resumes from the last one
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+
+# Storage type of cached passage embeddings: "float16" (half the disk) or "float32"
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float16")
+
 # Ensure directories exist
 PDFS_DIR.mkdir(parents=True, exist_ok=True)
 CHROMA_DB_DIR.mkdir(parents=True, exist_ok=True)
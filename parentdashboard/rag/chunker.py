@@ -2,7 +2,7 @@
 Text chunking module for RAG pipeline.
 Splits text into overlapping chunks for better retrieval.
 """
-from typing import List
+from typing import Iterable, Iterator, List
 from parentdashboard.config import CHUNK_SIZE, CHUNK_OVERLAP
 
 
@@ -48,29 +48,38 @@ def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVE
     return chunks
 
 
-def chunk_documents(documents: List[dict]) -> List[dict]:
+def iter_chunk_documents(documents: Iterable[dict]) -> Iterator[dict]:
     """
-    Chunk a list of documents (from PDF loader).
+    Chunk documents (from PDF loader) lazily, one page at a time.
     
     Args:
-        documents: List of document dicts with 'text', 'source', and optionally 'page'
+        documents: Document dicts with 'text', 'source', and optionally 'page'
     
-    Returns:
-        List of chunked documents with metadata
+    Yields:
+        Chunked documents with metadata, in the same order as chunk_documents
     """
-    chunked_docs = []
-    
     for doc in documents:
         chunks = chunk_text(doc['text'])
         
         for idx, chunk in enumerate(chunks):
-            chunked_docs.append({
+            yield {
                 'text': chunk,
                 'source': doc['source'],
                 'page': doc.get('page', None),
                 'chunk_index': idx,
                 'total_chunks': len(chunks)
-            })
+            }
+
+
+def chunk_documents(documents: List[dict]) -> List[dict]:
+    """
+    Chunk a list of documents (from PDF loader).
+    
+    Args:
+        documents: List of document dicts with 'text', 'source', and optionally 'page'
     
-    return chunked_docs
+    Returns:
+        List of chunked documents with metadata
+    """
+    return list(iter_chunk_documents(documents))
 
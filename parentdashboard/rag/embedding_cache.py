@@ -0,0 +1,195 @@
+"""
+Embedding cache module for RAG pipeline.
+Keeps passage embeddings on disk so text that was embedded before never goes through the model again.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from parentdashboard.config import EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_DTYPE
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+KEY_SIZE = 32  # Bytes of a SHA-256 digest
+
+
+class EmbeddingCache:
+    """
+    Content-addressed store of embeddings for one model.
+    
+    Each entry is keyed by the SHA-256 of the exact text given to the model
+    (including the "passage: " prefix). Vectors are appended to a flat binary
+    file read through a memory map, and their keys to an index file in the
+    same order, so row i of one belongs to key i of the other. Vectors are
+    written before their keys; after a crash, rows without a key are ignored.
+    
+    Several processes may share the files: appends hold an exclusive file lock,
+    and entries other processes added are picked up before each lookup.
+    """
+    
+    def __init__(self, model_name: str, directory: Path = EMBEDDING_CACHE_DIR, dtype: str = EMBEDDING_CACHE_DTYPE):
+        """
+        Args:
+            model_name: Embedding model; each model (and dtype) has its own files
+            directory: Cache directory (created on first write)
+            dtype: Storage type of the vectors, "float16" (half the size) or "float32"
+        """
+        self.dtype = np.dtype(dtype)
+        self.directory = Path(directory) / re.sub(r'[^A-Za-z0-9._-]+', '_', model_name) / self.dtype.name
+        self.vectors_path = self.directory / "vectors.bin"
+        self.keys_path = self.directory / "keys.bin"
+        self.meta_path = self.directory / "meta.json"
+        self.lock_path = self.directory / "lock"
+        self.dim: Optional[int] = None
+        self.rows: Dict[bytes, int] = {}  # key -> row in the vectors file
+        self._count = 0  # Complete rows in the vectors file
+        self._vectors: Optional[np.memmap] = None  # Mapped over the first self._count rows
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+    
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.sha256(text.encode('utf-8')).digest()
+    
+    def _load(self) -> None:
+        """Read the index of an existing cache."""
+        try:
+            self._refresh()
+        except Exception as e:
+            print(f"Ignoring unreadable embedding cache {self.directory}: {str(e)}")
+            self.dim = None
+    
+    def _complete_rows(self) -> int:
+        """Entries on disk with both their vector and their key fully written."""
+        try:
+            keys_size = self.keys_path.stat().st_size
+            vectors_size = self.vectors_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+        return min(keys_size // KEY_SIZE, vectors_size // (self.dim * self.dtype.itemsize))
+    
+    def _refresh(self) -> None:
+        """Index the entries appended since the last look, by this or another process."""
+        if self.dim is None:
+            try:
+                with open(self.meta_path, 'r', encoding='utf-8') as f:
+                    self.dim = json.load(f)['dim']
+            except FileNotFoundError:
+                return
+        
+        count = self._complete_rows()
+        if count <= self._count:
+            return
+        with open(self.keys_path, 'rb') as f:
+            f.seek(self._count * KEY_SIZE)
+            keys = f.read((count - self._count) * KEY_SIZE)
+        for offset in range(count - self._count):
+            self.rows.setdefault(keys[offset * KEY_SIZE:(offset + 1) * KEY_SIZE], self._count + offset)
+        self._count = count
+    
+    @contextmanager
+    def _file_lock(self):
+        """Hold the exclusive lock between processes appending to this cache."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield  # Closing the file releases the lock
+    
+    def _trim(self) -> int:
+        """
+        Cut a crashed writer's partly written last entry (caller holds the file lock).
+        
+        Returns:
+            Number of complete entries, i.e. the row the next append starts at
+        """
+        count = self._complete_rows()
+        for path, size in ((self.keys_path, count * KEY_SIZE), (self.vectors_path, count * self.dim * self.dtype.itemsize)):
+            if path.exists() and path.stat().st_size != size:
+                os.truncate(path, size)
+        return count
+    
+    def _mapped_vectors(self) -> np.memmap:
+        # Appends don't grow an existing map, so it is re-created when rows were added
+        if self._vectors is None or self._vectors.shape[0] != self._count:
+            self._vectors = np.memmap(self.vectors_path, dtype=self.dtype, mode='r', shape=(self._count, self.dim))
+        return self._vectors
+    
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up the embeddings of several texts.
+        
+        Args:
+            texts: Exact texts given to the model
+        
+        Returns:
+            One float32 vector per text, or None where it isn't cached
+        """
+        with self._lock:
+            try:
+                self._refresh()
+            except Exception as e:
+                print(f"Could not read new embedding cache entries: {str(e)}")
+            rows = [self.rows.get(self.key(text)) for text in texts]
+            found = [row for row in rows if row is not None]
+            self.hits += len(found)
+            self.misses += len(rows) - len(found)
+            if not found:
+                return [None] * len(texts)
+            vectors = self._mapped_vectors()
+            return [None if row is None else np.asarray(vectors[row], dtype=np.float32) for row in rows]
+    
+    def put_many(self, texts: List[str], embeddings: np.ndarray) -> None:
+        """
+        Store the embeddings of several texts (ones already cached are skipped).
+        
+        Args:
+            texts: Exact texts given to the model
+            embeddings: One vector per text
+        """
+        embeddings = np.asarray(embeddings)
+        with self._lock, self._file_lock():
+            # Other processes may have appended since the last look
+            self._refresh()
+            new_rows = {}
+            for text, vector in zip(texts, embeddings):
+                key = self.key(text)
+                if key not in self.rows and key not in new_rows:
+                    new_rows[key] = vector
+            if not new_rows:
+                return
+            
+            if self.dim is None:
+                self.dim = int(embeddings.shape[1])
+                # Readers don't take the lock, so they must never see a partial file
+                tmp_path = self.meta_path.with_suffix(f'.{os.getpid()}.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'dim': self.dim, 'dtype': self.dtype.name}, f)
+                os.replace(tmp_path, self.meta_path)
+            
+            # The files' own length says where this append starts; no other writer can
+            # move it while the lock is held
+            start = self._trim()
+            
+            # Vectors first: a key is only ever written once its vector is on disk
+            with open(self.vectors_path, 'ab') as f:
+                f.write(np.asarray(list(new_rows.values()), dtype=self.dtype).tobytes())
+            with open(self.keys_path, 'ab') as f:
+                f.write(b''.join(new_rows))
+            
+            for offset, key in enumerate(new_rows):
+                self.rows[key] = start + offset
+            self._count = start + len(new_rows)
+    
+    def stats(self) -> Dict:
+        return {'directory': str(self.directory), 'entries': len(self.rows), 'hits': self.hits, 'misses': self.misses}
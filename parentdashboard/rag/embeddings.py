@@ -4,31 +4,37 @@ Generates vector embeddings for text chunks.
 Supports multilingual queries (Sinhala + English).
 """
 
-from typing import List
+from typing import List, Optional
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from parentdashboard.config import EMBEDDING_MODEL
+from parentdashboard.rag.embedding_cache import EmbeddingCache
 
 
 class EmbeddingGenerator:
     """Generates embeddings for text using sentence transformers."""
 
-    def __init__(self, model_name: str = EMBEDDING_MODEL):
+    def __init__(self, model_name: str = EMBEDDING_MODEL, cache: Optional[EmbeddingCache] = None):
         """
         Initialize the embedding model.
 
         Args:
             model_name: Name of the sentence transformer model
+            cache: Passage embedding cache for this model; cached passages are
+                not encoded again
         """
         print(f"Loading embedding model: {model_name}")
         self.model = SentenceTransformer(model_name)
+        self.cache = cache
         print("Embedding model loaded successfully")
 
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings(self, texts: List[str], show_progress_bar: bool = True) -> List[List[float]]:
         """
         Generate embeddings for document passages (PDF chunks).
 
         Args:
             texts: List of text strings to embed
+            show_progress_bar: Show the encoder's progress bar (off for small batches)
 
         Returns:
             List of embedding vectors
@@ -39,15 +45,29 @@ class EmbeddingGenerator:
         # REQUIRED for multilingual-e5 models
         passages = [f"passage: {text}" for text in texts]
 
-        embeddings = self.model.encode(
+        if self.cache is None:
+            return self._encode_passages(passages, show_progress_bar).tolist()
+
+        embeddings = self.cache.get_many(passages)
+        # Each distinct passage is encoded once, however often it repeats
+        missing = list(dict.fromkeys(passage for passage, embedding in zip(passages, embeddings) if embedding is None))
+        if missing:
+            encoded = self._encode_passages(missing, show_progress_bar)
+            self.cache.put_many(missing, encoded)
+            # Rounded to the cache's storage type, so a passage gets the same vector cached or not
+            fresh = dict(zip(missing, encoded.astype(self.cache.dtype).astype(np.float32)))
+            embeddings = [fresh[passage] if embedding is None else embedding for passage, embedding in zip(passages, embeddings)]
+
+        return np.stack(embeddings).tolist()
+
+    def _encode_passages(self, passages: List[str], show_progress_bar: bool) -> np.ndarray:
+        return self.model.encode(
             passages,
-            show_progress_bar=True,
+            show_progress_bar=show_progress_bar,
             convert_to_numpy=True,
             normalize_embeddings=True
         )
 
-        return embeddings.tolist()
-
     def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for a user query (Sinhala or English).
@@ -2,49 +2,251 @@
 PDF loader module for RAG pipeline.
 Loads PDFs from the knowledge base directory.
 """
+import multiprocessing
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 import PyPDF2
-from parentdashboard.config import PDFS_DIR
+from parentdashboard.config import PDFS_DIR, PDF_EXTRACT_WORKERS, PDF_PAGES_PER_TASK
+from parentdashboard.rag.manifest import content_hash
+from parentdashboard.rag.text_cache import PageTextCache
 
 
-def load_pdfs() -> List[dict]:
+def list_pdf_files() -> List[Path]:
     """
-    Load all PDF files from the PDFs directory.
+    List the PDF files in the PDFs directory.
     
     Returns:
-        List of dictionaries containing 'text' and 'source' (filename) for each page.
+        Paths of all PDF files, sorted by name
     """
-    pdf_data = []
-    
     if not PDFS_DIR.exists():
         PDFS_DIR.mkdir(parents=True, exist_ok=True)
-        return pdf_data
+        return []
+    
+    return sorted(PDFS_DIR.glob("*.pdf"))
+
+
+def count_pages(pdf_path: Path) -> int:
+    """Number of pages in a PDF (reads the page tree only, no text)."""
+    with open(pdf_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def extract_page_range(pdf_path: Path, start: int, end: int) -> Tuple[List[dict], float]:
+    """
+    Extract the text of pages [start, end) of one PDF. Runs in the worker processes.
+    
+    Args:
+        pdf_path: Path of the PDF file
+        start: First page index (0-based)
+        end: Page index to stop before
+    
+    Returns:
+        Tuple of (list of dictionaries containing 'text', 'source' and 'page' for each
+        non-empty page, seconds spent)
+    """
+    started = time.perf_counter()
+    pdf_data = []
+    
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        
+        for page_num in range(start, end):
+            text = pdf_reader.pages[page_num].extract_text()
+            if text.strip():  # Only add non-empty pages
+                pdf_data.append({
+                    'text': text,
+                    'source': pdf_path.name,
+                    'page': page_num + 1
+                })
+    
+    return pdf_data, time.perf_counter() - started
+
+
+def _prepare_extraction(pdf_path: Path, cache: Optional[PageTextCache]) -> dict:
+    """Hash one PDF and take its text from the cache, or count its pages for extraction."""
+    result = {'path': pdf_path, 'sha256': None, 'documents': [], 'pages': 0, 'seconds': 0.0,
+              'cached': False, 'error': None}
+    started = time.perf_counter()
     
-    # Get all PDF files
-    pdf_files = list(PDFS_DIR.glob("*.pdf"))
+    # Page counts are cheap; a file that can't even be opened fails here
+    try:
+        result['sha256'] = content_hash(pdf_path)
+        cached = cache.get(result['sha256'], pdf_path.name) if cache is not None else None
+        if cached is not None:
+            result.update(cached, cached=True)
+        else:
+            result['pages'] = count_pages(pdf_path)
+    except Exception as e:
+        result['error'] = str(e)
     
-    if not pdf_files:
-        return pdf_data
+    result['seconds'] += time.perf_counter() - started
+    return result
+
+
+def _page_ranges(result: dict, pages_per_task: int) -> List[Tuple[int, int]]:
+    """Page ranges still to extract for a prepared file (none if cached or failed)."""
+    if result['cached'] or result['error'] is not None:
+        return []
+    return [(start, min(start + pages_per_task, result['pages'])) for start in range(0, result['pages'], pages_per_task)]
+
+
+def _finish_extraction(result: dict, outcomes: list, cache: Optional[PageTextCache]) -> dict:
+    """Merge a file's task outcomes (in page order), report it and cache its text."""
+    for outcome, error in outcomes:
+        if error is not None:
+            result['error'] = result['error'] or str(error)
+            continue
+        documents, seconds = outcome
+        result['documents'].extend(documents)
+        result['seconds'] += seconds
+    
+    if result['error'] is not None:
+        result['documents'] = []
+        print(f"Error loading PDF {result['path'].name}: {result['error']}")
+        return result
     
-    for pdf_path in pdf_files:
+    print(f"{'Loaded cached text of' if result['cached'] else 'Extracted'} "
+          f"{len(result['documents'])}/{result['pages']} pages from {result['path'].name} "
+          f"in {result['seconds']:.2f}s")
+    if cache is not None and not result['cached']:
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                # Extract text from each page
-                for page_num, page in enumerate(pdf_reader.pages):
-                    text = page.extract_text()
-                    if text.strip():  # Only add non-empty pages
-                        pdf_data.append({
-                            'text': text,
-                            'source': pdf_path.name,
-                            'page': page_num + 1
-                        })
+            cache.put(result['sha256'], result['documents'], result['pages'])
         except Exception as e:
-            print(f"Error loading PDF {pdf_path.name}: {str(e)}")
-            continue
+            print(f"Could not cache the text of {result['path'].name}: {str(e)}")
+    return result
+
+
+def _run_inline(result: dict, page_ranges: List[Tuple[int, int]]) -> list:
+    outcomes = []
+    for start, end in page_ranges:
+        try:
+            outcomes.append((extract_page_range(result['path'], start, end), None))
+        except Exception as e:
+            outcomes.append((None, e))
+    return outcomes
+
+
+def _wait_all(futures: list) -> list:
+    outcomes = []
+    for future in futures:
+        try:
+            outcomes.append((future.result(), None))
+        except Exception as e:
+            outcomes.append((None, e))
+    return outcomes
+
+
+def iter_extract_pdfs(
+    pdf_paths: List[Path],
+    workers: int = PDF_EXTRACT_WORKERS,
+    pages_per_task: int = PDF_PAGES_PER_TASK,
+    cache: Optional[PageTextCache] = None
+) -> Iterator[dict]:
+    """
+    Extract the text of several PDFs across a process pool, yielding one file at a time.
+    
+    Each file is split into tasks of pages_per_task pages, so one long PDF
+    doesn't leave the other workers idle. At most `workers` files are being
+    extracted ahead of the one the caller is consuming, so memory holds a
+    bounded number of files' text whatever the corpus size. A file that fails
+    to open or to extract is reported with its error and doesn't affect the others.
+    
+    Args:
+        pdf_paths: PDF files to extract
+        workers: Worker processes (1 extracts in this process)
+        pages_per_task: Pages per task
+        cache: Page text cache; files found in it are not parsed, and newly
+            extracted files are added to it
+    
+    Yields:
+        One dictionary per input path, in input order, with 'path', 'sha256',
+        'documents' (pages in order), 'pages' (total page count), 'seconds'
+        (extraction time summed over the file's tasks), 'cached' and 'error'
+        (None on success)
+    """
+    pdf_paths = [Path(pdf_path) for pdf_path in pdf_paths]
+    executor = None
+    window = deque()  # (result, futures, outcomes) of files started ahead, in input order
+    next_index = 0
+    
+    try:
+        while next_index < len(pdf_paths) or window:
+            while next_index < len(pdf_paths) and len(window) < max(1, workers):
+                result = _prepare_extraction(pdf_paths[next_index], cache)
+                page_ranges = _page_ranges(result, pages_per_task)
+                next_index += 1
+                
+                if workers > 1 and executor is None and (len(page_ranges) > 1 or next_index < len(pdf_paths)):
+                    # spawn: the serving process has model threads running that a forked child would inherit
+                    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+                if executor is None:
+                    window.append((result, None, _run_inline(result, page_ranges)))
+                else:
+                    futures = [executor.submit(extract_page_range, result['path'], start, end) for start, end in page_ranges]
+                    window.append((result, futures, None))
+            
+            result, futures, outcomes = window.popleft()
+            if futures is not None:
+                outcomes = _wait_all(futures)
+            yield _finish_extraction(result, outcomes, cache)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def extract_pdfs(
+    pdf_paths: List[Path],
+    workers: int = PDF_EXTRACT_WORKERS,
+    pages_per_task: int = PDF_PAGES_PER_TASK,
+    cache: Optional[PageTextCache] = None
+) -> List[dict]:
+    """
+    Extract the text of several PDFs across a process pool.
+    
+    Args:
+        pdf_paths: PDF files to extract
+        workers: Worker processes (1 extracts in this process)
+        pages_per_task: Pages per task
+        cache: Page text cache (see iter_extract_pdfs)
+    
+    Returns:
+        One dictionary per input path, in input order (see iter_extract_pdfs)
+    """
+    return list(iter_extract_pdfs(pdf_paths, workers, pages_per_task, cache))
+
+
+def load_pdf(pdf_path: Path) -> Tuple[List[dict], int]:
+    """
+    Extract the text of one PDF file.
+    
+    Args:
+        pdf_path: Path of the PDF file
+    
+    Returns:
+        Tuple of (list of dictionaries containing 'text', 'source' and 'page' for each
+        non-empty page, total number of pages). An unreadable PDF gives ([], 0).
+    """
+    result = extract_pdfs([pdf_path])[0]
+    if result['error'] is not None:
+        return [], 0
+    return result['documents'], result['pages']
+
+
+def load_pdfs() -> List[dict]:
+    """
+    Load all PDF files from the PDFs directory.
+    
+    Returns:
+        List of dictionaries containing 'text' and 'source' (filename) for each page.
+    """
+    pdf_data = []
+    
+    for result in extract_pdfs(list_pdf_files()):
+        pdf_data.extend(result['documents'])
     
     return pdf_data
 
@@ -59,31 +261,13 @@ def load_single_pdf(filename: str) -> List[dict]:
     Returns:
         List of dictionaries containing 'text' and 'source' (filename) for each page.
     """
-    pdf_data = []
-    
     if not PDFS_DIR.exists():
-        return pdf_data
+        return []
     
     pdf_path = PDFS_DIR / filename
     
     if not pdf_path.exists():
-        return pdf_data
-    
-    try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            # Extract text from each page
-            for page_num, page in enumerate(pdf_reader.pages):
-                text = page.extract_text()
-                if text.strip():  # Only add non-empty pages
-                    pdf_data.append({
-                        'text': text,
-                        'source': filename,
-                        'page': page_num + 1
-                    })
-    except Exception as e:
-        print(f"Error loading PDF {filename}: {str(e)}")
         return []
     
-    return pdf_data
+    documents, _ = load_pdf(pdf_path)
+    return documents
@@ -0,0 +1,184 @@
+"""
+Index manifest module for RAG pipeline.
+Records, per PDF, what is in the vector store so only changed files are re-indexed.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+from parentdashboard.config import CHUNK_SIZE, CHUNK_OVERLAP, EMBEDDING_MODEL, KB_MANIFEST_PATH
+
+MANIFEST_VERSION = 1
+
+
+def index_settings() -> Dict:
+    """Settings that change every chunk or embedding; a manifest built with others is stale."""
+    return {
+        'version': MANIFEST_VERSION,
+        'chunk_size': CHUNK_SIZE,
+        'chunk_overlap': CHUNK_OVERLAP,
+        'embedding_model': EMBEDDING_MODEL
+    }
+
+
+def content_hash(path: Path, block_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file's contents.
+    
+    Args:
+        path: File to hash
+        block_size: Bytes read at a time
+    
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IndexManifest:
+    """
+    Per-PDF record of the vector store contents, stored as JSON:
+    {filename: {'sha256', 'size', 'mtime_ns', 'pages', 'chunk_ids'}}, plus
+    checkpoints of files being indexed: {filename: {'sha256', 'chunk_ids'}}.
+    
+    A file whose size and mtime match its entry is unchanged without being read;
+    otherwise its content hash decides.
+    """
+    
+    def __init__(self, path: Path = KB_MANIFEST_PATH):
+        """
+        Load the manifest if one exists and was built with the current settings.
+        
+        Args:
+            path: Location of the manifest JSON file
+        """
+        self.path = Path(path)
+        self.settings = index_settings()
+        self.files: Dict[str, Dict] = {}
+        self.partial: Dict[str, Dict] = {}  # Files whose indexing was started but not finished
+        self.is_current = False  # True when loaded from disk with matching settings
+        self.dirty = False  # Changed since the last save
+        
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('settings') == self.settings:
+                    self.files = data.get('files', {})
+                    self.partial = data.get('partial', {})
+                    self.is_current = True
+                else:
+                    print("Index settings changed since the knowledge base was indexed.")
+            except Exception as e:
+                print(f"Error reading index manifest {self.path}: {str(e)}")
+    
+    def save(self) -> None:
+        """Write the manifest atomically (a crash leaves the previous version)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'settings': self.settings, 'files': self.files, 'partial': self.partial}, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self.is_current = True
+        self.dirty = False
+    
+    def clear(self) -> None:
+        """Forget every file (used when the vector store is wiped)."""
+        self.files = {}
+        self.partial = {}
+        self.dirty = True
+    
+    def get(self, filename: str) -> Optional[Dict]:
+        return self.files.get(filename)
+    
+    def chunk_count(self) -> int:
+        """Number of distinct chunks recorded across all files, finished or not."""
+        return sum(len(self.chunk_ids(filename)) for filename in set(self.files) | set(self.partial))
+    
+    def chunk_ids(self, filename: str) -> set:
+        """IDs of every chunk recorded for a file: its indexed version and any unfinished one."""
+        ids = set(self.files.get(filename, {}).get('chunk_ids', []))
+        ids.update(self.partial.get(filename, {}).get('chunk_ids', []))
+        return ids
+    
+    def get_partial(self, filename: str) -> Optional[Dict]:
+        return self.partial.get(filename)
+    
+    def checkpoint(self, filename: str, sha256: str, chunk_ids: list) -> None:
+        """
+        Record how far indexing a file has got.
+        
+        Args:
+            filename: PDF file name
+            sha256: Content hash of the version being indexed
+            chunk_ids: IDs of its chunks written so far, in order
+        """
+        self.partial[filename] = {'sha256': sha256, 'chunk_ids': list(chunk_ids)}
+        self.dirty = True
+    
+    def record(self, filename: str, path: Path, sha256: str, pages: int, chunk_ids: list) -> None:
+        """
+        Record a freshly indexed file.
+        
+        Args:
+            filename: PDF file name (the chunks' 'source')
+            path: Path of the PDF, for its size and mtime
+            sha256: Content hash the chunks were built from
+            pages: Total number of pages in the PDF
+            chunk_ids: IDs of the file's chunks in the vector store
+        """
+        stat = path.stat()
+        self.files[filename] = {
+            'sha256': sha256,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'pages': pages,
+            'chunk_ids': list(chunk_ids)
+        }
+        self.partial.pop(filename, None)
+        self.dirty = True
+    
+    def remove(self, filename: str) -> Optional[Dict]:
+        """Drop a file's entry and checkpoint, returning the entry (None if it wasn't recorded)."""
+        entry = self.files.pop(filename, None)
+        partial = self.partial.pop(filename, None)
+        self.dirty = self.dirty or entry is not None or partial is not None
+        return entry
+    
+    def is_unchanged(self, filename: str, path: Path) -> bool:
+        """
+        Whether the file on disk is the one that was indexed.
+        
+        A matching size and mtime is trusted without reading the file. If only
+        those changed (e.g. the file was copied or touched) the content hash is
+        compared and the entry's size and mtime are refreshed. A file with an
+        unfinished checkpoint is never unchanged: its stored chunks may already
+        be partly overwritten by the interrupted run.
+        
+        Args:
+            filename: PDF file name
+            path: Path of the PDF
+        
+        Returns:
+            True if the file doesn't need re-indexing
+        """
+        entry = self.files.get(filename)
+        if entry is None or filename in self.partial:
+            return False
+        
+        stat = path.stat()
+        if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return True
+        
+        if entry['sha256'] != content_hash(path):
+            return False
+        
+        entry['size'] = stat.st_size
+        entry['mtime_ns'] = stat.st_mtime_ns
+        self.dirty = True
+        return True
@@ -2,81 +2,249 @@
 End-to-end RAG pipeline module.
 Orchestrates the complete RAG workflow from PDF loading to retrieval.
 """
+import threading
+import time
+from itertools import islice
 from typing import List, Dict
-from parentdashboard.rag.loader import load_pdfs, load_single_pdf
-from parentdashboard.rag.chunker import chunk_documents
+from parentdashboard.config import PDFS_DIR, EMBED_BATCH_SIZE, EMBEDDING_MODEL
+from parentdashboard.rag.loader import list_pdf_files, iter_extract_pdfs
+from parentdashboard.rag.chunker import iter_chunk_documents
 from parentdashboard.rag.embeddings import EmbeddingGenerator
+from parentdashboard.rag.embedding_cache import EmbeddingCache
+from parentdashboard.rag.text_cache import PageTextCache
+from parentdashboard.rag.manifest import IndexManifest
 from parentdashboard.rag.vector_store import VectorStore
 from parentdashboard.rag.retriever import Retriever
 
 
+class IngestStats:
+    """Items processed and time spent per indexing stage (extract, chunk, embed, store)."""
+    
+    STAGES = ('extract', 'chunk', 'embed', 'store')
+    
+    def __init__(self):
+        self.items = {stage: 0 for stage in self.STAGES}
+        self.seconds = {stage: 0.0 for stage in self.STAGES}
+    
+    def add(self, stage: str, items: int, seconds: float) -> None:
+        self.items[stage] += items
+        self.seconds[stage] += seconds
+    
+    def summary(self) -> Dict:
+        """
+        Returns:
+            Dictionary per stage with 'items' (pages for extract, chunks otherwise),
+            'seconds' and 'per_second'
+        """
+        return {
+            stage: {
+                'items': self.items[stage],
+                'seconds': round(self.seconds[stage], 3),
+                'per_second': round(self.items[stage] / self.seconds[stage], 1) if self.seconds[stage] > 0 else None
+            }
+            for stage in self.STAGES
+        }
+    
+    @staticmethod
+    def format_summary(stages: Dict) -> str:
+        """One-line report of a summary() for the log."""
+        return ", ".join(
+            f"{stage} {stats['items']} in {stats['seconds']}s"
+            + (f" ({stats['per_second']}/s)" if stats['per_second'] is not None else "")
+            for stage, stats in stages.items()
+        )
+
+
 class RAGPipeline:
     """Complete RAG pipeline for document processing and retrieval."""
     
     def __init__(self):
         """Initialize the RAG pipeline components."""
-        self.embedding_generator = EmbeddingGenerator()
+        # Passage embeddings by text: identical chunks (re-uploads, duplicate PDFs, forced
+        # reloads) are read back instead of being encoded again
+        self.embedding_generator = EmbeddingGenerator(EMBEDDING_MODEL, cache=EmbeddingCache(EMBEDDING_MODEL))
         self.vector_store = VectorStore()
         self.retriever = Retriever(self.vector_store, self.embedding_generator)
+        self.manifest = IndexManifest()
+        # Extracted page text by PDF hash: re-chunking or re-embedding doesn't re-parse PDFs
+        self.text_cache = PageTextCache()
+        # Startup, /reload and background uploads may index at the same time
+        self._index_lock = threading.Lock()
         self._is_initialized = False
     
-    def initialize(self, force_reload: bool = False) -> None:
+    def initialize(self, force_reload: bool = False) -> Dict:
         """
-        Initialize the RAG pipeline by loading and indexing PDFs.
+        Bring the vector store in line with the PDFs directory.
+        
+        Only new or changed PDFs (by content hash) are parsed and embedded, and
+        the chunks of removed PDFs are deleted. With nothing changed this only
+        stats the files.
         
         Args:
-            force_reload: If True, reload PDFs even if vector store has data
+            force_reload: If True, drop everything and re-index every PDF
+        
+        Returns:
+            Dictionary with the 'added', 'updated', 'removed' and 'failed' (unreadable,
+            left as they were) file names, the number of 'unchanged' files, the
+            elapsed 'seconds' and per-stage throughput in 'stages' (see IngestStats)
         """
-        # Check if vector store already has data
-        if not force_reload and self.vector_store.get_count() > 0:
-            print("Vector store already has data. Skipping initialization.")
+        with self._index_lock:
+            start = time.perf_counter()
+            
+            if force_reload:
+                print("Rebuilding the knowledge base index...")
+                self._reset_index()
+            elif not self.manifest.is_current and self.vector_store.get_count() > 0:
+                # Indexed before the manifest existed, or with other chunking/embedding
+                # settings: the stored chunks can't be matched to files, so rebuild once
+                print("No usable index manifest for the existing vector store. Rebuilding...")
+                self._reset_index()
+            
+            summary = self._sync()
             self._is_initialized = True
-            return
+            summary['seconds'] = round(time.perf_counter() - start, 3)
+            
+            if summary['added'] or summary['updated'] or summary['removed']:
+                print(f"Knowledge base updated in {summary['seconds']}s: {len(summary['added'])} added, "
+                      f"{len(summary['updated'])} updated, {len(summary['removed'])} removed, "
+                      f"{summary['unchanged']} unchanged, {len(summary['failed'])} failed")
+                print(f"Indexing stages: {IngestStats.format_summary(summary['stages'])}")
+                cache_stats = self.embedding_generator.cache.stats()
+                print(f"Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                      f"{cache_stats['entries']} entries")
+            else:
+                print(f"Knowledge base up to date ({summary['unchanged']} PDFs).")
+            return summary
+    
+    def _reset_index(self) -> None:
+        """Empty the vector store and the manifest."""
+        self.vector_store.delete_all()
+        self.manifest.clear()
+        self.manifest.save()
+    
+    def _sync(self) -> Dict:
+        """Index new and changed PDFs and drop removed ones (caller holds the index lock)."""
+        pdf_paths = {path.name: path for path in list_pdf_files()}
+        summary = {'added': [], 'updated': [], 'removed': [], 'failed': [], 'unchanged': 0}
+        stats = IngestStats()
         
-        print("Initializing RAG pipeline...")
+        for filename in [name for name in set(self.manifest.files) | set(self.manifest.partial) if name not in pdf_paths]:
+            self._remove_file(filename)
+            summary['removed'].append(filename)
         
-        # Load PDFs
-        print("Loading PDFs...")
-        documents = load_pdfs()
+        changed = []
+        for filename, pdf_path in pdf_paths.items():
+            if self.manifest.is_unchanged(filename, pdf_path):
+                summary['unchanged'] += 1
+            else:
+                changed.append(pdf_path)
         
-        if not documents:
-            print("No PDFs found in the knowledge base directory.")
-            self._is_initialized = True
-            return
+        # Files are extracted a few at a time ahead of the one being embedded, so memory
+        # stays bounded by the extraction window and the embedding batch, not the corpus
+        extractions = iter_extract_pdfs(changed, cache=self.text_cache)
+        while True:
+            started = time.perf_counter()
+            extraction = next(extractions, None)
+            if extraction is None:
+                break
+            stats.add('extract', len(extraction['documents']), time.perf_counter() - started)
+            
+            filename = extraction['path'].name
+            if extraction['error'] is not None:
+                summary['failed'].append(filename)
+                continue
+            is_new = self.manifest.get(filename) is None
+            self._index_file(filename, extraction, stats)
+            summary['added' if is_new else 'updated'].append(filename)
         
-        print(f"Loaded {len(documents)} document pages")
-        
-        # Chunk documents
-        print("Chunking documents...")
-        chunked_docs = chunk_documents(documents)
-        print(f"Created {len(chunked_docs)} chunks")
-        
-        # Generate embeddings
-        print("Generating embeddings...")
-        texts = [doc['text'] for doc in chunked_docs]
-        embeddings = self.embedding_generator.generate_embeddings(texts)
-        
-        # Prepare metadata
-        metadatas = [
-            {
-                'source': doc['source'],
-                'page': doc.get('page'),
-                'chunk_index': doc.get('chunk_index'),
-                'total_chunks': doc.get('total_chunks')
-            }
-            for doc in chunked_docs
-        ]
+        if self.manifest.dirty:
+            self.manifest.save()
+        summary['stages'] = stats.summary()
+        return summary
+    
+    def _index_file(self, filename: str, extraction: Dict, stats: IngestStats) -> None:
+        """
+        Chunk and embed one extracted PDF in batches of EMBED_BATCH_SIZE chunks and
+        replace its chunks in the vector store.
+        
+        Progress is checkpointed in the manifest after every batch, so a run
+        interrupted part way through a file resumes after its last written batch.
+        
+        Args:
+            filename: Name of the PDF file (the chunks' 'source')
+            extraction: The file's result from iter_extract_pdfs
+            stats: Per-stage counters to add to
+        """
+        pdf_path = extraction['path']
+        sha256 = extraction['sha256']
+        documents = extraction['documents']
+        print(f"Loaded {len(documents)} document pages from {filename}")
+        
+        entry = self.manifest.get(filename)
+        partial = self.manifest.get_partial(filename)
+        previous_ids = self.manifest.chunk_ids(filename)
+        
+        # Chunking is deterministic, so the chunks of a checkpointed run of the same
+        # version are already stored under the same IDs and can be skipped
+        chunk_ids = list(partial['chunk_ids']) if partial is not None and partial['sha256'] == sha256 else []
+        if chunk_ids:
+            print(f"Resuming {filename} after {len(chunk_ids)} indexed chunks")
+        elif entry is None and partial is None and self.vector_store.get_count() > self.manifest.chunk_count():
+            # Chunks nobody recorded (e.g. indexing was interrupted before the manifest was saved)
+            self.vector_store.delete_by_source(filename)
         
-        # Clear existing data if force_reload
-        if force_reload:
-            self.vector_store.delete_all()
+        chunks = iter_chunk_documents(documents)
+        for _ in islice(chunks, len(chunk_ids)):
+            pass
         
-        # Add to vector store
-        print("Adding to vector store...")
-        self.vector_store.add_documents(texts, embeddings, metadatas)
+        while True:
+            started = time.perf_counter()
+            batch = list(islice(chunks, EMBED_BATCH_SIZE))
+            stats.add('chunk', len(batch), time.perf_counter() - started)
+            if not batch:
+                break
+            
+            # Generate embeddings
+            started = time.perf_counter()
+            texts = [doc['text'] for doc in batch]
+            embeddings = self.embedding_generator.generate_embeddings(texts, show_progress_bar=False)
+            stats.add('embed', len(batch), time.perf_counter() - started)
+            
+            # Prepare metadata
+            metadatas = [
+                {
+                    'source': doc['source'],
+                    'page': doc.get('page'),
+                    'chunk_index': doc.get('chunk_index'),
+                    'total_chunks': doc.get('total_chunks')
+                }
+                for doc in batch
+            ]
+            
+            # A changed file's chunks get the same IDs as its previous version's, so
+            # they are overwritten in place; upserting makes a resumed batch harmless
+            started = time.perf_counter()
+            chunk_ids.extend(self.vector_store.upsert_documents(texts, embeddings, metadatas, start_id=len(chunk_ids)))
+            self.manifest.checkpoint(filename, sha256, chunk_ids)
+            self.manifest.save()
+            stats.add('store', len(batch), time.perf_counter() - started)
         
-        self._is_initialized = True
-        print("RAG pipeline initialized successfully!")
+        print(f"Created {len(chunk_ids)} chunks from {filename}")
+        
+        # Chunks of the previous version beyond the new one's count
+        stale_ids = previous_ids.difference(chunk_ids)
+        if stale_ids:
+            self.vector_store.delete_ids(sorted(stale_ids))
+        
+        self.manifest.record(filename, pdf_path, sha256, extraction['pages'], chunk_ids)
+        self.manifest.save()
+    
+    def _remove_file(self, filename: str) -> None:
+        """Delete a PDF's chunks and its manifest entry."""
+        chunk_ids = self.manifest.chunk_ids(filename)
+        self.manifest.remove(filename)
+        if chunk_ids:
+            self.vector_store.delete_ids(sorted(chunk_ids))
     
     def retrieve_context(self, query: str, top_k: int = 3) -> List[Dict]:
         """
@@ -110,39 +278,21 @@ class RAGPipeline:
         """
         print(f"Adding single PDF: {filename}")
         
-        # Load the single PDF
-        documents = load_single_pdf(filename)
-        
-        if not documents:
-            print(f"No content found in PDF {filename}")
+        pdf_path = PDFS_DIR / filename
+        if not pdf_path.exists():
+            print(f"PDF {filename} not found")
             return
         
-        print(f"Loaded {len(documents)} document pages from {filename}")
-        
-        # Chunk documents
-        chunked_docs = chunk_documents(documents)
-        print(f"Created {len(chunked_docs)} chunks from {filename}")
-        
-        # Generate embeddings
-        texts = [doc['text'] for doc in chunked_docs]
-        embeddings = self.embedding_generator.generate_embeddings(texts)
-        
-        # Prepare metadata
-        metadatas = [
-            {
-                'source': doc['source'],
-                'page': doc.get('page'),
-                'chunk_index': doc.get('chunk_index'),
-                'total_chunks': doc.get('total_chunks')
-            }
-            for doc in chunked_docs
-        ]
-        
-        # Remove any existing documents with this source (in case of re-upload)
-        self.vector_store.delete_by_source(filename)
-        
-        # Add to vector store
-        self.vector_store.add_documents(texts, embeddings, metadatas)
+        with self._index_lock:
+            if self.manifest.is_unchanged(filename, pdf_path):
+                print(f"{filename} is already indexed")
+                return
+            stats = IngestStats()
+            extraction = next(iter_extract_pdfs([pdf_path], cache=self.text_cache))
+            if extraction['error'] is not None:
+                raise ValueError(f"Could not read PDF {filename}: {extraction['error']}")
+            self._index_file(filename, extraction, stats)
+            print(f"Indexing stages: {IngestStats.format_summary(stats.summary())}")
         
         print(f"Successfully added {filename} to vector store")
     
@@ -156,8 +306,12 @@ class RAGPipeline:
         """
         print(f"Removing single PDF: {filename}")
         
-        # Remove documents with this source from vector store
-        self.vector_store.delete_by_source(filename)
+        with self._index_lock:
+            if self.manifest.chunk_ids(filename):
+                self._remove_file(filename)
+                self.manifest.save()
+            else:
+                # Remove documents with this source from vector store
+                self.vector_store.delete_by_source(filename)
         
         print(f"Successfully removed {filename} from vector store")
-
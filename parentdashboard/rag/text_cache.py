@@ -0,0 +1,89 @@
+"""
+Page text cache module for RAG pipeline.
+Keeps the extracted text of each PDF on disk so re-indexing skips PDF parsing.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+import PyPDF2
+from parentdashboard.config import PDF_TEXT_CACHE_DIR
+
+# Bump when the extraction itself changes (e.g. which pages are kept), to ignore older entries
+EXTRACTOR_VERSION = f"pypdf2-{PyPDF2.__version__}-1"
+
+
+class PageTextCache:
+    """
+    Extracted page text stored as one JSON file per PDF content hash and extractor version.
+    
+    Entries don't depend on the file name, so a renamed or re-uploaded copy of a
+    PDF is served from the cache too.
+    """
+    
+    def __init__(self, directory: Path = PDF_TEXT_CACHE_DIR, extractor_version: str = EXTRACTOR_VERSION):
+        """
+        Args:
+            directory: Cache directory (created on first write)
+            extractor_version: Entries written by another extractor version are ignored
+        """
+        self.directory = Path(directory) / extractor_version
+        self.hits = 0
+        self.misses = 0
+    
+    def _entry_path(self, sha256: str) -> Path:
+        return self.directory / f"{sha256}.json"
+    
+    def get(self, sha256: str, source: str) -> Optional[Dict]:
+        """
+        Look up a PDF's extracted text.
+        
+        Args:
+            sha256: Content hash of the PDF
+            source: File name to put in each page's 'source'
+        
+        Returns:
+            Dictionary with 'documents' (as from the loader) and 'pages' (total
+            page count), or None if the PDF hasn't been extracted before
+        """
+        try:
+            with open(self._entry_path(sha256), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable page text cache entry {sha256}: {str(e)}")
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        documents = [
+            {'text': page['text'], 'source': source, 'page': page['page']}
+            for page in entry['documents']
+        ]
+        return {'documents': documents, 'pages': entry['pages']}
+    
+    def put(self, sha256: str, documents: List[dict], pages: int) -> None:
+        """
+        Store a PDF's extracted text.
+        
+        Args:
+            sha256: Content hash of the PDF
+            documents: Extracted pages ('text' and 'page' are kept)
+            pages: Total page count
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'pages': pages,
+            'documents': [{'page': doc['page'], 'text': doc['text']} for doc in documents]
+        }
+        # Write then rename, so readers never see a partial entry
+        path = self._entry_path(sha256)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    
+    def stats(self) -> Dict:
+        return {'directory': str(self.directory), 'hits': self.hits, 'misses': self.misses}
@@ -38,7 +38,7 @@ class VectorStore:
         embeddings: List[List[float]],
         metadatas: List[Dict],
         start_id: int = 0
-    ) -> None:
+    ) -> List[str]:
         """
         Add documents to the vector store.
         
@@ -47,14 +47,14 @@ class VectorStore:
             embeddings: List of embedding vectors
             metadatas: List of metadata dictionaries for each chunk
             start_id: Starting ID number for generating unique IDs
+        
+        Returns:
+            IDs of the added chunks
         """
         if not texts:
-            return
+            return []
         
-        # Generate unique IDs for documents
-        # Use source from metadata if available, otherwise use sequential IDs
-        source = metadatas[0].get('source', 'unknown') if metadatas else 'unknown'
-        ids = [f"{source}_chunk_{start_id + i}" for i in range(len(texts))]
+        ids = self._chunk_ids(metadatas, start_id, len(texts))
         
         # Add to collection
         self.collection.add(
@@ -65,6 +65,45 @@ class VectorStore:
         )
         
         print(f"Added {len(texts)} documents to vector store")
+        return ids
+    
+    def upsert_documents(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict],
+        start_id: int = 0
+    ) -> List[str]:
+        """
+        Add or overwrite documents, with the same IDs add_documents would give them.
+        Writing the same batch twice (e.g. when resuming an interrupted run) is harmless.
+        
+        Args:
+            texts: List of text chunks
+            embeddings: List of embedding vectors
+            metadatas: List of metadata dictionaries for each chunk
+            start_id: ID number of the first chunk within its source
+        
+        Returns:
+            IDs of the written chunks
+        """
+        if not texts:
+            return []
+        
+        ids = self._chunk_ids(metadatas, start_id, len(texts))
+        self.collection.upsert(
+            embeddings=embeddings,
+            documents=texts,
+            metadatas=metadatas,
+            ids=ids
+        )
+        return ids
+    
+    @staticmethod
+    def _chunk_ids(metadatas: List[Dict], start_id: int, count: int) -> List[str]:
+        """Unique IDs for documents: '<source>_chunk_<n>' from the source in the metadata"""
+        source = metadatas[0].get('source', 'unknown') if metadatas else 'unknown'
+        return [f"{source}_chunk_{start_id + i}" for i in range(count)]
     
     def query(
         self,
@@ -100,6 +139,17 @@ class VectorStore:
         """Get the number of documents in the collection."""
         return self.collection.count()
     
+    def delete_ids(self, ids: List[str]) -> None:
+        """
+        Delete documents by chunk ID.
+        
+        Args:
+            ids: Chunk IDs returned by add_documents
+        """
+        if ids:
+            self.collection.delete(ids=ids)
+            print(f"Deleted {len(ids)} documents from vector store")
+    
     def delete_by_source(self, source: str) -> None:
         """
         Delete all documents with a specific source filename.
@@ -61,16 +61,20 @@ class QAService:
             
             return {"answer": error_msg}
     
-    def reload_knowledge_base(self) -> Dict[str, str]:
+    def reload_knowledge_base(self, force: bool = False) -> Dict:
         """
         Reload the knowledge base from PDFs.
+        Only new or changed PDFs are re-indexed unless force is set.
+        
+        Args:
+            force: If True, re-index every PDF from scratch
         
         Returns:
-            Dictionary with status message
+            Dictionary with status message and the added/updated/removed PDFs
         """
         try:
-            self.rag_pipeline.initialize(force_reload=True)
-            return {"status": "Knowledge base reloaded successfully"}
+            summary = self.rag_pipeline.initialize(force_reload=force)
+            return {"status": "Knowledge base reloaded successfully", **summary}
         except Exception as e:
             return {"status": f"Error reloading knowledge base: {str(e)}"}
     
@@ -0,0 +1,7 @@
+"""
+Shared setup for the parentdashboard tests.
+parentdashboard.config refuses to import without a Groq key; none of these tests call Groq.
+"""
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
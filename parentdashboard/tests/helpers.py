@@ -0,0 +1,48 @@
+"""
+Builders shared by the parentdashboard tests.
+"""
+from pathlib import Path
+from typing import List
+
+
+def write_pdf(path: Path, pages: List[str]) -> Path:
+    """
+    Write a minimal PDF with one line of Helvetica text per page (ASCII only).
+    
+    Args:
+        path: File to write
+        pages: Text of each page; an empty string gives a page without text
+    
+    Returns:
+        The path written
+    """
+    count = len(pages)
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    page_ids = [4 + 2 * i for i in range(count)]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % i for i in page_ids) + b"] /Count %d >>" % count,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, text in zip(page_ids, pages):
+        escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('ascii')
+        stream = b"BT /F1 12 Tf 72 720 Td (" + escaped + b") Tj ET" if text else b""
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    
+    path = Path(path)
+    path.write_bytes(bytes(data))
+    return path
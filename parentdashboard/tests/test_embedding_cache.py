@@ -0,0 +1,69 @@
+import multiprocessing
+import numpy as np
+from parentdashboard.rag.embedding_cache import KEY_SIZE, EmbeddingCache
+
+DIM = 8
+
+
+def _vectors(texts):
+    """A distinct, reproducible vector per text"""
+    return np.array([[len(text) + i / 10 for i in range(DIM)] for text in texts], dtype=np.float32)
+
+
+def _write_texts(directory, texts, batch_size):
+    cache = EmbeddingCache("test/model", directory=directory, dtype="float32")
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        cache.put_many(batch, _vectors(batch))
+
+
+def test_entries_round_trip_and_duplicates_are_skipped(tmp_path):
+    cache = EmbeddingCache("test/model", directory=tmp_path)
+    cache.put_many(["passage: a", "passage: bb", "passage: a"], _vectors(["passage: a", "passage: bb", "passage: a"]))
+    
+    reopened = EmbeddingCache("test/model", directory=tmp_path)
+    found = reopened.get_many(["passage: bb", "passage: ccc", "passage: a"])
+    
+    assert found[1] is None and reopened.stats()['entries'] == 2
+    np.testing.assert_allclose(found[0], _vectors(["passage: bb"])[0], rtol=1e-3)
+    np.testing.assert_allclose(found[2], _vectors(["passage: a"])[0], rtol=1e-3)
+
+
+def test_half_written_tail_is_ignored_then_trimmed(tmp_path):
+    cache = EmbeddingCache("test/model", directory=tmp_path, dtype="float32")
+    cache.put_many(["one", "two"], _vectors(["one", "two"]))
+    
+    # A writer crashed after its vector and part of its key
+    with open(cache.vectors_path, 'ab') as f:
+        f.write(_vectors(["lost"]).tobytes())
+    with open(cache.keys_path, 'ab') as f:
+        f.write(EmbeddingCache.key("lost")[:KEY_SIZE // 2])
+    
+    reopened = EmbeddingCache("test/model", directory=tmp_path, dtype="float32")
+    assert reopened.stats()['entries'] == 2 and reopened.get_many(["lost"]) == [None]
+    
+    reopened.put_many(["three"], _vectors(["three"]))
+    assert cache.keys_path.stat().st_size == 3 * KEY_SIZE
+    assert cache.vectors_path.stat().st_size == 3 * DIM * 4
+    found = EmbeddingCache("test/model", directory=tmp_path, dtype="float32").get_many(["one", "two", "three"])
+    np.testing.assert_array_equal(np.stack(found), _vectors(["one", "two", "three"]))
+
+
+def test_concurrent_writers_keep_keys_and_vectors_aligned(tmp_path):
+    reader = EmbeddingCache("test/model", directory=tmp_path, dtype="float32")
+    # Overlapping texts: every process also writes some the others write
+    texts = [[f"passage {writer}-{i}" for i in range(40)] + [f"shared {i}" for i in range(20)] for writer in range(4)]
+    
+    context = multiprocessing.get_context('spawn')
+    writers = [context.Process(target=_write_texts, args=(tmp_path, writer_texts, 3)) for writer_texts in texts]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join(60)
+    assert all(process.exitcode == 0 for process in writers)
+    
+    # An instance opened before the writes picks up their entries
+    expected = sorted(set(text for writer_texts in texts for text in writer_texts))
+    found = reader.get_many(expected)
+    assert reader.stats()['entries'] == len(expected)  # no text was appended twice
+    np.testing.assert_array_equal(np.stack(found), _vectors(expected))
@@ -0,0 +1,84 @@
+import pytest
+
+# rag_pipeline imports the embedding model and Chroma clients; neither is used here
+pytest.importorskip("chromadb")
+pytest.importorskip("sentence_transformers")
+
+from parentdashboard.rag import rag_pipeline
+from parentdashboard.rag.manifest import IndexManifest, content_hash
+from parentdashboard.rag.rag_pipeline import IngestStats, RAGPipeline
+from parentdashboard.tests.helpers import write_pdf
+
+
+class StubVectorStore:
+    """Chunks by ID in a dict, with VectorStore's ID scheme"""
+    
+    def __init__(self):
+        self.chunks = {}
+    
+    def upsert_documents(self, texts, embeddings, metadatas, start_id=0):
+        ids = [f"{metadatas[0]['source']}_chunk_{start_id + i}" for i in range(len(texts))]
+        self.chunks.update(zip(ids, texts))
+        return ids
+    
+    def get_count(self):
+        return len(self.chunks)
+    
+    def delete_ids(self, ids):
+        for chunk_id in ids:
+            self.chunks.pop(chunk_id, None)
+    
+    def delete_by_source(self, source):
+        self.delete_ids([chunk_id for chunk_id in self.chunks if chunk_id.startswith(f"{source}_chunk_")])
+
+
+class StubEmbedder:
+    """Records the texts it embeds; raises on call number fail_on (1-based) like a crash mid-file"""
+    
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = []
+    
+    def generate_embeddings(self, texts, show_progress_bar=True):
+        self.calls.append(list(texts))
+        if len(self.calls) == self.fail_on:
+            raise RuntimeError("interrupted")
+        return [[float(len(text))] for text in texts]
+
+
+def _pipeline(tmp_path, embedder, vector_store):
+    pipeline = RAGPipeline.__new__(RAGPipeline)
+    pipeline.manifest = IndexManifest(tmp_path / "manifest.json")
+    pipeline.vector_store = vector_store
+    pipeline.embedding_generator = embedder
+    return pipeline
+
+
+def test_interrupted_file_resumes_after_its_last_written_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_pipeline, "EMBED_BATCH_SIZE", 2)
+    pages = [f"Page {i} text." for i in range(5)]
+    pdf = write_pdf(tmp_path / "guide.pdf", pages)
+    extraction = {
+        'path': pdf,
+        'sha256': content_hash(pdf),
+        'documents': [{'text': text, 'source': "guide.pdf", 'page': i + 1} for i, text in enumerate(pages)],
+        'pages': len(pages)
+    }
+    vector_store = StubVectorStore()
+    
+    first = _pipeline(tmp_path, StubEmbedder(fail_on=2), vector_store)
+    with pytest.raises(RuntimeError):
+        first._index_file("guide.pdf", extraction, IngestStats())
+    assert first.manifest.get("guide.pdf") is None
+    assert first.manifest.get_partial("guide.pdf")['chunk_ids'] == ["guide.pdf_chunk_0", "guide.pdf_chunk_1"]
+    
+    # A new process: the checkpoint is read back from disk
+    embedder = StubEmbedder()
+    second = _pipeline(tmp_path, embedder, vector_store)
+    second._index_file("guide.pdf", extraction, IngestStats())
+    
+    assert embedder.calls == [pages[2:4], pages[4:]]
+    assert sorted(vector_store.chunks) == [f"guide.pdf_chunk_{i}" for i in range(5)]
+    entry = IndexManifest(tmp_path / "manifest.json").get("guide.pdf")
+    assert entry['chunk_ids'] == [f"guide.pdf_chunk_{i}" for i in range(5)] and entry['pages'] == 5
+    assert second.manifest.get_partial("guide.pdf") is None
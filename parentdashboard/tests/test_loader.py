@@ -0,0 +1,32 @@
+import pytest
+from parentdashboard.rag.loader import iter_extract_pdfs
+from parentdashboard.tests.helpers import write_pdf
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_files_come_back_in_input_order_and_a_bad_file_is_isolated(tmp_path, workers):
+    long_pages = [f"Long page {i}" for i in range(7)]
+    paths = [
+        write_pdf(tmp_path / "long.pdf", long_pages),
+        tmp_path / "broken.pdf",
+        write_pdf(tmp_path / "short.pdf", ["Only page", ""]),
+        tmp_path / "missing.pdf",
+    ]
+    paths[1].write_bytes(b"not a pdf at all")
+    
+    results = list(iter_extract_pdfs(paths, workers=workers, pages_per_task=3))
+    
+    assert [result['path'] for result in results] == paths
+    long, broken, short, missing = results
+    
+    # Split into tasks of 3 pages, merged back in page order
+    assert long['error'] is None and long['pages'] == 7
+    assert [doc['text'] for doc in long['documents']] == long_pages
+    assert [doc['page'] for doc in long['documents']] == list(range(1, 8))
+    
+    # Empty pages are skipped but counted
+    assert short['error'] is None and short['pages'] == 2
+    assert [(doc['source'], doc['page'], doc['text']) for doc in short['documents']] == [("short.pdf", 1, "Only page")]
+    
+    for failed in (broken, missing):
+        assert failed['error'] is not None and failed['documents'] == []
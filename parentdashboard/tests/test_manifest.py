@@ -0,0 +1,59 @@
+import os
+from parentdashboard.rag import manifest as manifest_module
+from parentdashboard.rag.manifest import IndexManifest, content_hash
+
+
+def _write_pdf(path, data=b"%PDF-1.4 first version"):
+    path.write_bytes(data)
+    return path
+
+
+def test_manifest_round_trips_through_disk(tmp_path):
+    pdf = _write_pdf(tmp_path / "guide.pdf")
+    manifest = IndexManifest(tmp_path / "manifest.json")
+    manifest.record("guide.pdf", pdf, content_hash(pdf), pages=3, chunk_ids=["guide.pdf_0", "guide.pdf_1"])
+    manifest.checkpoint("other.pdf", "abc", ["other.pdf_0"])
+    manifest.save()
+    
+    reloaded = IndexManifest(tmp_path / "manifest.json")
+    assert reloaded.is_current and not reloaded.dirty
+    assert reloaded.files == manifest.files and reloaded.partial == manifest.partial
+    assert reloaded.chunk_count() == 3
+
+
+def test_manifest_with_other_settings_is_stale(tmp_path, monkeypatch):
+    pdf = _write_pdf(tmp_path / "guide.pdf")
+    manifest = IndexManifest(tmp_path / "manifest.json")
+    manifest.record("guide.pdf", pdf, content_hash(pdf), pages=1, chunk_ids=["guide.pdf_0"])
+    manifest.save()
+    
+    monkeypatch.setattr(manifest_module, "CHUNK_SIZE", manifest_module.CHUNK_SIZE + 1)
+    reloaded = IndexManifest(tmp_path / "manifest.json")
+    assert not reloaded.is_current and reloaded.files == {}
+
+
+def test_touched_file_is_unchanged_and_refreshed(tmp_path):
+    pdf = _write_pdf(tmp_path / "guide.pdf")
+    manifest = IndexManifest(tmp_path / "manifest.json")
+    manifest.record("guide.pdf", pdf, content_hash(pdf), pages=1, chunk_ids=["guide.pdf_0"])
+    manifest.dirty = False
+    
+    stat = pdf.stat()
+    os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert manifest.is_unchanged("guide.pdf", pdf)
+    assert manifest.dirty and manifest.get("guide.pdf")["mtime_ns"] == pdf.stat().st_mtime_ns
+    
+    # Same size, different bytes
+    _write_pdf(pdf, b"%PDF-1.4 other version")
+    assert not manifest.is_unchanged("guide.pdf", pdf)
+
+
+def test_file_with_unfinished_checkpoint_is_changed(tmp_path):
+    pdf = _write_pdf(tmp_path / "guide.pdf")
+    manifest = IndexManifest(tmp_path / "manifest.json")
+    manifest.record("guide.pdf", pdf, content_hash(pdf), pages=1, chunk_ids=["guide.pdf_0"])
+    assert manifest.is_unchanged("guide.pdf", pdf)
+    
+    # A re-index of another version was interrupted, then the file was restored
+    manifest.checkpoint("guide.pdf", "sha-of-the-other-version", ["guide.pdf_0"])
+    assert not manifest.is_unchanged("guide.pdf", pdf)
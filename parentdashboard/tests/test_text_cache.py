@@ -0,0 +1,40 @@
+from parentdashboard.rag.loader import iter_extract_pdfs
+from parentdashboard.rag.text_cache import PageTextCache
+from parentdashboard.tests.helpers import write_pdf
+
+
+def test_miss_then_hit_with_the_requested_source(tmp_path):
+    cache = PageTextCache(tmp_path / "cache")
+    assert cache.get("abc", "guide.pdf") is None
+    
+    cache.put("abc", [{'text': "First", 'source': "guide.pdf", 'page': 1},
+                      {'text': "Third", 'source': "guide.pdf", 'page': 3}], pages=3)
+    
+    # A renamed copy of the same PDF is served under its own name
+    entry = PageTextCache(tmp_path / "cache").get("abc", "renamed.pdf")
+    assert entry == {
+        'pages': 3,
+        'documents': [{'text': "First", 'source': "renamed.pdf", 'page': 1},
+                      {'text': "Third", 'source': "renamed.pdf", 'page': 3}]
+    }
+    assert cache.stats()['misses'] == 1
+
+
+def test_other_extractor_version_misses(tmp_path):
+    PageTextCache(tmp_path, extractor_version="old").put("abc", [], pages=0)
+    assert PageTextCache(tmp_path, extractor_version="new").get("abc", "guide.pdf") is None
+
+
+def test_loader_reads_cached_text_instead_of_parsing(tmp_path):
+    cache = PageTextCache(tmp_path / "cache")
+    pdf = write_pdf(tmp_path / "guide.pdf", ["Page one", "Page two"])
+    first = next(iter_extract_pdfs([pdf], workers=1, cache=cache))
+    assert not first['cached'] and cache.stats()['misses'] == 1
+    
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(pdf.read_bytes())
+    second = next(iter_extract_pdfs([copy], workers=1, cache=cache))
+    
+    assert second['cached'] and cache.stats()['hits'] == 1
+    assert second['pages'] == 2 and second['sha256'] == first['sha256']
+    assert [(doc['source'], doc['text']) for doc in second['documents']] == [("copy.pdf", "Page one"), ("copy.pdf", "Page two")]
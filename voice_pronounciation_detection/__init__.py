@@ -0,0 +1 @@
+"""Pronunciation assessment service modules."""
@@ -0,0 +1,343 @@
+"""
+Async FastAPI router for the pronunciation service, mounted by main.py under /pronunciation.
+
+Handlers only read the upload and await. Decoding, feature extraction and
+inference run on a bounded thread pool (BlockingRunner), so the event loop
+never waits on CPU work; with FEATURE_WORKERS > 0 those threads in turn wait on
+the feature worker processes. Request fields and response bodies match the
+Flask app (app.py).
+"""
+import asyncio
+import functools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import List, Optional
+
+from fastapi import APIRouter, File, Form, Header, Request, UploadFile, WebSocket
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from voice_pronounciation_detection.metrics import collect_stages, server_timing_header
+from voice_pronounciation_detection.service import PronunciationService
+from voice_pronounciation_detection.streaming import StreamingAssessment
+from voice_pronounciation_detection.worker_pool import ExtractionTimeoutError, PoolBusyError
+
+MODEL_NOT_LOADED = "Model not loaded. Please ensure models are available and restart the server."
+
+
+class BlockingRunner:
+    """Runs blocking calls on max_workers threads; once max_pending more are waiting, run() raises PoolBusyError"""
+
+    def __init__(self, max_workers, max_pending):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='async-predict')
+
+    async def run(self, fn, *args):
+        # Only the event loop thread touches the counters, so they need no lock
+        if self.active >= self.max_workers + self.max_pending:
+            self.rejected += 1
+            raise PoolBusyError("Too many predictions in progress")
+        self.active += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args))
+        finally:
+            self.active -= 1
+            self.completed += 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return {
+            'threads': self.max_workers,
+            'max_pending': self.max_pending,
+            'in_flight': self.active,
+            'completed': self.completed,
+            'rejected': self.rejected
+        }
+
+
+# Built on application startup, once per server process
+service: Optional[PronunciationService] = None
+runner: Optional[BlockingRunner] = None
+
+
+def start(config=None):
+    """Start the service (worker pool, models, warm-up) and the runner; a no-op if already started"""
+    global service, runner
+    if service is not None:
+        return
+    service = PronunciationService(config).start()
+    runner = BlockingRunner(service.config.ASYNC_PREDICT_THREADS, service.config.ASYNC_MAX_PENDING)
+
+
+def stop():
+    global service, runner
+    if service is None:
+        return
+    runner.shutdown()
+    service.shutdown()
+    service = runner = None
+
+
+router = APIRouter(prefix="/pronunciation", tags=["Pronunciation"], on_startup=[start], on_shutdown=[stop])
+
+
+def _error(message, status_code, headers=None):
+    return JSONResponse({"success": False, "error": message}, status_code=status_code, headers=headers)
+
+
+def _overload_errors(endpoint):
+    """Answer 503 when the runner or the worker pool is full and 504 when extraction times out"""
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        except PoolBusyError as e:
+            return _error(f"Server busy: {e}. Please retry shortly.", 503, {'Retry-After': '1'})
+        except ExtractionTimeoutError as e:
+            return _error(str(e), 504)
+    return wrapper
+
+
+async def _call_predictor(method, *args):
+    """snapshot.predictor.<method>(*args) on the runner, or None if no models are loaded"""
+    def call():
+        # get() may reload changed models, so it runs off the event loop too
+        snapshot = service.model_registry.get()
+        return None if snapshot is None else getattr(snapshot.predictor, method)(*args)
+    return await runner.run(call)
+
+
+@router.get("/health")
+async def health_check():
+    """Liveness: the process is up (see /ready for whether it should get traffic)"""
+    return {"status": "healthy", "service": "Pronunciation Assessment"}
+
+
+@router.get("/ready")
+async def readiness():
+    """For load balancer health checks: cold or model-less workers get no traffic"""
+    stats = service.warmup.stats()
+    return JSONResponse(stats, status_code=200 if stats['ready'] else 503)
+
+
+@router.get("/models")
+async def model_status():
+    return service.model_registry.stats()
+
+
+@router.get("/workers")
+async def worker_status():
+    pool = service.feature_pool
+    pool_stats = {"enabled": False} if pool is None else {"enabled": True, **pool.stats()}
+    return {**pool_stats, "runner": runner.stats()}
+
+
+@router.get("/metrics")
+async def metrics():
+    if service.stage_metrics is None:
+        return _error("Metrics are disabled (set METRICS_ENABLED=1).", 404)
+    return PlainTextResponse(service.stage_metrics.render(), media_type='text/plain; version=0.0.4')
+
+
+@router.post("/admin/reload-models")
+async def reload_models(request: Request, x_admin_token: Optional[str] = Header(None)):
+    if not service.admin_allowed(x_admin_token, request.client.host if request.client else None):
+        return _error("Forbidden: send a valid 'X-Admin-Token' header.", 403)
+    # Not on the runner: a reload must go through even when predictions fill it
+    try:
+        await asyncio.to_thread(service.model_registry.reload)
+    except Exception as e:
+        # The previously loaded models keep serving
+        return JSONResponse(
+            {"success": False, "error": f"Error reloading models: {e}", **service.model_registry.stats()}, status_code=500
+        )
+    return {"success": True, **service.model_registry.stats()}
+
+
+@router.post("/predict")
+@_overload_errors
+async def predict_pronunciation(
+    audio_file: Optional[UploadFile] = File(None),
+    target_word: Optional[str] = Form(None),
+    x_debug_timings: Optional[str] = Header(None)
+):
+    if audio_file is None or target_word is None:
+        return _error("Missing 'audio_file' or 'target_word' in request.", 400)
+
+    stage_metrics = service.stage_metrics
+    started = time.perf_counter()
+    audio_bytes = await audio_file.read()
+    upload_seconds = time.perf_counter() - started
+
+    def call():
+        snapshot = service.model_registry.get()
+        if snapshot is None:
+            return None, None
+        # Stages are collected in the thread that runs them
+        with (collect_stages() if stage_metrics is not None else nullcontext()) as timings:
+            return snapshot.predictor.predict(audio_bytes, target_word), timings
+
+    prediction_result, timings = await runner.run(call)
+    if prediction_result is None:
+        return _error(MODEL_NOT_LOADED, 500)
+
+    headers = None
+    if timings is not None:
+        timings = [('upload', upload_seconds)] + timings + [('total', time.perf_counter() - started)]
+        stage_metrics.observe(timings)
+        if service.config.METRICS_DEBUG_HEADER and x_debug_timings == '1':
+            headers = {'Server-Timing': server_timing_header(timings)}
+
+    if prediction_result['success']:
+        status_code = 200
+    else:
+        # Return 400 for client-side errors like missing model for word or feature extraction failure
+        error = prediction_result.get('error', '')
+        status_code = 400 if 'No model found' in error or 'Failed to extract features' in error else 500
+    return JSONResponse(prediction_result, status_code=status_code, headers=headers)
+
+
+@router.post("/predict/batch")
+@_overload_errors
+async def predict_pronunciation_batch(
+    audio_files: List[UploadFile] = File(None),
+    target_words: List[str] = Form(None),
+    target_word: Optional[str] = Form(None)
+):
+    # Repeated 'audio_files' and 'target_words' fields, paired by position. A single
+    # 'target_word' may be given instead to score every file against the same word.
+    audio_files = audio_files or []
+    if not target_words and target_word is not None:
+        target_words = [target_word] * len(audio_files)
+
+    if not audio_files or not target_words:
+        return _error("Missing 'audio_files' or 'target_words' in request.", 400)
+    if len(audio_files) != len(target_words):
+        return _error(f"Got {len(audio_files)} audio files but {len(target_words)} target words.", 400)
+    if len(audio_files) > service.config.MAX_BATCH_SIZE:
+        return _error(f"Batch too large: at most {service.config.MAX_BATCH_SIZE} recordings per request.", 413)
+
+    items = [(await audio_file.read(), word) for audio_file, word in zip(audio_files, target_words)]
+    results = await _call_predictor('predict_batch', items)
+    if results is None:
+        return _error(MODEL_NOT_LOADED, 500)
+
+    for result, audio_file in zip(results, audio_files):
+        result['filename'] = audio_file.filename
+
+    failed = sum(1 for result in results if not result['success'])
+    return {
+        "success": True,
+        "count": len(results),
+        "failed": failed,
+        "results": results
+    }
+
+
+@router.post("/predict/utterance")
+@_overload_errors
+async def predict_utterance(
+    audio_file: Optional[UploadFile] = File(None),
+    target_words: List[str] = Form(None)
+):
+    # The words in the order they were said: repeated fields or one comma-separated value
+    target_words = target_words or []
+    if len(target_words) == 1:
+        target_words = [word for word in target_words[0].split(',') if word.strip()]
+
+    if audio_file is None or not target_words:
+        return _error("Missing 'audio_file' or 'target_words' in request.", 400)
+    if len(target_words) > service.config.UTTERANCE_MAX_WORDS:
+        return _error(f"Too many words: at most {service.config.UTTERANCE_MAX_WORDS} per recording.", 413)
+
+    utterance_result = await _call_predictor('predict_utterance', await audio_file.read(), target_words)
+    if utterance_result is None:
+        return _error(MODEL_NOT_LOADED, 500)
+    return JSONResponse(utterance_result, status_code=200 if utterance_result['success'] else 400)
+
+
+@router.post("/predict/rank")
+@_overload_errors
+async def rank_words(audio_file: Optional[UploadFile] = File(None), top_n: str = Form('5')):
+    if audio_file is None:
+        return _error("Missing 'audio_file' in request.", 400)
+    try:
+        top_n = int(top_n)
+    except ValueError:
+        return _error("'top_n' must be an integer.", 400)
+    if top_n < 1:
+        return _error("'top_n' must be at least 1.", 400)
+
+    ranking_result = await _call_predictor('rank_words', await audio_file.read(), top_n)
+    if ranking_result is None:
+        return _error(MODEL_NOT_LOADED, 500)
+    return JSONResponse(ranking_result, status_code=200 if ranking_result['success'] else 400)
+
+
+@router.websocket("/stream")
+async def stream_pronunciation(ws: WebSocket):
+    """
+    Streaming assessment, same protocol as the Flask app's /stream:
+    /pronunciation/stream?target_word=<word>&sample_rate=<hz>&format=pcm16|f32
+    """
+    await ws.accept()
+
+    async def send(message):
+        await ws.send_text(json.dumps(message))
+
+    async def fail(error):
+        await send({"type": "error", "success": False, "error": error})
+        await ws.close()
+
+    params = ws.query_params
+    target_word = params.get('target_word')
+    if not target_word:
+        return await fail("Missing 'target_word' query parameter.")
+    sample_format = params.get('format', 'pcm16')
+    if sample_format not in ('pcm16', 'f32'):
+        return await fail("'format' must be 'pcm16' or 'f32'.")
+    try:
+        sample_rate = int(params.get('sample_rate', service.config.SAMPLE_RATE))
+    except ValueError:
+        return await fail("'sample_rate' must be an integer.")
+
+    try:
+        snapshot = await runner.run(service.model_registry.get)
+        if snapshot is None:
+            return await fail(MODEL_NOT_LOADED)
+        session = StreamingAssessment(
+            snapshot.predictor, target_word, service.config, input_sr=sample_rate, sample_format=sample_format
+        )
+        error = session.check()
+        if error is not None:
+            await send({"type": "error", **error})
+            return await ws.close()
+
+        while True:
+            message = await ws.receive()
+            if message['type'] == 'websocket.disconnect':
+                return
+            text = message.get('text')
+            if text is not None:
+                if text.strip().lower() == 'end':
+                    break
+                continue  # unknown control messages are ignored
+            provisional = await runner.run(session.feed, message.get('bytes') or b'')
+            if provisional is not None:
+                await send(provisional)
+
+        await send(await runner.run(session.finish))
+    except PoolBusyError as e:
+        return await fail(f"Server busy: {e}. Please retry shortly.")
+    except ExtractionTimeoutError as e:
+        return await fail(str(e))
+    except Exception as e:
+        return await fail(f"Error processing audio stream: {str(e)}")
+    await ws.close()
@@ -1,242 +1,122 @@
-from flask import Flask, request, jsonify
-import os
-import pickle
-import numpy as np
-import librosa
-import pandas as pd # Although not directly used by predictor, it's good practice to include if the original classes used it.
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.svm import SVC
+from flask import Flask, Response, request, jsonify
+import json
+import multiprocessing
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
-# ==================== CONFIG ====================
-class Config:
-    """Configuration parameters for the model"""
-    SAMPLE_RATE = 22050  # Audio sample rate
-    DURATION = 5  # Maximum audio duration in seconds
-    N_MFCC = 13  # Number of MFCC coefficients
-    N_CHROMA = 12  # Number of chroma features
-    N_MEL = 128  # Number of mel bands
-    N_CONTRAST = 7  # Number of spectral contrast bands
-
-    # SVM parameters (not directly used by predictor, but good to keep consistent)
-    SVM_KERNEL = 'rbf'
-    SVM_C = 10.0
-    SVM_GAMMA = 'scale'
-    RANDOM_STATE = 42
-    TEST_SIZE = 0.2
-
-# ==================== FEATURE EXTRACTION ====================
-class AudioFeatureExtractor:
-    """Extract audio features from wav files"""
-
-    def __init__(self, config=Config()):
-        self.config = config
-
-    def load_audio(self, file_path):
-        """Load audio file with error handling"""
-        try:
-            y, sr = librosa.load(
-                file_path,
-                sr=self.config.SAMPLE_RATE,
-                duration=self.config.DURATION
-            )
-            return y, sr
-        except Exception as e:
-            print(f"Error loading {file_path}: {e}")
-            return None, None
-
-    def extract_mfcc(self, y, sr):
-        """Extract MFCC features"""
-        mfcc = librosa.feature.mfcc(
-            y=y,
-            sr=sr,
-            n_mfcc=self.config.N_MFCC
-        )
-        # Statistical features: mean, std, min, max
-        mfcc_mean = np.mean(mfcc, axis=1)
-        mfcc_std = np.std(mfcc, axis=1)
-        mfcc_min = np.min(mfcc, axis=1)
-        mfcc_max = np.max(mfcc, axis=1)
-        return np.concatenate([mfcc_mean, mfcc_std, mfcc_min, mfcc_max])
-
-    def extract_chroma(self, y, sr):
-        """Extract chroma features"""
-        chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-        chroma_mean = np.mean(chroma, axis=1)
-        chroma_std = np.std(chroma, axis=1)
-        return np.concatenate([chroma_mean, chroma_std])
-
-    def extract_mel_spectrogram(self, y, sr):
-        """Extract mel-spectrogram features"""
-        mel = librosa.feature.melspectrogram(
-            y=y,
-            sr=sr,
-            n_mels=self.config.N_MEL
-        )
-        mel_db = librosa.power_to_db(mel, ref=np.max)
-        mel_mean = np.mean(mel_db, axis=1)
-        mel_std = np.std(mel_db, axis=1)
-        return np.concatenate([mel_mean, mel_std])
-
-    def extract_spectral_contrast(self, y, sr):
-        """Extract spectral contrast features"""
-        contrast = librosa.feature.spectral_contrast(
-            y=y,
-            sr=sr,
-            n_bands=self.config.N_CONTRAST - 1
-        )
-        contrast_mean = np.mean(contrast, axis=1)
-        contrast_std = np.std(contrast, axis=1)
-        return np.concatenate([contrast_mean, contrast_std])
-
-    def extract_zero_crossing_rate(self, y):
-        """Extract zero crossing rate"""
-        zcr = librosa.feature.zero_crossing_rate(y)
-        return np.array([np.mean(zcr), np.std(zcr)])
-
-    def extract_spectral_rolloff(self, y, sr):
-        """Extract spectral rolloff"""
-        rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)
-        return np.array([np.mean(rolloff), np.std(rolloff)])
-
-    def extract_rms_energy(self, y):
-        """Extract RMS energy"""
-        rms = librosa.feature.rms(y=y)
-        return np.array([np.mean(rms), np.std(rms)])
-
-    def extract_all_features(self, file_path):
-        """Extract all features from audio file"""
-        y, sr = self.load_audio(file_path)
-
-        if y is None:
-            return None
-
-        # Extract all features
-        mfcc_features = self.extract_mfcc(y, sr)
-        chroma_features = self.extract_chroma(y, sr)
-        mel_features = self.extract_mel_spectrogram(y, sr)
-        contrast_features = self.extract_spectral_contrast(y, sr)
-        zcr_features = self.extract_zero_crossing_rate(y)
-        rolloff_features = self.extract_spectral_rolloff(y, sr)
-        rms_features = self.extract_rms_energy(y)
-
-        # Combine all features
-        feature_vector = np.concatenate([
-            mfcc_features,      # 52 features (13*4)
-            chroma_features,    # 24 features (12*2)
-            mel_features,       # 256 features (128*2)
-            contrast_features,  # 14 features (7*2)
-            zcr_features,       # 2 features
-            rolloff_features,   # 2 features
-            rms_features        # 2 features
-        ])
-
-        return feature_vector
-
-# ==================== PREDICTOR ====================
-class PronunciationPredictor:
-    """Make predictions on new audio"""
-
-    def __init__(self, models, feature_extractor):
-        self.models = models
-        self.feature_extractor = feature_extractor
-
-    def predict(self, audio_path, target_word):
-        """Predict pronunciation quality"""
-        target_word = target_word.lower().strip()
-
-        # Check if model exists
-        if target_word not in self.models:
-            available_words = ', '.join(self.models.keys())
-            return {
-                'success': False,
-                'error': f"No model found for word '{target_word}'",
-                'available_words': available_words
-            }
-
-        # Extract features
-        features = self.feature_extractor.extract_all_features(audio_path)
-
-        if features is None:
-            return {
-                'success': False,
-                'error': 'Failed to extract features from audio file'
-            }
-
-        # Get model components
-        model_data = self.models[target_word]
-        model = model_data['model']
-        scaler = model_data['scaler']
-        encoder = model_data['encoder']
-
-        # Scale features
-        features_scaled = scaler.transform(features.reshape(1, -1))
-
-        # Predict
-        prediction = model.predict(features_scaled)[0]
-        prediction_proba = model.predict_proba(features_scaled)[0]
-
-        # Get result
-        result = encoder.inverse_transform([prediction])[0]
-        confidence = prediction_proba[prediction]
-
-        return {
-            'success': True,
-            'word': target_word,
-            'prediction': result,
-            'confidence': confidence,
-            'probabilities': {
-                'Correct': prediction_proba[0] if encoder.classes_[0] == 'Correct' else prediction_proba[1],
-                'Incorrect': prediction_proba[1] if encoder.classes_[0] == 'Correct' else prediction_proba[0]
-            },
-            'model_accuracy': model_data['accuracy'],
-            'cv_accuracy': model_data['cv_scores'].mean()
-        }
+# Ensure the backend directory is in Python path so the package imports below
+# work when this file is run directly (python app.py)
+BACKEND_DIR = Path(__file__).parent.parent.absolute()
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
 
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.metrics import collect_stages, server_timing_header, stage
+from voice_pronounciation_detection.service import PronunciationService
+from voice_pronounciation_detection.streaming import StreamingAssessment
+from voice_pronounciation_detection.worker_pool import ExtractionTimeoutError, PoolBusyError
 
-app = Flask(__name__)
-
-# Global variables for model and feature extractor
-predictor = None
-
-# Load the models and feature extractor at application startup
-def load_predictor():
-    global predictor
-    # IMPORTANT: Update this path if your model file is in a different location in the deployed environment
-    MODEL_PATH = './pronunciation_models.pkl' 
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
 
-    if not os.path.exists(MODEL_PATH):
-        print(f"Error: Model file not found at {MODEL_PATH}")
-        # Attempt to load from current directory as fallback for local testing
-        MODEL_PATH = 'pronunciation_models.pkl'
-        if not os.path.exists(MODEL_PATH):
-            print(f"Error: Model file not found in current directory either: {MODEL_PATH}")
-            return
-
-    try:
-        with open(MODEL_PATH, 'rb') as f:
-            models = pickle.load(f)
-        print(f"✓ Models loaded from: {MODEL_PATH}")
-
-        config = Config()
-        feature_extractor = AudioFeatureExtractor(config)
-        predictor = PronunciationPredictor(models, feature_extractor)
-        print("✓ Pronunciation Predictor initialized.")
-    except Exception as e:
-        print(f"Error loading predictor: {e}")
-
-@app.before_request
-def initialize_predictor():
-    load_predictor()
+app = Flask(__name__)
+sock = Sock(app) if Sock is not None else None
+
+config = Config()
+
+# Starts the feature worker pool, loads the models and begins the warm-up; /ready
+# answers 503 until that is done. Spawned pool workers re-import this module, so
+# only the parent process starts a pool.
+service = PronunciationService(config).start(worker_pool=multiprocessing.parent_process() is None)
+feature_cache = service.feature_cache
+feature_extractor = service.feature_extractor
+feature_pool = service.feature_pool
+stage_metrics = service.stage_metrics
+cascade = service.cascade
+model_registry = service.model_registry
+warmup = service.warmup
 
 @app.route('/', methods=['GET'])
 def home():
     return "Welcome to the Pronunciation Assessment API!"
 
+@app.route('/ready', methods=['GET'])
+def readiness():
+    # For load balancer health checks: cold or model-less workers get no traffic
+    stats = warmup.stats()
+    return jsonify(stats), 200 if stats['ready'] else 503
+
+@app.errorhandler(PoolBusyError)
+def handle_pool_busy(e):
+    return jsonify({"success": False, "error": f"Server busy: {e}. Please retry shortly."}), 503, {'Retry-After': '1'}
+
+@app.errorhandler(ExtractionTimeoutError)
+def handle_extraction_timeout(e):
+    return jsonify({"success": False, "error": str(e)}), 504
+
+@app.route('/workers', methods=['GET'])
+def worker_status():
+    if feature_pool is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **feature_pool.stats()})
+
+@app.route('/cache', methods=['GET'])
+def cache_status():
+    if feature_pool is not None:
+        # Lookups happen inside the worker processes, each with its own memory tier
+        if feature_cache is None:
+            return jsonify({"enabled": False, "location": "worker processes"})
+        return jsonify({"enabled": True, "location": "worker processes", **feature_pool.cache_stats()})
+    if feature_cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **feature_cache.stats()})
+
+@app.route('/vad', methods=['GET'])
+def vad_status():
+    if not config.VAD_ENABLED:
+        return jsonify({"enabled": False})
+    if feature_pool is not None:
+        # Trimming happens inside the worker processes
+        return jsonify({"enabled": True, "location": "worker processes"})
+    return jsonify({"enabled": True, **feature_extractor.trimmer.stats()})
+
+@app.route('/cascade', methods=['GET'])
+def cascade_status():
+    if cascade is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **cascade.stats()})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    if stage_metrics is None:
+        return jsonify({"success": False, "error": "Metrics are disabled (set METRICS_ENABLED=1)."}), 404
+    return Response(stage_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/models', methods=['GET'])
+def model_status():
+    return jsonify(model_registry.stats())
+
+@app.route('/admin/reload-models', methods=['POST'])
+def reload_models():
+    if not service.admin_allowed(request.headers.get('X-Admin-Token'), request.remote_addr):
+        return jsonify({"success": False, "error": "Forbidden: send a valid 'X-Admin-Token' header."}), 403
+    try:
+        model_registry.reload()
+    except Exception as e:
+        # The previously loaded models keep serving
+        return jsonify({"success": False, "error": f"Error reloading models: {e}", **model_registry.stats()}), 500
+    return jsonify({"success": True, **model_registry.stats()})
+
 @app.route('/predict', methods=['POST'])
 def predict_pronunciation():
-    if predictor is None:
+    snapshot = model_registry.get()
+    if snapshot is None:
         return jsonify({"success": False, "error": "Model not loaded. Please ensure models are available and restart the server."}), 500
 
     # Expecting form data with 'audio_file' and 'target_word'
@@ -246,21 +126,166 @@ def predict_pronunciation():
     audio_file = request.files['audio_file']
     target_word = request.form['target_word']
 
-    # Save the audio file temporarily. Ensure /tmp exists or choose another writable location.
-    temp_audio_path = os.path.join('./tmp/', audio_file.filename)
-    audio_file.save(temp_audio_path)
-
-    prediction_result = predictor.predict(temp_audio_path, target_word)
-
-    # Clean up temporary file
-    os.remove(temp_audio_path)
+    with (collect_stages() if stage_metrics is not None else nullcontext()) as timings:
+        started = time.perf_counter()
+        with stage('upload'):
+            audio_bytes = audio_file.read()
+        # Decode straight from the request buffer; no per-request files in ./tmp
+        prediction_result = snapshot.predictor.predict(audio_bytes, target_word)
+        if timings is not None:
+            timings.append(('total', time.perf_counter() - started))
+            stage_metrics.observe(timings)
 
     if prediction_result['success']:
-        return jsonify(prediction_result)
+        response = jsonify(prediction_result), 200
     else:
         # Return 400 for client-side errors like missing model for word or feature extraction failure
         status_code = 400 if 'No model found' in prediction_result.get('error', '') or 'Failed to extract features' in prediction_result.get('error', '') else 500
-        return jsonify(prediction_result), status_code
+        response = jsonify(prediction_result), status_code
+
+    if timings is not None and config.METRICS_DEBUG_HEADER and request.headers.get('X-Debug-Timings') == '1':
+        return response + ({'Server-Timing': server_timing_header(timings)},)
+    return response
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_pronunciation_batch():
+    snapshot = model_registry.get()
+    if snapshot is None:
+        return jsonify({"success": False, "error": "Model not loaded. Please ensure models are available and restart the server."}), 500
+
+    # Expecting form data with repeated 'audio_files' and 'target_words' fields, paired by position.
+    # A single 'target_word' may be given instead to score every file against the same word.
+    audio_files = request.files.getlist('audio_files')
+    target_words = request.form.getlist('target_words')
+    if not target_words and 'target_word' in request.form:
+        target_words = [request.form['target_word']] * len(audio_files)
+
+    if not audio_files or not target_words:
+        return jsonify({"success": False, "error": "Missing 'audio_files' or 'target_words' in request."}), 400
+    if len(audio_files) != len(target_words):
+        return jsonify({"success": False, "error": f"Got {len(audio_files)} audio files but {len(target_words)} target words."}), 400
+    if len(audio_files) > config.MAX_BATCH_SIZE:
+        return jsonify({"success": False, "error": f"Batch too large: at most {config.MAX_BATCH_SIZE} recordings per request."}), 413
+
+    items = [(audio_file.read(), target_word) for audio_file, target_word in zip(audio_files, target_words)]
+    results = snapshot.predictor.predict_batch(items)
+
+    for result, audio_file in zip(results, audio_files):
+        result['filename'] = audio_file.filename
+
+    failed = sum(1 for result in results if not result['success'])
+    return jsonify({
+        "success": True,
+        "count": len(results),
+        "failed": failed,
+        "results": results
+    })
+
+@app.route('/predict/utterance', methods=['POST'])
+def predict_utterance():
+    snapshot = model_registry.get()
+    if snapshot is None:
+        return jsonify({"success": False, "error": "Model not loaded. Please ensure models are available and restart the server."}), 500
+
+    # Expecting form data with 'audio_file' and the words in the order they were said, either as
+    # repeated 'target_words' fields or one comma-separated 'target_words' value
+    target_words = request.form.getlist('target_words')
+    if len(target_words) == 1:
+        target_words = [word for word in target_words[0].split(',') if word.strip()]
+
+    if 'audio_file' not in request.files or not target_words:
+        return jsonify({"success": False, "error": "Missing 'audio_file' or 'target_words' in request."}), 400
+    if len(target_words) > config.UTTERANCE_MAX_WORDS:
+        return jsonify({"success": False, "error": f"Too many words: at most {config.UTTERANCE_MAX_WORDS} per recording."}), 413
+
+    utterance_result = snapshot.predictor.predict_utterance(request.files['audio_file'].read(), target_words)
+
+    if utterance_result['success']:
+        return jsonify(utterance_result)
+    return jsonify(utterance_result), 400
+
+@app.route('/predict/rank', methods=['POST'])
+def rank_words():
+    snapshot = model_registry.get()
+    if snapshot is None:
+        return jsonify({"success": False, "error": "Model not loaded. Please ensure models are available and restart the server."}), 500
+
+    # Expecting form data with 'audio_file' and an optional 'top_n' (default 5)
+    if 'audio_file' not in request.files:
+        return jsonify({"success": False, "error": "Missing 'audio_file' in request."}), 400
+    try:
+        top_n = int(request.form.get('top_n', 5))
+    except ValueError:
+        return jsonify({"success": False, "error": "'top_n' must be an integer."}), 400
+    if top_n < 1:
+        return jsonify({"success": False, "error": "'top_n' must be at least 1."}), 400
+
+    ranking_result = snapshot.predictor.rank_words(request.files['audio_file'].read(), top_n=top_n)
+
+    if ranking_result['success']:
+        return jsonify(ranking_result)
+    return jsonify(ranking_result), 400
+
+def stream_pronunciation(ws):
+    """
+    Streaming assessment over a WebSocket:
+    /stream?target_word=<word>&sample_rate=<hz>&format=pcm16|f32
+
+    The client sends mono PCM as binary messages and the text message 'end'
+    when the utterance is over. The server answers with JSON messages of type
+    'provisional' (while audio arrives) and one 'final' verdict, or 'error'.
+    """
+    def send(message):
+        ws.send(json.dumps(message))
+
+    snapshot = model_registry.get()
+    if snapshot is None:
+        send({"type": "error", "success": False, "error": "Model not loaded. Please ensure models are available and restart the server."})
+        return
+
+    target_word = request.args.get('target_word')
+    if not target_word:
+        send({"type": "error", "success": False, "error": "Missing 'target_word' query parameter."})
+        return
+    sample_format = request.args.get('format', 'pcm16')
+    if sample_format not in ('pcm16', 'f32'):
+        send({"type": "error", "success": False, "error": "'format' must be 'pcm16' or 'f32'."})
+        return
+    try:
+        sample_rate = int(request.args.get('sample_rate', config.SAMPLE_RATE))
+    except ValueError:
+        send({"type": "error", "success": False, "error": "'sample_rate' must be an integer."})
+        return
+
+    try:
+        session = StreamingAssessment(snapshot.predictor, target_word, config, input_sr=sample_rate, sample_format=sample_format)
+    except ValueError as e:
+        send({"type": "error", "success": False, "error": str(e)})
+        return
+    error = session.check()
+    if error is not None:
+        send({"type": "error", **error})
+        return
+
+    try:
+        while True:
+            message = ws.receive()
+            if message is None or (isinstance(message, str) and message.strip().lower() == 'end'):
+                break
+            if isinstance(message, str):
+                continue  # unknown control messages are ignored
+            provisional = session.feed(message)
+            if provisional is not None:
+                send(provisional)
+
+        send(session.finish())
+    except Exception as e:
+        send({"type": "error", "success": False, "error": f"Error processing audio stream: {str(e)}"})
+
+if sock is not None:
+    sock.route('/stream')(stream_pronunciation)
+else:
+    print("flask-sock not installed: streaming endpoint /stream disabled")
 
 if __name__ == '__main__':
     # In a Colab environment, use 0.0.0.0 to make it accessible
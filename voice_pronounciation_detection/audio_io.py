@@ -0,0 +1,183 @@
+"""
+In-memory audio decoding for the pronunciation service.
+Decodes uploads straight from the request buffer; a temp file is only used for
+compressed formats that need librosa's audioread/ffmpeg fallback.
+"""
+import io
+import os
+import tempfile
+import wave
+from math import gcd
+from typing import BinaryIO, Optional, Tuple, Union
+
+import numpy as np
+import librosa
+import scipy.signal
+
+from voice_pronounciation_detection.metrics import stage
+
+try:
+    import soundfile as sf
+except ImportError:  # librosa normally pulls this in; fall back to temp files without it
+    sf = None
+
+AudioSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+# Resampler quality modes; soxr_hq is what librosa.load uses (and what the models were trained on)
+RESAMPLE_QUALITIES = ('soxr_vhq', 'soxr_hq', 'soxr_mq', 'soxr_lq', 'soxr_qq', 'polyphase')
+# Largest up/down factor handed to the polyphase resampler; other ratios go through soxr_hq
+MAX_POLYPHASE_FACTOR = 8
+
+# Magic bytes -> file suffix for formats that have to go through a temp file
+_SUFFIX_BY_MAGIC = [
+    (b'ID3', '.mp3'),
+    (b'\xff\xfb', '.mp3'),
+    (b'\xff\xf3', '.mp3'),
+    (b'\xff\xf2', '.mp3'),
+    (b'OggS', '.ogg'),
+    (b'fLaC', '.flac'),
+    (b'RIFF', '.wav'),
+]
+
+
+def read_source(source: AudioSource) -> Union[str, bytes]:
+    """Return a path for path-like sources, otherwise the raw bytes"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, 'read'):
+        if hasattr(source, 'seek'):
+            try:
+                source.seek(0)
+            except (OSError, ValueError):
+                pass
+        return source.read()
+    raise TypeError(f"Unsupported audio source type: {type(source).__name__}")
+
+
+def guess_suffix(data: bytes) -> str:
+    """Best-effort file suffix from the container's magic bytes"""
+    if data[4:8] == b'ftyp':
+        return '.m4a'
+    for magic, suffix in _SUFFIX_BY_MAGIC:
+        if data.startswith(magic):
+            return suffix
+    return '.bin'
+
+
+def _to_mono(y: np.ndarray) -> np.ndarray:
+    """(frames, channels) -> (frames,), averaging channels like librosa.to_mono"""
+    if y.ndim > 1:
+        y = np.mean(y, axis=1)
+    return y
+
+
+def decode_pcm_wav(data: bytes, duration: Optional[float] = None) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Fast path for integer PCM WAV using only the stdlib wave module.
+
+    Returns (samples, native_sr) as float32 in [-1, 1], scaled the same way
+    soundfile scales integer PCM, or None if the data isn't plain PCM WAV.
+    """
+    if not (data[:4] == b'RIFF' and data[8:12] == b'WAVE'):
+        return None
+    try:
+        with wave.open(io.BytesIO(data), 'rb') as wav:
+            n_channels = wav.getnchannels()
+            sample_width = wav.getsampwidth()
+            native_sr = wav.getframerate()
+            n_frames = wav.getnframes()
+            if duration is not None:
+                n_frames = min(n_frames, int(duration * native_sr))
+            raw = wav.readframes(n_frames)
+    except (wave.Error, EOFError):
+        # Float and WAVE_FORMAT_EXTENSIBLE files aren't handled by the wave module
+        return None
+
+    if sample_width == 1:
+        y = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        y = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    elif sample_width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        ints = (b[:, 0].astype(np.int32) | (b[:, 1].astype(np.int32) << 8) | (b[:, 2].astype(np.int32) << 16))
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        y = ints.astype(np.float32) / 8388608.0
+    elif sample_width == 4:
+        y = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+    else:
+        return None
+
+    if n_channels > 1:
+        y = y[:len(y) - len(y) % n_channels].reshape(-1, n_channels)
+    return _to_mono(y), native_sr
+
+
+def decode_soundfile(data: bytes, duration: Optional[float] = None) -> Optional[Tuple[np.ndarray, int]]:
+    """Decode any libsndfile format (WAV, FLAC, OGG, ...) from memory"""
+    if sf is None:
+        return None
+    try:
+        with sf.SoundFile(io.BytesIO(data)) as f:
+            native_sr = f.samplerate
+            frames = -1 if duration is None else int(duration * native_sr)
+            y = f.read(frames=frames, dtype='float32', always_2d=False)
+    except Exception:
+        return None
+    return _to_mono(y), native_sr
+
+
+def decode_via_tempfile(data: bytes, duration: Optional[float] = None) -> Tuple[np.ndarray, int]:
+    """Last resort for formats libsndfile can't read (m4a, some mp3): hand librosa a real file"""
+    fd, path = tempfile.mkstemp(suffix=guess_suffix(data))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        return librosa.load(path, sr=None, duration=duration)
+    finally:
+        os.remove(path)
+
+
+def resample(y: np.ndarray, orig_sr: int, target_sr: int, quality: str = 'soxr_hq') -> np.ndarray:
+    """
+    Resample y, returning it untouched when the rates already match.
+
+    'polyphase' uses scipy's polyphase filter for small integer ratios
+    (e.g. 44.1 kHz -> 22.05 kHz) and falls back to soxr_hq for the rest.
+    """
+    if orig_sr == target_sr:
+        return y
+    if quality not in RESAMPLE_QUALITIES:
+        raise ValueError(f"Unknown resample quality '{quality}', expected one of {', '.join(RESAMPLE_QUALITIES)}")
+    if quality == 'polyphase':
+        g = gcd(orig_sr, target_sr)
+        up, down = target_sr // g, orig_sr // g
+        if max(up, down) <= MAX_POLYPHASE_FACTOR:
+            return scipy.signal.resample_poly(y, up, down).astype(np.float32)
+        quality = 'soxr_hq'
+    return librosa.resample(y, orig_sr=orig_sr, target_sr=target_sr, res_type=quality)
+
+
+def decode_audio(source: AudioSource, sr: Optional[int] = None, duration: Optional[float] = None,
+                 quality: str = 'soxr_hq') -> Tuple[np.ndarray, int]:
+    """
+    Decode audio from a path, bytes or file-like object.
+
+    With the default quality this matches librosa.load(source, sr=sr,
+    duration=duration): mono float32, cropped to duration at the native rate,
+    then resampled to sr. Input already at sr skips resampling entirely.
+    """
+    source = read_source(source)
+    with stage('decode'):
+        if isinstance(source, str):
+            y, native_sr = librosa.load(source, sr=None, duration=duration)
+        else:
+            decoded = decode_pcm_wav(source, duration) or decode_soundfile(source, duration)
+            y, native_sr = decoded if decoded is not None else decode_via_tempfile(source, duration)
+
+    if sr is not None and native_sr != sr:
+        with stage('resample'):
+            y = resample(y, native_sr, sr, quality)
+        native_sr = sr
+    return np.ascontiguousarray(y, dtype=np.float32), native_sr
@@ -0,0 +1,148 @@
+"""
+Two-stage cascade classifier for the pronunciation service.
+A small per-word logistic regression on the cheap features (MFCC, ZCR, RMS)
+answers clips it is confident about; the rest fall through to the full
+352-dim feature vector and the word's SVC.
+"""
+import pickle
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+CASCADE_FORMAT = 'cascade-v1'
+
+# Positions of the first-stage features (MFCC 52, ZCR 2, RMS 2) inside the full vector,
+# so first-stage models can be trained from full feature matrices
+FAST_FEATURE_INDEX = np.r_[0:52, 346:348, 350:352]
+
+
+def fast_features_from_full(features: np.ndarray) -> np.ndarray:
+    """First-stage features of one (352,) vector or an (n, 352) matrix"""
+    return np.asarray(features)[..., FAST_FEATURE_INDEX]
+
+
+def first_stage_proba(model_data: Dict[str, Any], fast_features: np.ndarray) -> np.ndarray:
+    """predict_proba row of a first-stage model for one fast feature vector"""
+    scaled = model_data['scaler'].transform(np.asarray(fast_features).reshape(1, -1))
+    return model_data['model'].predict_proba(scaled)[0]
+
+
+def train_first_stage(X_fast: np.ndarray, labels, config) -> Dict[str, Any]:
+    """
+    Fit one word's first-stage model on (n, 56) fast features and 'Correct'/'Incorrect' labels.
+
+    Returns model data in the same shape as the SVC models
+    ({'model','scaler','encoder','accuracy','cv_scores'}).
+    """
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import cross_val_score
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+    encoder = LabelEncoder()
+    y = encoder.fit_transform(labels)
+    scaler = StandardScaler()
+    X = scaler.fit_transform(X_fast)
+    model = LogisticRegression(C=1.0, max_iter=1000, random_state=config.RANDOM_STATE)
+
+    folds = min(5, int(np.bincount(y).min()))
+    # Empty when a label has fewer than 2 clips (reported as cv_accuracy None)
+    cv_scores = cross_val_score(model, X, y, cv=folds) if folds >= 2 else np.empty(0)
+    model.fit(X, y)
+    return {
+        'model': model,
+        'scaler': scaler,
+        'encoder': encoder,
+        'accuracy': float(model.score(X, y)),
+        'cv_scores': np.asarray(cv_scores)
+    }
+
+
+def evaluate_cascade(holdout: Dict[str, np.ndarray], threshold: float) -> Dict[str, Any]:
+    """
+    Hit rate and accuracy of the cascade against the full path on held-out clips.
+
+    Args:
+        holdout: 'fast_confidence', 'fast_correct' and 'full_correct', one entry per clip
+        threshold: First-stage confidence needed to skip the full path
+    """
+    confidence = np.asarray(holdout['fast_confidence'], dtype=float)
+    fast_correct = np.asarray(holdout['fast_correct'], dtype=bool)
+    full_correct = np.asarray(holdout['full_correct'], dtype=bool)
+    if len(confidence) == 0:
+        return {'clips': 0}
+
+    hits = confidence >= threshold
+    cascade_correct = np.where(hits, fast_correct, full_correct)
+    full_accuracy = float(full_correct.mean())
+    cascade_accuracy = float(cascade_correct.mean())
+    return {
+        'clips': int(len(confidence)),
+        'threshold': threshold,
+        'hit_rate': float(hits.mean()),
+        'full_accuracy': full_accuracy,
+        'cascade_accuracy': cascade_accuracy,
+        'accuracy_delta': cascade_accuracy - full_accuracy
+    }
+
+
+def save_cascade(path: str, models: Dict[str, Any], holdout: Dict[str, np.ndarray], threshold: float) -> None:
+    """Write the first-stage models plus the held-out records the service evaluates them with"""
+    with open(path, 'wb') as f:
+        pickle.dump({
+            'format': CASCADE_FORMAT,
+            'models': models,
+            'holdout': holdout,
+            'threshold': threshold
+        }, f)
+
+
+class CascadeClassifier:
+    """
+    First-stage models for the words that have one, the serving threshold and
+    live counters of how often the first stage answered.
+    """
+
+    def __init__(self, models: Dict[str, Any], threshold: float, holdout: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Args:
+            models: word -> first-stage model data (see train_first_stage)
+            threshold: First-stage confidence (max class probability) needed to skip the full path
+            holdout: Held-out records written at training time (see evaluate_cascade)
+        """
+        self.models = models
+        self.threshold = threshold
+        self.holdout = holdout
+        self._lock = threading.Lock()
+        self.clips = 0
+        self.fast = 0
+
+    @classmethod
+    def load(cls, path: str, threshold: Optional[float] = None) -> "CascadeClassifier":
+        """Load a bundle written by save_cascade; threshold overrides the one it was trained with"""
+        with open(path, 'rb') as f:
+            bundle = pickle.load(f)
+        if bundle.get('format') != CASCADE_FORMAT:
+            raise ValueError(f"Unsupported cascade format: {bundle.get('format')}")
+        return cls(bundle['models'], bundle['threshold'] if threshold is None else threshold, bundle.get('holdout'))
+
+    def __contains__(self, word) -> bool:
+        return word in self.models
+
+    def record(self, stage: str) -> None:
+        with self._lock:
+            self.clips += 1
+            if stage == 'fast':
+                self.fast += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            clips, fast = self.clips, self.fast
+        return {
+            'words': len(self.models),
+            'threshold': self.threshold,
+            'clips': clips,
+            'fast': fast,
+            'hit_rate': fast / clips if clips else 0.0,
+            'holdout': evaluate_cascade(self.holdout, self.threshold) if self.holdout else None
+        }
@@ -0,0 +1,328 @@
+"""
+Compact, memory-mappable model format for the pronunciation service.
+
+Each word's SVC / StandardScaler / LabelEncoder is reduced to plain arrays
+(support vectors, dual coefficients, scaler mean/scale) stored back to back in
+one flat weights file, plus a JSON manifest with its name, offsets, scalars
+(intercept, gamma, Platt A/B) and class labels. Loading is a single read-only np.memmap,
+so no pickle is involved and forked worker processes share the pages.
+Inference is NumPy-only and reproduces sklearn's binary RBF SVC, including
+libsvm's Platt-scaled probabilities.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator
+
+import numpy as np
+
+from voice_pronounciation_detection.reduction import FeatureSelection, LinearProjection
+
+MANIFEST_FILE = 'manifest.json'
+# Weights of manifests that don't name their file (written before per-export names)
+WEIGHTS_FILE = 'weights.bin'
+COMPACT_FORMAT = 'compact-svm-v1'
+_ALIGN = 64
+
+# libsvm clips pairwise probabilities to [MIN_PROB, 1 - MIN_PROB]
+MIN_PROB = 1e-7
+
+
+def model_arrays(model_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Plain arrays and scalars for one word's sklearn model data.
+
+    Only binary RBF SVCs trained with probability=True are supported, which is
+    what the pronunciation models are.
+    """
+    svc = model_data['model']
+    scaler = model_data['scaler']
+    encoder = model_data['encoder']
+
+    if svc.kernel != 'rbf':
+        raise ValueError(f"Only RBF kernels can be exported, got '{svc.kernel}'")
+    if len(svc.classes_) != 2:
+        raise ValueError(f"Only binary models can be exported, got {len(svc.classes_)} classes")
+    if len(svc.probA_) == 0:
+        raise ValueError("Model was trained without probability=True")
+
+    n_features = scaler.n_features_in_
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+
+    arrays = {
+        'support_vectors': np.asarray(svc.support_vectors_, dtype=np.float64),
+        'dual_coef': np.asarray(svc.dual_coef_[0], dtype=np.float64),
+        'scaler_mean': np.asarray(mean, dtype=np.float64),
+        'scaler_scale': np.asarray(scale, dtype=np.float64),
+    }
+    projection = model_data.get('projection')
+    if isinstance(projection, FeatureSelection):
+        arrays['projection_index'] = projection.index.astype(np.float64)
+    elif projection is not None:
+        arrays['projection_mean'] = np.asarray(projection.mean_, dtype=np.float64)
+        arrays['projection_components'] = np.asarray(projection.components_, dtype=np.float64)
+
+    return {
+        'arrays': arrays,
+        'intercept': float(svc.intercept_[0]),
+        'gamma': float(svc._gamma),
+        'prob_a': float(svc.probA_[0]),
+        'prob_b': float(svc.probB_[0]),
+        # svc.classes_ are encoded labels; the encoder maps them back to names
+        'classes': [str(label) for label in encoder.inverse_transform(svc.classes_)],
+        'accuracy': float(model_data['accuracy']),
+        'cv_scores': [float(score) for score in np.asarray(model_data['cv_scores'])],
+    }
+
+
+def export_compact_models(models, directory: str) -> Dict[str, Any]:
+    """
+    Convert a word -> sklearn model data mapping into the compact format.
+
+    Returns:
+        The manifest that was written
+    """
+    os.makedirs(directory, exist_ok=True)
+    weights_tmp = os.path.join(directory, f"weights.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+    words = {}
+    offset = 0
+
+    with open(weights_tmp, 'wb') as f:
+        for word in models.keys():
+            exported = model_arrays(models[word])
+            layout = {}
+            for name, array in exported.pop('arrays').items():
+                padding = (-offset) % _ALIGN
+                f.write(b'\0' * padding)
+                digest.update(b'\0' * padding)
+                offset += padding
+                data = np.ascontiguousarray(array, dtype='<f8').tobytes()
+                f.write(data)
+                digest.update(data)
+                layout[name] = {'offset': offset, 'shape': list(array.shape)}
+                offset += len(data)
+            words[word] = {'arrays': layout, **exported}
+
+    # Each export's weights get their own file, named by content: the manifest is the only
+    # file replaced, so a reader always pairs a manifest with the weights it describes
+    weights_file = f"weights-{digest.hexdigest()[:16]}.bin"
+    os.replace(weights_tmp, os.path.join(directory, weights_file))
+
+    manifest = {'format': COMPACT_FORMAT, 'dtype': '<f8', 'weights': weights_file, 'words': words}
+    manifest_tmp = os.path.join(directory, f"{MANIFEST_FILE}.{os.getpid()}.tmp")
+    with open(manifest_tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_tmp, os.path.join(directory, MANIFEST_FILE))
+
+    # Banks that already mapped an old weights file keep reading it after the unlink
+    for file_name in os.listdir(directory):
+        if file_name.startswith('weights') and file_name.endswith('.bin') and file_name != weights_file:
+            try:
+                os.remove(os.path.join(directory, file_name))
+            except FileNotFoundError:
+                pass
+    return manifest
+
+
+def is_compact_model_dir(path: str) -> bool:
+    """True if path is a directory written by export_compact_models"""
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def sigmoid_predict(dec, prob_a, prob_b):
+    """libsvm sigmoid_predict, written to avoid overflow on either side"""
+    f = dec * prob_a + prob_b
+    out = np.empty_like(f)
+    pos = f >= 0
+    e = np.exp(-f[pos])
+    out[pos] = e / (1.0 + e)
+    out[~pos] = 1.0 / (1.0 + np.exp(f[~pos]))
+    return out
+
+
+def two_class_probability(r01):
+    """
+    libsvm's multiclass_probability for k=2, vectorized over samples.
+
+    libsvm solves for the class probabilities iteratively and stops at
+    eps = 0.005 / k, so the result is not exactly (r01, 1 - r01); this runs the
+    same iteration so outputs match sklearn's predict_proba.
+    """
+    r10 = 1.0 - r01
+    # Q[t][j] per sample, as built by libsvm for k=2
+    Q = np.array([[r10 * r10, -r10 * r01], [-r10 * r01, r01 * r01]])
+    p = np.full((2, len(r01)), 0.5)
+    active = np.ones(len(r01), dtype=bool)
+    eps = 0.005 / 2
+
+    for _ in range(100):
+        qp = np.einsum('tjn,jn->tn', Q, p)
+        pqp = np.sum(p * qp, axis=0)
+        active &= np.max(np.abs(qp - pqp), axis=0) >= eps
+        if not active.any():
+            break
+
+        for t in range(2):
+            diff = np.where(active, (pqp - qp[t]) / Q[t, t], 0.0)
+            p[t] += diff
+            pqp = (pqp + diff * (diff * Q[t, t] + 2 * qp[t])) / (1 + diff) / (1 + diff)
+            qp = (qp + diff * Q[t]) / (1 + diff)
+            p /= (1 + diff)
+
+    return p.T
+
+
+class CompactScaler:
+    """StandardScaler.transform over memory-mapped mean/scale"""
+
+    def __init__(self, mean, scale):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class CompactLabelEncoder:
+    """LabelEncoder.inverse_transform over the stored class names"""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes)
+
+    def inverse_transform(self, y):
+        return self.classes_[np.asarray(y, dtype=np.intp)]
+
+
+class CompactSVC:
+    """NumPy-only binary RBF SVC with sklearn's predict / decision_function / predict_proba"""
+
+    def __init__(self, support_vectors, dual_coef, intercept, gamma, prob_a, prob_b):
+        self.support_vectors_ = support_vectors
+        self.dual_coef_ = dual_coef
+        self.intercept_ = intercept
+        self.gamma = gamma
+        self.prob_a = prob_a
+        self.prob_b = prob_b
+        self.classes_ = np.array([0, 1])
+        # ||sv||^2 is reused by every call
+        self._sv_sq_norms = np.einsum('ij,ij->i', support_vectors, support_vectors)
+
+    def decision_function(self, X):
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        sq_dist = (
+            np.einsum('ij,ij->i', X, X)[:, None]
+            + self._sv_sq_norms[None, :]
+            - 2.0 * (X @ self.support_vectors_.T)
+        )
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        return np.exp(-self.gamma * sq_dist) @ self.dual_coef_ + self.intercept_
+
+    def predict(self, X):
+        return (self.decision_function(X) > 0).astype(np.intp)
+
+    def predict_proba(self, X):
+        # libsvm's decision value has the opposite sign of sklearn's for binary problems
+        pairwise = sigmoid_predict(-self.decision_function(X), self.prob_a, self.prob_b)
+        return two_class_probability(np.clip(pairwise, MIN_PROB, 1 - MIN_PROB))
+
+
+class CompactModelBank:
+    """
+    Dict-like word -> model data view over a compact model directory.
+
+    Values have the same keys as the pickled bundle ('model', 'scaler',
+    'encoder', 'accuracy', 'cv_scores'), so PronunciationPredictor works
+    unchanged. All arrays are read-only views into one shared memory map.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        # A re-export between reading the manifest and mapping its weights deletes them;
+        # the manifest read again then names the new file
+        for attempt in range(3):
+            with open(os.path.join(directory, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('format') != COMPACT_FORMAT:
+                raise ValueError(f"Unsupported compact model format: {manifest.get('format')}")
+            try:
+                self._weights = self._map_weights(os.path.join(directory, manifest.get('weights', WEIGHTS_FILE)))
+                break
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+        self.manifest = manifest
+        self._words = manifest['words']
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _map_weights(path: str) -> np.ndarray:
+        if os.path.getsize(path):
+            return np.memmap(path, dtype=np.uint8, mode='r')
+        return np.zeros(0, dtype=np.uint8)
+
+    def array(self, word: str, name: str) -> np.ndarray:
+        """Read-only view of one stored array"""
+        layout = self._words[word]['arrays'][name]
+        shape = tuple(layout['shape'])
+        count = int(np.prod(shape)) if shape else 1
+        start = layout['offset']
+        view = self._weights[start:start + count * 8].view(self.manifest['dtype'])
+        return view.reshape(shape)
+
+    def _build(self, word):
+        entry = self._words[word]
+        model_data = {
+            'model': CompactSVC(
+                self.array(word, 'support_vectors'),
+                self.array(word, 'dual_coef'),
+                entry['intercept'],
+                entry['gamma'],
+                entry['prob_a'],
+                entry['prob_b'],
+            ),
+            'scaler': CompactScaler(self.array(word, 'scaler_mean'), self.array(word, 'scaler_scale')),
+            'encoder': CompactLabelEncoder(entry['classes']),
+            'accuracy': entry['accuracy'],
+            'cv_scores': np.asarray(entry['cv_scores']),
+        }
+        if 'projection_index' in entry['arrays']:
+            model_data['projection'] = FeatureSelection(
+                self.array(word, 'projection_index').astype(np.intp), entry['arrays']['scaler_mean']['shape'][0]
+            )
+        elif 'projection_components' in entry['arrays']:
+            model_data['projection'] = LinearProjection(
+                self.array(word, 'projection_mean'), self.array(word, 'projection_components')
+            )
+        return model_data
+
+    def __contains__(self, word) -> bool:
+        return word in self._words
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._words)
+
+    def keys(self):
+        return self._words.keys()
+
+    def get(self, word, default=None):
+        if word not in self._words:
+            return default
+        return self[word]
+
+    def __getitem__(self, word):
+        model_data = self._models.get(word)
+        if model_data is None:
+            # Building is cheap (views into the memory map); the lock only avoids duplicate work
+            with self._lock:
+                model_data = self._models.get(word)
+                if model_data is None:
+                    model_data = self._build(word)
+                    self._models[word] = model_data
+        return model_data
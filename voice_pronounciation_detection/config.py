@@ -0,0 +1,113 @@
+"""
+Configuration for the pronunciation service.
+"""
+import os
+from pathlib import Path
+
+
+class Config:
+    """Configuration parameters for the model"""
+    SAMPLE_RATE = 22050  # Audio sample rate
+    DURATION = 5  # Maximum audio duration in seconds
+    N_MFCC = 13  # Number of MFCC coefficients
+    N_CHROMA = 12  # Number of chroma features
+    N_MEL = 128  # Number of mel bands
+    N_CONTRAST = 7  # Number of spectral contrast bands
+    N_FFT = 2048  # STFT window size (librosa default, shared by all spectral features)
+    HOP_LENGTH = 512  # STFT hop size (librosa default)
+
+    # SVM training parameters (used by training.py / scripts/train_models.py)
+    SVM_KERNEL = 'rbf'
+    SVM_C = 10.0
+    SVM_GAMMA = 'scale'
+    RANDOM_STATE = 42
+    TEST_SIZE = 0.2  # Held-out fraction per word for the reported accuracy
+    CV_FOLDS = 5  # Cross-validation folds on the training split (cv_scores)
+    # Optional projection between scaler and SVC: none / pca / select (ANOVA F-score feature selection).
+    # REDUCTION_COMPONENTS below 1 is the variance (pca) or feature fraction (select) kept, else a count.
+    REDUCTION = os.getenv('REDUCTION', 'none')
+    REDUCTION_COMPONENTS = float(os.getenv('REDUCTION_COMPONENTS', '0.95'))
+
+    # Batch scoring
+    MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '64'))  # Max recordings per /predict/batch call
+    BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', str(os.cpu_count() or 2)))  # Parallel feature extraction threads
+
+    # Feature extraction worker processes (0 = extract in the web process)
+    FEATURE_WORKERS = int(os.getenv('FEATURE_WORKERS', '0'))
+    FEATURE_QUEUE_SIZE = int(os.getenv('FEATURE_QUEUE_SIZE', '16'))  # Jobs allowed to wait before answering 503
+    FEATURE_JOB_TIMEOUT = float(os.getenv('FEATURE_JOB_TIMEOUT', '10'))  # Seconds per extraction job
+    # Timed-out jobs left running before the workers are killed and restarted (empty: half the workers)
+    FEATURE_MAX_STUCK_JOBS = int(os.getenv('FEATURE_MAX_STUCK_JOBS') or 0) or None
+    FEATURE_POOL_START_METHOD = os.getenv('FEATURE_POOL_START_METHOD') or None  # Default: fork where available
+
+    # ASGI router (api.py, mounted by main.py): blocking prediction work runs on ASYNC_PREDICT_THREADS
+    # threads, with up to ASYNC_MAX_PENDING more requests waiting before answering 503. With
+    # FEATURE_WORKERS > 0 the threads mostly wait on the pool, so size them to workers + queue.
+    ASYNC_PREDICT_THREADS = int(os.getenv('ASYNC_PREDICT_THREADS', str(os.cpu_count() or 2)))
+    ASYNC_MAX_PENDING = int(os.getenv('ASYNC_MAX_PENDING', '32'))
+
+    # Feature cache: in-memory LRU entries (0 = off) and optional on-disk .npy tier
+    FEATURE_CACHE_SIZE = int(os.getenv('FEATURE_CACHE_SIZE', '1024'))
+    FEATURE_CACHE_DIR = os.getenv('FEATURE_CACHE_DIR') or None
+    # Size limit of the on-disk tier (about 1.5 KB per clip); least recently used files go first
+    FEATURE_CACHE_DISK_MAX_BYTES = int(os.getenv('FEATURE_CACHE_DISK_MAX_BYTES', str(256 * 1024 * 1024)))
+
+    # Model serving
+    MODEL_PATH = os.getenv(
+        'PRONUNCIATION_MODEL_PATH',
+        str(Path(__file__).parent / 'pronunciation_models.pkl')
+    )
+    # Per-word model store limits (only used when MODEL_PATH is a store directory)
+    MODEL_STORE_MAX_WORDS = int(os.getenv('MODEL_STORE_MAX_WORDS', '256'))
+    MODEL_STORE_MAX_BYTES = int(os.getenv('MODEL_STORE_MAX_BYTES', str(512 * 1024 * 1024)))
+    # Shared secret for POST /admin/reload-models, sent as the 'X-Admin-Token' header.
+    # Unset: only requests from this machine (loopback) may reload.
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN') or None
+    # Seconds between model-file mtime checks; unset disables hot reload
+    MODEL_RELOAD_CHECK_INTERVAL = (
+        float(os.environ['MODEL_RELOAD_CHECK_INTERVAL'])
+        if os.getenv('MODEL_RELOAD_CHECK_INTERVAL') else None
+    )
+
+    # Multi-word utterances (/predict/utterance): one recording, words separated by pauses
+    UTTERANCE_MAX_WORDS = int(os.getenv('UTTERANCE_MAX_WORDS', '20'))
+    UTTERANCE_MAX_SECONDS = float(os.getenv('UTTERANCE_MAX_SECONDS', '60'))  # Longer recordings are cut off
+    SEGMENT_MIN_SILENCE = float(os.getenv('SEGMENT_MIN_SILENCE', '0.25'))  # Shorter pauses don't separate words
+    SEGMENT_MIN_SECONDS = float(os.getenv('SEGMENT_MIN_SECONDS', '0.15'))  # Shorter voiced bursts are ignored
+    SEGMENT_PADDING = float(os.getenv('SEGMENT_PADDING', '0.15'))  # Seconds of pause kept on each side of a word
+
+    # Streaming assessment (/stream WebSocket)
+    STREAM_MIN_SECONDS = float(os.getenv('STREAM_MIN_SECONDS', '1.0'))  # Audio needed before the first provisional score
+    STREAM_UPDATE_INTERVAL = float(os.getenv('STREAM_UPDATE_INTERVAL', '0.5'))  # Seconds of audio between provisional scores
+
+    # Voice-activity trimming before feature extraction. Off by default: the shipped
+    # models were trained on untrimmed clips, so retrain with it enabled before serving it.
+    VAD_ENABLED = os.getenv('VAD_ENABLED', '0').lower() in ('1', 'true', 'yes')
+    VAD_ENERGY_MARGIN_DB = float(os.getenv('VAD_ENERGY_MARGIN_DB', '12'))  # Level above the noise floor that counts as voiced
+    VAD_ZCR_THRESHOLD = float(os.getenv('VAD_ZCR_THRESHOLD', '0.25'))  # ZCR that marks quieter frames as fricatives
+    VAD_NOISE_PERCENTILE = float(os.getenv('VAD_NOISE_PERCENTILE', '10'))  # Percentile of frame levels taken as the noise floor
+    VAD_MIN_DYNAMIC_DB = float(os.getenv('VAD_MIN_DYNAMIC_DB', '6'))  # Below this peak-to-floor range the clip is left as is
+    VAD_PADDING = float(os.getenv('VAD_PADDING', '0.15'))  # Seconds kept on each side of the voiced region
+    VAD_MIN_SECONDS = float(os.getenv('VAD_MIN_SECONDS', '0.2'))  # Shorter voiced regions are ignored
+
+    # Per-stage latency metrics for /predict, served at /metrics (Prometheus text format)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '0').lower() in ('1', 'true', 'yes')
+    # Return a Server-Timing header when the request sends 'X-Debug-Timings: 1'
+    METRICS_DEBUG_HEADER = os.getenv('METRICS_DEBUG_HEADER', '0').lower() in ('1', 'true', 'yes')
+
+    # Resampler for input not already at SAMPLE_RATE: soxr_vhq / soxr_hq / soxr_mq / soxr_lq / soxr_qq,
+    # or polyphase (scipy, small integer ratios only). soxr_hq matches the training pipeline.
+    RESAMPLE_QUALITY = os.getenv('RESAMPLE_QUALITY', 'soxr_hq')
+
+    # Startup warm-up: run every serving path once on a synthetic clip before /ready answers 200
+    WARMUP_ENABLED = os.getenv('WARMUP_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    # Writable directory for numba's on-disk cache of librosa's compiled kernels (unset: numba's default)
+    JIT_CACHE_DIR = os.getenv('JIT_CACHE_DIR') or None
+
+    # Two-stage cascade for /predict: a per-word first stage on MFCC/ZCR/RMS answers clips it is
+    # at least CASCADE_THRESHOLD confident about (see scripts/train_cascade.py); unset disables it
+    CASCADE_MODEL_PATH = os.getenv('CASCADE_MODEL_PATH') or None
+    CASCADE_THRESHOLD = (
+        float(os.environ['CASCADE_THRESHOLD'])
+        if os.getenv('CASCADE_THRESHOLD') else None  # None: the threshold the cascade was trained with
+    )
@@ -0,0 +1,234 @@
+"""
+Content-addressed cache of feature vectors.
+Keyed by a hash of the decoded audio plus the Config parameters that affect
+feature extraction, so a re-submitted clip skips librosa entirely.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Bump when the feature computation changes in a way the Config fields don't capture
+FEATURE_VERSION = 1
+
+_KEY_CONFIG_FIELDS = (
+    'SAMPLE_RATE', 'DURATION', 'N_MFCC', 'N_CHROMA', 'N_MEL', 'N_CONTRAST', 'N_FFT', 'HOP_LENGTH'
+)
+
+
+def feature_config_fields() -> tuple:
+    """
+    Config fields that change the features computed from already decoded samples.
+    Caches keyed by file rather than by samples must add the decoding settings
+    (e.g. RESAMPLE_QUALITY) themselves.
+    """
+    return _KEY_CONFIG_FIELDS
+
+
+# Pruning the disk tier goes down to this fraction of its limit, so it doesn't run on every write
+DISK_PRUNE_TARGET = 0.9
+
+
+class FeatureCache:
+    """
+    Two-tier cache: an in-memory LRU in front of an optional directory of
+    .npy vectors that are memory-mapped on read.
+
+    The directory is bounded by disk_max_bytes: once a write takes it over,
+    the least recently used files (by mtime, refreshed on every disk hit) are
+    deleted. Several processes may share the directory; each prune rescans it.
+    """
+
+    def __init__(self, config, max_entries: int = 4096, disk_dir: Optional[str] = None,
+                 disk_max_bytes: Optional[int] = None):
+        """
+        Args:
+            config: Config whose feature parameters are folded into every key
+            max_entries: Size of the in-memory LRU tier
+            disk_dir: Directory for the on-disk tier (None disables it)
+            disk_max_bytes: Size limit of the on-disk tier (None = unbounded)
+        """
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+        params = [FEATURE_VERSION] + [getattr(config, name) for name in feature_config_fields()]
+        self._config_digest = repr(params).encode('utf-8')
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+    def key(self, y: np.ndarray, sr: int) -> str:
+        """Hash of the decoded samples, sample rate and feature parameters"""
+        h = hashlib.blake2b(digest_size=20)
+        h.update(self._config_digest)
+        h.update(str(sr).encode('ascii'))
+        h.update(np.ascontiguousarray(y, dtype=np.float32).tobytes())
+        return h.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.disk_dir, key[:2], f"{key}.npy")
+
+    def _disk_files(self) -> List[tuple]:
+        """(mtime, size, path) of every entry in the disk tier"""
+        files = []
+        for fan_out in os.scandir(self.disk_dir):
+            if not fan_out.is_dir():
+                continue
+            for entry in os.scandir(fan_out.path):
+                if entry.name.endswith('.npy'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # removed by another process
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _prune_disk(self) -> None:
+        """Delete the least recently used disk entries until the tier is under DISK_PRUNE_TARGET of its limit"""
+        if not self._prune_lock.acquire(blocking=False):
+            return  # another thread is already pruning
+        try:
+            files = sorted(self._disk_files())
+            total = sum(size for _, size, _ in files)
+            target = self.disk_max_bytes * DISK_PRUNE_TARGET
+            evicted = 0
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    evicted += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+            with self._lock:
+                self._disk_bytes = total
+                self.disk_evictions += evicted
+        finally:
+            self._prune_lock.release()
+
+    def _remember(self, key: str, features: np.ndarray) -> None:
+        self._memory[key] = features
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            features = self._memory.get(key)
+            if features is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return features
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                features = np.load(path, mmap_mode='r')
+                os.utime(path)  # Recently used: pruned last
+            except (OSError, ValueError):
+                features = None
+            if features is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, features)
+                return features
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, features: np.ndarray) -> None:
+        features = np.asarray(features)
+        features.setflags(write=False)
+        with self._lock:
+            self._remember(key, features)
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never map a partial file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, features)
+                size = os.path.getsize(tmp_path)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Error writing feature cache entry {key}: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+
+            with self._lock:
+                self._disk_bytes += size
+                over_limit = self.disk_max_bytes is not None and self._disk_bytes > self.disk_max_bytes
+            if over_limit:
+                self._prune_disk()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                'entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'disk_dir': self.disk_dir,
+                'disk_bytes': self._disk_bytes,
+                'disk_max_bytes': self.disk_max_bytes,
+                'disk_evictions': self.disk_evictions,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else 0.0
+            }
+
+
+def merge_cache_stats(stats: List[Dict]) -> Dict:
+    """
+    Combine the stats() of several caches (e.g. one per worker process).
+
+    Counters and memory entries are summed; the disk tier is shared, so its
+    size is the largest (most recently rescanned) figure reported.
+    """
+    merged = {
+        'caches': len(stats),
+        'entries': sum(s['entries'] for s in stats),
+        'max_entries': sum(s['max_entries'] for s in stats),
+        'disk_dir': stats[0]['disk_dir'] if stats else None,
+        'disk_bytes': max((s['disk_bytes'] for s in stats), default=0),
+        'disk_max_bytes': stats[0]['disk_max_bytes'] if stats else None,
+    }
+    for counter in ('disk_evictions', 'memory_hits', 'disk_hits', 'misses'):
+        merged[counter] = sum(s[counter] for s in stats)
+    lookups = merged['memory_hits'] + merged['disk_hits'] + merged['misses']
+    merged['hit_rate'] = (merged['memory_hits'] + merged['disk_hits']) / lookups if lookups else 0.0
+    return merged
+
+
+def build_feature_cache(config) -> Optional[FeatureCache]:
+    """FeatureCache from the FEATURE_CACHE_* settings, or None when disabled"""
+    if config.FEATURE_CACHE_SIZE <= 0 and not config.FEATURE_CACHE_DIR:
+        return None
+    return FeatureCache(
+        config,
+        max_entries=max(config.FEATURE_CACHE_SIZE, 0),
+        disk_dir=config.FEATURE_CACHE_DIR,
+        disk_max_bytes=config.FEATURE_CACHE_DISK_MAX_BYTES
+    )
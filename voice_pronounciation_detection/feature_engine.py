@@ -0,0 +1,117 @@
+"""
+Single-pass spectral feature engine for the pronunciation service.
+Computes one STFT per clip and derives mel, MFCC, chroma, spectral contrast and
+rolloff from it, reusing cached mel/chroma filterbanks across requests.
+"""
+from functools import lru_cache
+
+import numpy as np
+import librosa
+import scipy.fft
+
+from voice_pronounciation_detection.metrics import stage
+
+
+@lru_cache(maxsize=16)
+def mel_filterbank(sr: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Slaney mel filterbank, same as librosa.feature.melspectrogram's default"""
+    basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)
+    basis.setflags(write=False)
+    return basis
+
+
+@lru_cache(maxsize=256)
+def chroma_filterbank(sr: int, n_fft: int, n_chroma: int, tuning: float) -> np.ndarray:
+    """Chroma filterbank; tuning is estimated per clip in steps of 0.01 so few variants exist"""
+    basis = librosa.filters.chroma(sr=sr, n_fft=n_fft, tuning=tuning, n_chroma=n_chroma)
+    basis.setflags(write=False)
+    return basis
+
+
+def _mean_std(x: np.ndarray) -> np.ndarray:
+    return np.concatenate([np.mean(x, axis=1), np.std(x, axis=1)])
+
+
+def _mfcc_stats(mfcc: np.ndarray) -> np.ndarray:
+    return np.concatenate([np.mean(mfcc, axis=1), np.std(mfcc, axis=1), np.min(mfcc, axis=1), np.max(mfcc, axis=1)])
+
+
+class SpectralFeatureEngine:
+    """
+    Computes the 352-dim feature vector from a single STFT.
+
+    The layout (and values, up to float rounding) match AudioFeatureExtractor's
+    per-feature extractors: MFCC (52), chroma (24), mel (256), contrast (14),
+    ZCR (2), rolloff (2), RMS (2).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.n_fft = config.N_FFT
+        self.hop_length = config.HOP_LENGTH
+
+    def spectrogram(self, y):
+        """Magnitude spectrogram |STFT(y)| with librosa's default framing"""
+        with stage('stft'):
+            return np.abs(librosa.stft(y, n_fft=self.n_fft, hop_length=self.hop_length))
+
+    def mfcc_from_mel(self, mel):
+        """MFCC from a mel power spectrogram (librosa.feature.mfcc with S=power_to_db(mel))"""
+        mel_db = librosa.power_to_db(mel)
+        return scipy.fft.dct(mel_db, axis=0, type=2, norm='ortho')[:self.config.N_MFCC]
+
+    def chroma_from_power(self, power, sr):
+        """Chroma from a power spectrogram (librosa.feature.chroma_stft with S=power)"""
+        tuning = float(librosa.estimate_tuning(S=power, sr=sr, bins_per_octave=self.config.N_CHROMA))
+        basis = chroma_filterbank(sr, self.n_fft, self.config.N_CHROMA, tuning)
+        return librosa.util.normalize(basis @ power, norm=np.inf, axis=0)
+
+    def spectral_features(self, magnitude, sr):
+        """MFCC, chroma, mel, contrast and rolloff statistics from one magnitude spectrogram"""
+        with stage('mel'):
+            power = magnitude ** 2
+            mel = mel_filterbank(sr, self.n_fft, self.config.N_MEL) @ power
+            mel_features = _mean_std(librosa.power_to_db(mel, ref=np.max))
+
+        with stage('mfcc'):
+            mfcc_features = _mfcc_stats(self.mfcc_from_mel(mel))
+        with stage('chroma'):
+            chroma_features = _mean_std(self.chroma_from_power(power, sr))
+        with stage('contrast'):
+            contrast_features = _mean_std(librosa.feature.spectral_contrast(
+                S=magnitude, sr=sr, n_fft=self.n_fft, n_bands=self.config.N_CONTRAST - 1
+            ))
+        with stage('rolloff'):
+            rolloff_features = _mean_std(librosa.feature.spectral_rolloff(
+                S=magnitude, sr=sr, n_fft=self.n_fft
+            ))
+        return mfcc_features, chroma_features, mel_features, contrast_features, rolloff_features
+
+    def time_features(self, y):
+        """ZCR and RMS statistics (framed directly on the signal, no STFT needed)"""
+        with stage('zcr'):
+            zcr = librosa.feature.zero_crossing_rate(y, frame_length=self.n_fft, hop_length=self.hop_length)
+        with stage('rms'):
+            rms = librosa.feature.rms(y=y, frame_length=self.n_fft, hop_length=self.hop_length)
+        return _mean_std(zcr), _mean_std(rms)
+
+    def fast_features(self, y, sr, magnitude=None):
+        """
+        First-stage cascade features: MFCC (52), ZCR (2), RMS (2), in that order.
+        Skips chroma tuning, contrast, rolloff and the mel statistics.
+        """
+        if magnitude is None:
+            magnitude = self.spectrogram(y)
+        with stage('mfcc'):
+            mel = mel_filterbank(sr, self.n_fft, self.config.N_MEL) @ magnitude ** 2
+            mfcc_features = _mfcc_stats(self.mfcc_from_mel(mel))
+        zcr, rms = self.time_features(y)
+        return np.concatenate([mfcc_features, zcr, rms])
+
+    def extract(self, y, sr, magnitude=None):
+        """Full feature vector; pass magnitude to reuse an already computed spectrogram"""
+        if magnitude is None:
+            magnitude = self.spectrogram(y)
+        mfcc, chroma, mel, contrast, rolloff = self.spectral_features(magnitude, sr)
+        zcr, rms = self.time_features(y)
+        return np.concatenate([mfcc, chroma, mel, contrast, zcr, rolloff, rms])
@@ -0,0 +1,216 @@
+"""
+Audio feature extraction for the pronunciation service.
+"""
+import os
+import numpy as np
+import librosa
+
+from voice_pronounciation_detection.audio_io import decode_audio
+from voice_pronounciation_detection.cascade import first_stage_proba
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.feature_engine import SpectralFeatureEngine
+from voice_pronounciation_detection.metrics import stage
+from voice_pronounciation_detection.segmentation import UtteranceSegmenter
+from voice_pronounciation_detection.vad import VoiceActivityTrimmer
+
+
+class AudioFeatureExtractor:
+    """Extract audio features from audio files, bytes or file-like objects"""
+
+    def __init__(self, config=Config(), cache=None):
+        """cache: optional FeatureCache consulted before running librosa"""
+        self.config = config
+        self.engine = SpectralFeatureEngine(config)
+        self.cache = cache
+        self.trimmer = VoiceActivityTrimmer(config) if config.VAD_ENABLED else None
+        self.segmenter = UtteranceSegmenter(config)
+
+    def load_audio(self, source, duration=None):
+        """Load audio from a path, bytes or file-like object with error handling (duration defaults to DURATION)"""
+        try:
+            y, sr = decode_audio(
+                source,
+                sr=self.config.SAMPLE_RATE,
+                duration=duration or self.config.DURATION,
+                quality=self.config.RESAMPLE_QUALITY
+            )
+            return y, sr
+        except Exception as e:
+            name = source if isinstance(source, (str, os.PathLike)) else type(source).__name__
+            print(f"Error loading {name}: {e}")
+            return None, None
+
+    def extract_mfcc(self, y, sr):
+        """Extract MFCC features"""
+        mfcc = librosa.feature.mfcc(
+            y=y,
+            sr=sr,
+            n_mfcc=self.config.N_MFCC
+        )
+        # Statistical features: mean, std, min, max
+        mfcc_mean = np.mean(mfcc, axis=1)
+        mfcc_std = np.std(mfcc, axis=1)
+        mfcc_min = np.min(mfcc, axis=1)
+        mfcc_max = np.max(mfcc, axis=1)
+        return np.concatenate([mfcc_mean, mfcc_std, mfcc_min, mfcc_max])
+
+    def extract_chroma(self, y, sr):
+        """Extract chroma features"""
+        chroma = librosa.feature.chroma_stft(y=y, sr=sr)
+        chroma_mean = np.mean(chroma, axis=1)
+        chroma_std = np.std(chroma, axis=1)
+        return np.concatenate([chroma_mean, chroma_std])
+
+    def extract_mel_spectrogram(self, y, sr):
+        """Extract mel-spectrogram features"""
+        mel = librosa.feature.melspectrogram(
+            y=y,
+            sr=sr,
+            n_mels=self.config.N_MEL
+        )
+        mel_db = librosa.power_to_db(mel, ref=np.max)
+        mel_mean = np.mean(mel_db, axis=1)
+        mel_std = np.std(mel_db, axis=1)
+        return np.concatenate([mel_mean, mel_std])
+
+    def extract_spectral_contrast(self, y, sr):
+        """Extract spectral contrast features"""
+        contrast = librosa.feature.spectral_contrast(
+            y=y,
+            sr=sr,
+            n_bands=self.config.N_CONTRAST - 1
+        )
+        contrast_mean = np.mean(contrast, axis=1)
+        contrast_std = np.std(contrast, axis=1)
+        return np.concatenate([contrast_mean, contrast_std])
+
+    def extract_zero_crossing_rate(self, y):
+        """Extract zero crossing rate"""
+        zcr = librosa.feature.zero_crossing_rate(y)
+        return np.array([np.mean(zcr), np.std(zcr)])
+
+    def extract_spectral_rolloff(self, y, sr):
+        """Extract spectral rolloff"""
+        rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)
+        return np.array([np.mean(rolloff), np.std(rolloff)])
+
+    def extract_rms_energy(self, y):
+        """Extract RMS energy"""
+        rms = librosa.feature.rms(y=y)
+        return np.array([np.mean(rms), np.std(rms)])
+
+    def extract_features_separately(self, y, sr):
+        """Reference path: run each extractor on its own (one STFT per feature)"""
+        mfcc_features = self.extract_mfcc(y, sr)
+        chroma_features = self.extract_chroma(y, sr)
+        mel_features = self.extract_mel_spectrogram(y, sr)
+        contrast_features = self.extract_spectral_contrast(y, sr)
+        zcr_features = self.extract_zero_crossing_rate(y)
+        rolloff_features = self.extract_spectral_rolloff(y, sr)
+        rms_features = self.extract_rms_energy(y)
+
+        # Combine all features
+        return np.concatenate([
+            mfcc_features,      # 52 features (13*4)
+            chroma_features,    # 24 features (12*2)
+            mel_features,       # 256 features (128*2)
+            contrast_features,  # 14 features (7*2)
+            zcr_features,       # 2 features
+            rolloff_features,   # 2 features
+            rms_features        # 2 features
+        ])
+
+    def _load_trimmed(self, source):
+        """Decoded (and, with VAD enabled, trimmed) samples, or (None, None) on failure"""
+        y, sr = self.load_audio(source)
+
+        if y is not None and self.trimmer is not None:
+            # Cache keys are taken on the cropped signal, so VAD settings are part of the key
+            with stage('vad'):
+                y, _ = self.trimmer.trim(y, sr)
+        return y, sr
+
+    def extract_all_features(self, source):
+        """Extract all features from an audio path, bytes or file-like object"""
+        y, sr = self._load_trimmed(source)
+
+        if y is None:
+            return None
+
+        if self.cache is None:
+            # One STFT shared by all spectral features; extract_features_separately
+            # is the equivalent reference path
+            return self.engine.extract(y, sr)
+
+        with stage('cache_lookup'):
+            key = self.cache.key(y, sr)
+            features = self.cache.get(key)
+        if features is None:
+            features = self.engine.extract(y, sr)
+            self.cache.put(key, features)
+        return features
+
+    def extract_cascade(self, source, first_stage, threshold):
+        """
+        Two-stage extraction: score the cheap features with the word's first-stage
+        model and only compute the full vector when it isn't confident enough.
+
+        Returns:
+            ('fast', probabilities) from the first stage, ('full', features), or
+            (None, None) when the audio couldn't be decoded
+        """
+        y, sr = self._load_trimmed(source)
+
+        if y is None:
+            return None, None
+
+        key = None
+        if self.cache is not None:
+            # A cached full vector makes the second stage free
+            with stage('cache_lookup'):
+                key = self.cache.key(y, sr)
+                features = self.cache.get(key)
+            if features is not None:
+                return 'full', features
+
+        magnitude = self.engine.spectrogram(y)
+        probabilities = first_stage_proba(first_stage, self.engine.fast_features(y, sr, magnitude))
+        if probabilities.max() >= threshold:
+            return 'fast', probabilities
+
+        features = self.engine.extract(y, sr, magnitude)
+        if key is not None:
+            self.cache.put(key, features)
+        return 'full', features
+
+    def extract_segments(self, source, n_words, executor=None):
+        """
+        Split a multi-word recording on its pauses and extract each word's features.
+
+        The clip is decoded and transformed once; each segment's features come
+        from its columns of the shared spectrogram (so frames at a segment's
+        edges see their real neighbours instead of padding).
+
+        Returns:
+            (segments, feature rows) in order, or None when the audio couldn't be decoded
+
+        Raises:
+            SegmentationError: The recording couldn't be split into n_words segments
+        """
+        y, sr = self.load_audio(source, duration=self.config.UTTERANCE_MAX_SECONDS)
+
+        if y is None:
+            return None
+
+        with stage('segment'):
+            segments = self.segmenter.segment(y, sr, n_words)
+        magnitude = self.engine.spectrogram(y)
+
+        def features(segment):
+            return self.engine.extract(
+                y[segment.start:segment.end], sr, magnitude[:, segment.start_frame:segment.end_frame]
+            )
+
+        if executor is None:
+            return segments, [features(segment) for segment in segments]
+        return segments, list(executor.map(features, segments))
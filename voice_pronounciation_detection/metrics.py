@@ -0,0 +1,108 @@
+"""
+Opt-in per-stage latency instrumentation.
+Code wraps each stage in `with stage('name'):`. Outside a collect_stages()
+block that is a no-op; inside one, the elapsed time is appended to the
+request's timings, which StageMetrics aggregates into Prometheus histograms.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Upper bounds in seconds; +Inf is implicit
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_timings = contextvars.ContextVar('stage_timings', default=None)
+_NOOP = nullcontext()
+
+
+class _StageTimer:
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timings.append((self.name, time.perf_counter() - self.start))
+
+
+def stage(name):
+    """Context manager timing one stage of the current request (no-op when not collecting)"""
+    timings = _timings.get()
+    if timings is None:
+        return _NOOP
+    return _StageTimer(timings, name)
+
+
+def add_timings(timings):
+    """Merge (stage, seconds) pairs measured elsewhere, e.g. in a worker process"""
+    current = _timings.get()
+    if current is not None and timings:
+        current.extend(timings)
+
+
+def collecting():
+    """True inside a collect_stages() block"""
+    return _timings.get() is not None
+
+
+@contextmanager
+def collect_stages():
+    """Collect the stages timed in this context; yields the list of (stage, seconds)"""
+    timings = []
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def server_timing_header(timings):
+    """Server-Timing header value (durations in ms), summing repeated stages"""
+    totals = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ', '.join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in totals.items())
+
+
+class StageMetrics:
+    """Thread-safe per-stage latency histograms rendered in Prometheus text format"""
+
+    def __init__(self, name='pronunciation_stage_seconds', buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._histograms = {}  # stage -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, timings):
+        """Add one request's (stage, seconds) pairs"""
+        with self._lock:
+            for name, seconds in timings:
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = [0] * (len(self.buckets) + 1) + [0.0]
+                for i, bound in enumerate(self.buckets):
+                    if seconds <= bound:
+                        histogram[i] += 1
+                histogram[len(self.buckets)] += 1
+                histogram[-1] += seconds
+
+    def render(self):
+        """Prometheus text exposition (version 0.0.4)"""
+        lines = [
+            f"# HELP {self.name} Time spent in each stage of pronunciation prediction.",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for name in sorted(self._histograms):
+                histogram = self._histograms[name]
+                for bound, count in zip(self.buckets, histogram):
+                    lines.append(f'{self.name}_bucket{{stage="{name}",le="{bound:g}"}} {count}')
+                lines.append(f'{self.name}_bucket{{stage="{name}",le="+Inf"}} {histogram[len(self.buckets)]}')
+                lines.append(f'{self.name}_sum{{stage="{name}"}} {histogram[-1]:.9g}')
+                lines.append(f'{self.name}_count{{stage="{name}"}} {histogram[len(self.buckets)]}')
+        return '\n'.join(lines) + '\n'
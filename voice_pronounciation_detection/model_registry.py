@@ -0,0 +1,175 @@
+"""
+Model registry for the pronunciation service.
+Loads the per-word models once per process and swaps them atomically on reload.
+The model path is a monolithic pickle, a per-word model store directory or a
+compact (memory-mapped) model directory.
+"""
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from voice_pronounciation_detection.compact_model import MANIFEST_FILE, CompactModelBank, is_compact_model_dir
+from voice_pronounciation_detection.model_store import INDEX_FILE, WordModelStore, is_model_store
+
+
+@dataclass(frozen=True)
+class ModelSnapshot:
+    """An immutable, fully built set of models plus the predictor that serves them"""
+    models: Dict[str, Any]
+    predictor: Any
+    path: str
+    mtime: float
+    loaded_at: float
+    load_seconds: float
+    version: int = field(default=1)
+
+    @property
+    def model_count(self):
+        return len(self.models)
+
+
+class ModelRegistry:
+    """
+    Holds the currently served ModelSnapshot.
+
+    A snapshot is built completely before it is published, and publishing is a
+    single reference assignment, so a request that grabbed a snapshot always sees
+    a consistent set of models even if a reload happens mid-request.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        build_predictor: Callable[[Dict[str, Any]], Any],
+        check_interval: Optional[float] = None,
+        store_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            model_path: Path to the pickled models bundle, a per-word model store directory
+                or a compact model directory
+            build_predictor: Called with the loaded models, returns the predictor to serve
+            check_interval: If set, get() re-stats the model file at most this often
+                (in seconds) and reloads when its mtime changed. None disables the check.
+            store_options: Keyword arguments for WordModelStore (max_models, max_bytes)
+        """
+        self.model_path = model_path
+        self.build_predictor = build_predictor
+        self.check_interval = check_interval
+        self.store_options = store_options or {}
+
+        self._snapshot: Optional[ModelSnapshot] = None
+        self._load_lock = threading.Lock()
+        self._last_check = 0.0
+        self._last_error: Optional[str] = None
+
+    def _model_mtime(self) -> float:
+        """mtime of the file whose change means new models (the index/manifest for a directory)"""
+        if is_compact_model_dir(self.model_path):
+            return os.path.getmtime(os.path.join(self.model_path, MANIFEST_FILE))
+        if os.path.isdir(self.model_path):
+            return os.path.getmtime(os.path.join(self.model_path, INDEX_FILE))
+        return os.path.getmtime(self.model_path)
+
+    def _read_models(self):
+        """Open the compact models or the model store, or unpickle the monolithic models bundle"""
+        if is_compact_model_dir(self.model_path):
+            return CompactModelBank(self.model_path)
+        if is_model_store(self.model_path):
+            return WordModelStore(self.model_path, **self.store_options)
+        with open(self.model_path, 'rb') as f:
+            return pickle.load(f)
+
+    def load(self) -> ModelSnapshot:
+        """Build a new snapshot from disk and publish it. Raises on failure and keeps the old one."""
+        with self._load_lock:
+            return self._load_locked()
+
+    def _load_locked(self) -> ModelSnapshot:
+        start = time.perf_counter()
+        try:
+            mtime = self._model_mtime()
+            models = self._read_models()
+            predictor = self.build_predictor(models)
+        except Exception as e:
+            self._last_error = str(e)
+            raise
+
+        previous = self._snapshot
+        snapshot = ModelSnapshot(
+            models=models,
+            predictor=predictor,
+            path=self.model_path,
+            mtime=mtime,
+            loaded_at=time.time(),
+            load_seconds=time.perf_counter() - start,
+            version=previous.version + 1 if previous else 1
+        )
+        # Single reference assignment: readers see either the old or the new snapshot
+        self._snapshot = snapshot
+        self._last_error = None
+        print(f"✓ Loaded {snapshot.model_count} models from {self.model_path} "
+              f"in {snapshot.load_seconds:.3f}s (version {snapshot.version})")
+        return snapshot
+
+    def reload(self) -> ModelSnapshot:
+        """Explicitly reload the models (used by the admin endpoint)"""
+        return self.load()
+
+    def _reload_if_changed(self):
+        """Reload when the model file's mtime differs from the served snapshot"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        try:
+            mtime = self._model_mtime()
+        except OSError:
+            return
+
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.mtime == mtime:
+            return
+
+        # Don't make request threads queue behind a reload that is already running
+        if not self._load_lock.acquire(blocking=False):
+            return
+        try:
+            current = self._snapshot
+            if current is None or current.mtime != mtime:
+                self._load_locked()
+        except Exception as e:
+            print(f"Error reloading models from {self.model_path}: {e}")
+        finally:
+            self._load_lock.release()
+
+    def get(self) -> Optional[ModelSnapshot]:
+        """Return the snapshot to serve this request with (None if nothing is loaded)"""
+        if self.check_interval is not None:
+            self._reload_if_changed()
+        return self._snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        """Load time, model count and version of the served snapshot"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {
+                'loaded': False,
+                'model_path': self.model_path,
+                'error': self._last_error
+            }
+        return {
+            'loaded': True,
+            'model_path': snapshot.path,
+            'model_count': snapshot.model_count,
+            'version': snapshot.version,
+            'loaded_at': snapshot.loaded_at,
+            'load_seconds': snapshot.load_seconds,
+            'model_mtime': snapshot.mtime,
+            'store': snapshot.models.stats() if isinstance(snapshot.models, WordModelStore) else None,
+            'error': self._last_error
+        }
@@ -0,0 +1,208 @@
+"""
+Per-word on-disk model store for the pronunciation service.
+Each word's {'model','scaler','encoder',...} dict is its own artifact; words are
+loaded on first use and kept in a bounded LRU.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional
+
+INDEX_FILE = 'index.json'
+STORE_FORMAT = 1
+
+
+def _artifact_name(word: str, data: bytes) -> str:
+    """
+    Filesystem-safe file name for a word's pickled artifact.
+
+    The name includes a hash of the content, so a re-export never rewrites a file
+    an existing index refers to: changed models get new files.
+    """
+    stem = re.sub(r'[^\w-]+', '_', word, flags=re.UNICODE).strip('_') or 'word'
+    return f"{stem}-{hashlib.sha256(data).hexdigest()[:16]}.pkl"
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write data to path through a temporary file, so readers see the old or the new file, never a partial one"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_index(directory: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(directory, INDEX_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def export_model_store(models: Dict[str, Any], directory: str) -> Dict[str, Any]:
+    """
+    Write one artifact per word plus an index.
+
+    Safe to run over a directory a live WordModelStore reads: artifacts have
+    content-hashed names and are written atomically, then the index is swapped
+    in. Artifacts that neither the new index nor the one it replaces refers to
+    are deleted; the replaced index's files are kept until the next export, so
+    a store still serving it can load its cold words.
+
+    Args:
+        models: The word -> model data dict from the monolithic pickle
+        directory: Output directory (created if missing)
+
+    Returns:
+        The index that was written
+    """
+    os.makedirs(directory, exist_ok=True)
+    previous = _read_index(directory)
+    words = {}
+
+    for word, model_data in models.items():
+        data = pickle.dumps(model_data, protocol=pickle.HIGHEST_PROTOCOL)
+        file_name = _artifact_name(word, data)
+        file_path = os.path.join(directory, file_name)
+        if not os.path.exists(file_path):
+            _write_atomic(file_path, data)
+        words[word] = {'file': file_name, 'size': len(data)}
+
+    index = {'format': STORE_FORMAT, 'words': words}
+
+    # Write the index last and atomically, so a reader never sees it pointing at missing files
+    _write_atomic(
+        os.path.join(directory, INDEX_FILE),
+        json.dumps(index, ensure_ascii=False, indent=2).encode('utf-8')
+    )
+
+    referenced = {entry['file'] for entry in words.values()}
+    if previous is not None:
+        referenced.update(entry['file'] for entry in previous.get('words', {}).values())
+    for file_name in os.listdir(directory):
+        if file_name.endswith('.pkl') and file_name not in referenced:
+            try:
+                os.remove(os.path.join(directory, file_name))
+            except FileNotFoundError:
+                pass
+    return index
+
+
+def is_model_store(path: str) -> bool:
+    """True if path is a directory written by export_model_store"""
+    return os.path.isfile(os.path.join(path, INDEX_FILE))
+
+
+class WordModelStore:
+    """
+    Dict-like view over a per-word model store directory.
+
+    Only the index is read up front. A word's artifact is unpickled on first
+    access and cached; once the cache holds more than max_models words or more
+    than max_bytes of artifacts, the least recently used words are dropped.
+    Artifact size on disk is used as the memory estimate for a word.
+    """
+
+    def __init__(self, directory: str, max_models: Optional[int] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            directory: Directory containing index.json and the per-word artifacts
+            max_models: Maximum number of words kept in memory (None = unbounded)
+            max_bytes: Maximum total artifact size kept in memory (None = unbounded)
+        """
+        self.directory = directory
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+
+        with open(os.path.join(directory, INDEX_FILE), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('format') != STORE_FORMAT:
+            raise ValueError(f"Unsupported model store format: {index.get('format')}")
+        self._index: Dict[str, Dict[str, Any]] = index['words']
+
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---- dict-like interface used by PronunciationPredictor ----
+
+    def __contains__(self, word) -> bool:
+        return word in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+    def get(self, word, default=None):
+        if word not in self._index:
+            return default
+        return self[word]
+
+    def __getitem__(self, word):
+        with self._lock:
+            model_data = self._cache.get(word)
+            if model_data is not None:
+                self._cache.move_to_end(word)
+                self.hits += 1
+                return model_data
+            self.misses += 1
+
+        entry = self._index[word]
+        # Unpickle outside the lock so one cold word doesn't stall requests for hot ones
+        with open(os.path.join(self.directory, entry['file']), 'rb') as f:
+            model_data = pickle.load(f)
+
+        with self._lock:
+            if word not in self._cache:
+                self._cache[word] = model_data
+                self._cache_bytes += entry['size']
+                self._evict_locked(keep=word)
+            else:
+                model_data = self._cache[word]
+            return model_data
+
+    def _evict_locked(self, keep: str) -> None:
+        """Drop least recently used words until both limits hold (never the word just loaded)"""
+        while len(self._cache) > 1 and (
+            (self.max_models is not None and len(self._cache) > self.max_models) or
+            (self.max_bytes is not None and self._cache_bytes > self.max_bytes)
+        ):
+            word, _ = next(iter(self._cache.items()))
+            if word == keep:
+                break
+            del self._cache[word]
+            self._cache_bytes -= self._index[word]['size']
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'words': len(self._index),
+                'resident_words': len(self._cache),
+                'resident_bytes': self._cache_bytes,
+                'max_models': self.max_models,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
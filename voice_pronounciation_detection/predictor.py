@@ -0,0 +1,283 @@
+"""
+Pronunciation predictor: scores a clip against a target word's model.
+"""
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+from voice_pronounciation_detection.metrics import stage
+from voice_pronounciation_detection.reduction import transform_features
+from voice_pronounciation_detection.segmentation import SegmentationError
+from voice_pronounciation_detection.word_ranker import WordRanker
+from voice_pronounciation_detection.worker_pool import PoolBusyError
+
+
+def cv_accuracy(cv_scores):
+    """Mean cross-validation score, or None when a model has none (too few clips to cross-validate)"""
+    scores = np.asarray(cv_scores, dtype=np.float64)
+    # Older models stored [nan] instead of no scores; NaN isn't valid JSON
+    scores = scores[~np.isnan(scores)]
+    return float(scores.mean()) if len(scores) else None
+
+
+class PronunciationPredictor:
+    """Make predictions on new audio"""
+
+    def __init__(self, models, feature_extractor, executor=None, cascade=None):
+        """
+        Args:
+            models: word -> {'model','scaler','encoder','accuracy','cv_scores'[,'projection']}
+                (dict, WordModelStore or CompactModelBank)
+            feature_extractor: AudioFeatureExtractor, or PooledFeatureExtractor to extract in worker processes
+            executor: Optional concurrent.futures executor used to extract batch features in parallel
+            cascade: Optional CascadeClassifier; predict() tries its first stage before the full features
+        """
+        self.models = models
+        self.feature_extractor = feature_extractor
+        self.executor = executor
+        self.cascade = cascade
+        self._ranker = None
+        self._ranker_lock = threading.Lock()
+
+    def _missing_model_result(self, target_word):
+        available_words = ', '.join(self.models.keys())
+        return {
+            'success': False,
+            'error': f"No model found for word '{target_word}'",
+            'available_words': available_words
+        }
+
+    def _format_result(self, target_word, model_data, prediction, prediction_proba):
+        """Build the response dict for one scored clip"""
+        encoder = model_data['encoder']
+
+        # Get result
+        result = encoder.inverse_transform([prediction])[0]
+        confidence = prediction_proba[prediction]
+
+        return {
+            'success': True,
+            'word': target_word,
+            'prediction': result,
+            'confidence': confidence,
+            'probabilities': {
+                'Correct': prediction_proba[0] if encoder.classes_[0] == 'Correct' else prediction_proba[1],
+                'Incorrect': prediction_proba[1] if encoder.classes_[0] == 'Correct' else prediction_proba[0]
+            },
+            'model_accuracy': model_data['accuracy'],
+            'cv_accuracy': cv_accuracy(model_data['cv_scores'])
+        }
+
+    def predict(self, audio, target_word):
+        """Predict pronunciation quality (audio is a path, bytes or file-like object)"""
+        target_word = target_word.lower().strip()
+
+        # Check if model exists
+        if target_word not in self.models:
+            return self._missing_model_result(target_word)
+
+        if self.cascade is not None and target_word in self.cascade:
+            return self._predict_cascade(audio, target_word)
+
+        # Extract features
+        features = self.feature_extractor.extract_all_features(audio)
+
+        if features is None:
+            return {
+                'success': False,
+                'error': 'Failed to extract features from audio file'
+            }
+
+        return self.predict_features(features, target_word)
+
+    def _predict_cascade(self, audio, target_word):
+        """Answer from the word's first-stage model when it is confident, else from the full features and SVC"""
+        first_stage = self.cascade.models[target_word]
+        stage_name, value = self.feature_extractor.extract_cascade(audio, first_stage, self.cascade.threshold)
+
+        if stage_name is None:
+            return {
+                'success': False,
+                'error': 'Failed to extract features from audio file'
+            }
+
+        self.cascade.record(stage_name)
+        if stage_name == 'fast':
+            result = self._format_result(target_word, first_stage, int(np.argmax(value)), value)
+            # model_accuracy/cv_accuracy always describe the word's SVC, whichever stage answered
+            model_data = self.models[target_word]
+            result['first_stage_accuracy'] = result['model_accuracy']
+            result['first_stage_cv_accuracy'] = result['cv_accuracy']
+            result['model_accuracy'] = model_data['accuracy']
+            result['cv_accuracy'] = cv_accuracy(model_data['cv_scores'])
+        else:
+            result = self.predict_features(value, target_word)
+        result['stage'] = stage_name
+        return result
+
+    def predict_features(self, features, target_word):
+        """Score an already extracted feature vector (target_word must be normalized and known)"""
+        # Get model components
+        model_data = self.models[target_word]
+        model = model_data['model']
+        scaler = model_data['scaler']
+
+        # Scale features
+        with stage('scale'):
+            features_scaled = scaler.transform(features.reshape(1, -1))
+        if model_data.get('projection') is not None:
+            with stage('project'):
+                features_scaled = model_data['projection'].transform(features_scaled)
+
+        # Predict
+        with stage('predict'):
+            prediction = model.predict(features_scaled)[0]
+        with stage('predict_proba'):
+            prediction_proba = model.predict_proba(features_scaled)[0]
+
+        return self._format_result(target_word, model_data, prediction, prediction_proba)
+
+    def _extract_or_none(self, source):
+        try:
+            return self.feature_extractor.extract_all_features(source)
+        except PoolBusyError:
+            # Backpressure applies to the whole request, not to single items
+            raise
+        except Exception as e:
+            print(f"Error extracting features: {e}")
+            return None
+
+    def _extract_batch(self, sources):
+        """Feature vectors (or None on failure) for each source, in parallel when an executor is set"""
+        if self.executor is None:
+            return [self._extract_or_none(source) for source in sources]
+        return list(self.executor.map(self._extract_or_none, sources))
+
+    def predict_batch(self, items):
+        """
+        Score many (audio, target_word) pairs.
+
+        Features are extracted in parallel, then rows are grouped by word so
+        each scaler and SVC runs once on a stacked matrix. Failures are
+        reported per item; one bad clip doesn't fail the batch.
+
+        Returns:
+            One result dict per item, in input order, each with an 'index' key
+        """
+        results = [None] * len(items)
+        pending = []  # (index, word)
+
+        for index, (_, target_word) in enumerate(items):
+            word = target_word.lower().strip()
+            if word not in self.models:
+                results[index] = self._missing_model_result(word)
+            else:
+                pending.append((index, word))
+
+        feature_rows = self._extract_batch([items[index][0] for index, _ in pending])
+
+        by_word = defaultdict(list)  # word -> [(index, features)]
+        for (index, word), features in zip(pending, feature_rows):
+            if features is None:
+                results[index] = {
+                    'success': False,
+                    'error': 'Failed to extract features from audio file'
+                }
+            else:
+                by_word[word].append((index, features))
+
+        for word, rows in by_word.items():
+            indices = [index for index, _ in rows]
+            try:
+                model_data = self.models[word]
+                features_scaled = transform_features(model_data, np.vstack([features for _, features in rows]))
+                predictions = model_data['model'].predict(features_scaled)
+                probabilities = model_data['model'].predict_proba(features_scaled)
+                for index, prediction, prediction_proba in zip(indices, predictions, probabilities):
+                    results[index] = self._format_result(word, model_data, prediction, prediction_proba)
+            except Exception as e:
+                for index in indices:
+                    results[index] = {'success': False, 'error': f"Error scoring '{word}': {e}"}
+
+        for index, result in enumerate(results):
+            result['index'] = index
+        return results
+
+    @property
+    def ranker(self):
+        """WordRanker over all models, built on first use (it needs every word loaded)"""
+        if self._ranker is None:
+            with self._ranker_lock:
+                if self._ranker is None:
+                    self._ranker = WordRanker(self.models)
+        return self._ranker
+
+    def rank_words(self, audio, top_n=5):
+        """Score a clip against every word model and return the top-N most likely words"""
+        features = self.feature_extractor.extract_all_features(audio)
+
+        if features is None:
+            return {
+                'success': False,
+                'error': 'Failed to extract features from audio file'
+            }
+
+        return {
+            'success': True,
+            'ranking': self.ranker.rank(features, top_n=top_n),
+            'model_count': len(self.ranker.words)
+        }
+
+    def predict_utterance(self, audio, target_words):
+        """
+        Score a recording of several words said in order, with pauses in between.
+
+        The recording is split into one segment per target word, segment
+        features are extracted from one decoded signal and spectrogram, and
+        each segment is scored against its word's model. Segments are extracted
+        in parallel on self.executor when features are computed in-process; with
+        the worker pool, one job extracts them all and the pool parallelizes
+        across requests instead.
+
+        Returns:
+            {'success', 'count', 'failed', 'results'} with one result per word,
+            each carrying 'index', 'start' and 'end' (seconds)
+        """
+        words = [word.lower().strip() for word in target_words]
+        try:
+            extracted = self.feature_extractor.extract_segments(audio, len(words), executor=self.executor)
+        except SegmentationError as e:
+            return {'success': False, 'error': str(e)}
+
+        if extracted is None:
+            return {
+                'success': False,
+                'error': 'Failed to extract features from audio file'
+            }
+
+        segments, feature_rows = extracted
+        sr = self.feature_extractor.config.SAMPLE_RATE
+        results = []
+        for index, (word, segment, features) in enumerate(zip(words, segments, feature_rows)):
+            if word not in self.models:
+                result = self._missing_model_result(word)
+            else:
+                try:
+                    result = self.predict_features(features, word)
+                except Exception as e:
+                    result = {'success': False, 'error': f"Error scoring '{word}': {e}"}
+            result.update({
+                'index': index,
+                'word': word,
+                'start': round(segment.start / sr, 3),
+                'end': round(segment.end / sr, 3)
+            })
+            results.append(result)
+
+        return {
+            'success': True,
+            'count': len(results),
+            'failed': sum(1 for result in results if not result['success']),
+            'results': results
+        }
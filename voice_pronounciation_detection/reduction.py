@@ -0,0 +1,94 @@
+"""
+Optional dimensionality reduction between a word's scaler and its SVC.
+A fitted PCA is stored as a LinearProjection and a univariate feature
+selection as a FeatureSelection; both are plain arrays, so every model format
+and the all-words ranker handle them without sklearn.
+"""
+import numpy as np
+
+REDUCTION_METHODS = ('none', 'pca', 'select')
+
+
+class LinearProjection:
+    """transform(X) = (X - mean_) @ components_.T, applied to scaled features"""
+
+    def __init__(self, mean, components):
+        self.mean_ = mean
+        self.components_ = components
+
+    @property
+    def n_components(self):
+        return self.components_.shape[0]
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) @ self.components_.T
+
+
+class FeatureSelection:
+    """transform(X) = X[:, index]; mean_ / components_ give the equivalent LinearProjection"""
+
+    def __init__(self, index, n_features):
+        self.index = np.asarray(index, dtype=np.intp)
+        self.n_features = n_features
+
+    @property
+    def n_components(self):
+        return len(self.index)
+
+    @property
+    def mean_(self):
+        return np.zeros(self.n_features)
+
+    @property
+    def components_(self):
+        return np.eye(self.n_features)[self.index]
+
+    def transform(self, X):
+        return np.asarray(X, dtype=np.float64)[..., self.index]
+
+
+def n_kept(components, n_features):
+    """REDUCTION_COMPONENTS below 1 is a fraction, otherwise a count"""
+    if components < 1:
+        return max(1, int(round(components * n_features)))
+    return min(int(components), n_features)
+
+
+def make_projection(config, n_samples, n_features):
+    """
+    Unfitted sklearn transformer for config.REDUCTION, or None.
+
+    For PCA a REDUCTION_COMPONENTS below 1 is the explained variance to keep;
+    for 'select' it is the fraction of features kept (ranked by ANOVA F-score).
+    """
+    method = config.REDUCTION
+    if method not in REDUCTION_METHODS:
+        raise ValueError(f"Unknown reduction '{method}', expected one of {', '.join(REDUCTION_METHODS)}")
+    if method == 'none':
+        return None
+
+    components = config.REDUCTION_COMPONENTS
+    if method == 'pca':
+        from sklearn.decomposition import PCA
+        if components >= 1:
+            components = min(int(components), n_samples, n_features)
+        return PCA(n_components=components, svd_solver='full', random_state=config.RANDOM_STATE)
+
+    from sklearn.feature_selection import SelectKBest, f_classif
+    return SelectKBest(f_classif, k=n_kept(components, n_features))
+
+
+def to_linear_projection(fitted):
+    """LinearProjection / FeatureSelection equivalent to a fitted PCA (without whitening) or feature selector"""
+    if hasattr(fitted, 'get_support'):
+        return FeatureSelection(fitted.get_support(indices=True), len(fitted.get_support()))
+    if getattr(fitted, 'whiten', False):
+        raise ValueError("Whitened PCA is not supported")
+    return LinearProjection(np.asarray(fitted.mean_, dtype=np.float64), np.asarray(fitted.components_, dtype=np.float64))
+
+
+def transform_features(model_data, X):
+    """Scaled (and, if the model has one, projected) features ready for the word's SVC"""
+    X = model_data['scaler'].transform(np.atleast_2d(X))
+    projection = model_data.get('projection')
+    return X if projection is None else projection.transform(X)
@@ -0,0 +1,281 @@
+"""
+Feature-extraction benchmark suite.
+
+Synthesizes clips offline (tones, noise, speech-like signals) at several
+lengths, sample rates and container formats, then measures:
+  - latency of each of the seven per-feature extractors
+  - latency of each stage of the single-pass pipeline
+  - end-to-end extract_all_features latency and throughput, single-threaded
+    and through a FeatureWorkerPool with N workers
+  - peak traced memory (single-threaded) and peak RSS of the web and worker processes
+
+Results are written as JSON; pass --compare to print p50 ratios against an
+earlier run.
+
+Usage:
+    python -m voice_pronounciation_detection.scripts.benchmark_features [--workers 4] [--output results.json] [--compare old.json]
+"""
+import argparse
+import copy
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import librosa
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.features import AudioFeatureExtractor
+from voice_pronounciation_detection.metrics import collect_stages
+from voice_pronounciation_detection.signals import pcm16_wav, synthesize
+from voice_pronounciation_detection.worker_pool import FeatureWorkerPool
+
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+KINDS = ('tone', 'noise', 'speech')
+LENGTHS = (0.5, 1.0, 2.0, 5.0)
+SAMPLE_RATES = (16000, 22050, 44100)
+FORMATS = ('wav16', 'wav_float', 'flac')
+
+EXTRACTORS = (
+    ('mfcc', lambda e, y, sr: e.extract_mfcc(y, sr)),
+    ('chroma', lambda e, y, sr: e.extract_chroma(y, sr)),
+    ('mel', lambda e, y, sr: e.extract_mel_spectrogram(y, sr)),
+    ('contrast', lambda e, y, sr: e.extract_spectral_contrast(y, sr)),
+    ('zcr', lambda e, y, sr: e.extract_zero_crossing_rate(y)),
+    ('rolloff', lambda e, y, sr: e.extract_spectral_rolloff(y, sr)),
+    ('rms', lambda e, y, sr: e.extract_rms_energy(y)),
+)
+
+
+def encode(y, sr, fmt):
+    """Encoded bytes of y in one of FORMATS, or None if the format needs soundfile"""
+    if fmt == 'wav16':
+        return pcm16_wav(y, sr)
+    if sf is None:
+        return None
+    buffer = io.BytesIO()
+    if fmt == 'wav_float':
+        sf.write(buffer, y, sr, format='WAV', subtype='FLOAT')
+    elif fmt == 'flac':
+        sf.write(buffer, y, sr, format='FLAC', subtype='PCM_16')
+    else:
+        raise ValueError(f"Unknown format '{fmt}'")
+    return buffer.getvalue()
+
+
+def summarize(timings_s):
+    """Latency summary in milliseconds"""
+    ms = np.asarray(timings_s) * 1000
+    return {
+        'n': int(len(ms)),
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'max_ms': float(ms.max()),
+    }
+
+
+def _peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(who).ru_maxrss / scale
+
+
+def build_clips(lengths, sample_rates, formats):
+    clips = []
+    for kind in KINDS:
+        for seconds in lengths:
+            for sr in sample_rates:
+                y = synthesize(kind, seconds, sr)
+                for fmt in formats:
+                    data = encode(y, sr, fmt)
+                    if data is not None:
+                        clips.append({'kind': kind, 'seconds': seconds, 'sr': sr, 'format': fmt, 'data': data})
+    return clips
+
+
+def bench_extractors(extractor, config, lengths, repeats):
+    """Each reference extractor on decoded speech-like clips, per clip length"""
+    results = {}
+    for seconds in lengths:
+        y = synthesize('speech', seconds, config.SAMPLE_RATE)
+        per_extractor = {}
+        for name, fn in EXTRACTORS:
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                fn(extractor, y, config.SAMPLE_RATE)
+                timings.append(time.perf_counter() - start)
+            per_extractor[name] = summarize(timings)
+        results[f"{seconds:g}s"] = per_extractor
+    return results
+
+
+def bench_pipeline(extractor, clips, repeats):
+    """End-to-end extract_all_features on encoded clips, with per-stage timings and peak memory"""
+    totals = []
+    stages = {}
+    by_group = {}
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for clip in clips:
+            with collect_stages() as timings:
+                start = time.perf_counter()
+                extractor.extract_all_features(clip['data'])
+                elapsed = time.perf_counter() - start
+            totals.append(elapsed)
+            for name, seconds in timings:
+                stages.setdefault(name, []).append(seconds)
+            group = f"{clip['format']}@{clip['sr']}/{clip['seconds']:g}s"
+            by_group.setdefault(group, []).append(elapsed)
+    wall = time.perf_counter() - started
+
+    # Peak memory from one more, untimed pass: tracing slows extraction down, which
+    # would make the throughput above incomparable with the pooled run
+    tracemalloc.start()
+    for clip in clips:
+        extractor.extract_all_features(clip['data'])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'latency': summarize(totals),
+        'throughput_clips_per_s': len(totals) / wall,
+        'stages': {name: summarize(values) for name, values in stages.items()},
+        'by_format_rate_length': {group: summarize(values) for group, values in sorted(by_group.items())},
+        'peak_traced_mb': peak / (1024 * 1024),
+    }
+
+
+def bench_workers(config, clips, workers, repeats):
+    """Throughput and per-job latency through a FeatureWorkerPool"""
+    payloads = [clip['data'] for clip in clips] * repeats
+    # Like the single-threaded run: without the workers' feature cache, repeats would be cache hits
+    pool_config = copy.copy(config)
+    pool_config.FEATURE_CACHE_SIZE = 0
+    pool_config.FEATURE_CACHE_DIR = None
+    pool = FeatureWorkerPool(pool_config, workers=workers, max_queue=len(payloads), job_timeout=600)
+    pool.start()
+    try:
+        submitted = {}
+        started = time.perf_counter()
+        for data in payloads:
+            future = pool.submit(data)
+            submitted[future] = time.perf_counter()
+        latencies = []
+        for future, submit_time in submitted.items():
+            future.result()
+            latencies.append(time.perf_counter() - submit_time)
+        wall = time.perf_counter() - started
+    finally:
+        pool.shutdown()
+
+    return {
+        'workers': workers,
+        'latency_under_load': summarize(latencies),
+        'throughput_clips_per_s': len(payloads) / wall,
+        'peak_worker_rss_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def compare(current, baseline_path):
+    """Print p50 ratios (current / baseline) for matching entries"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    def p50(results, *path):
+        node = results
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+            if node is None:
+                return None
+        return node.get('p50_ms')
+
+    rows = [('pipeline', ('pipeline', 'latency'))]
+    rows += [(f"stage {name}", ('pipeline', 'stages', name)) for name in current['pipeline']['stages']]
+    for length, extractors in current['extractors'].items():
+        rows += [(f"{name} {length}", ('extractors', length, name)) for name in extractors]
+
+    print(f"{'entry':<24} {'baseline':>9} {'current':>9} {'ratio':>6}")
+    for label, path in rows:
+        old, new = p50(baseline, *path), p50(current, *path)
+        if old and new:
+            print(f"{label:<24} {old:>9.2f} {new:>9.2f} {new / old:>6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pronunciation feature extraction")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="Worker processes for the pooled run (0 skips it)")
+    parser.add_argument('--repeats', type=int, default=3, help="Passes over the clip set")
+    parser.add_argument('--lengths', type=float, nargs='+', default=list(LENGTHS), help="Clip lengths in seconds")
+    parser.add_argument('--sample-rates', type=int, nargs='+', default=list(SAMPLE_RATES))
+    parser.add_argument('--formats', nargs='+', default=list(FORMATS), choices=FORMATS)
+    parser.add_argument('--output', default=None, help="JSON output path (default: features-benchmark-<timestamp>.json)")
+    parser.add_argument('--compare', default=None, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    config = Config()
+    # Measure extraction itself, not cache hits
+    extractor = AudioFeatureExtractor(config, cache=None)
+    clips = build_clips(args.lengths, args.sample_rates, args.formats)
+    print(f"Synthesized {len(clips)} clips ({', '.join(KINDS)} x {args.lengths} s x {args.sample_rates} Hz x {args.formats})")
+
+    # Warm up librosa / numba so the first measurement isn't a compile
+    extractor.extract_all_features(clips[0]['data'])
+    extractor.extract_features_separately(synthesize('speech', 1.0, config.SAMPLE_RATE), config.SAMPLE_RATE)
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'librosa': librosa.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'config': {name: getattr(config, name) for name in (
+            'SAMPLE_RATE', 'DURATION', 'N_FFT', 'HOP_LENGTH', 'N_MFCC', 'N_MEL', 'VAD_ENABLED'
+        )},
+        'clips': len(clips),
+        'repeats': args.repeats,
+    }
+
+    print("Per-extractor latency...")
+    results['extractors'] = bench_extractors(extractor, config, args.lengths, args.repeats)
+    print("Single-threaded pipeline...")
+    results['pipeline'] = bench_pipeline(extractor, clips, args.repeats)
+    results['peak_rss_mb'] = _peak_rss_mb()
+    if args.workers > 0:
+        print(f"Pipeline with {args.workers} workers...")
+        results['pooled'] = bench_workers(config, clips, args.workers, args.repeats)
+
+    pipeline = results['pipeline']
+    print(f"Pipeline: p50 {pipeline['latency']['p50_ms']:.1f} ms, p95 {pipeline['latency']['p95_ms']:.1f} ms, "
+          f"{pipeline['throughput_clips_per_s']:.1f} clips/s, peak traced {pipeline['peak_traced_mb']:.1f} MB")
+    if 'pooled' in results:
+        pooled = results['pooled']
+        print(f"Pooled ({pooled['workers']} workers): {pooled['throughput_clips_per_s']:.1f} clips/s, "
+              f"peak worker RSS {pooled['peak_worker_rss_mb']:.0f} MB")
+
+    output = args.output or f"features-benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"[OK] Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
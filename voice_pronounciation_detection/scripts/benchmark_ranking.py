@@ -0,0 +1,53 @@
+"""
+Benchmark WordRanker against a synthetic bank of word models.
+
+The shipped models are replicated under new names until the bank reaches the
+requested size, so support-vector counts and dimensions are realistic.
+
+Usage:
+    python -m voice_pronounciation_detection.scripts.benchmark_ranking [n_words] [repeats]
+"""
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from voice_pronounciation_detection.word_ranker import WordRanker
+
+MODELS_PATH = Path(__file__).resolve().parent.parent / "pronunciation_models.pkl"
+TARGET_MS = 50.0
+
+
+def main():
+    n_words = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with open(MODELS_PATH, "rb") as f:
+        models = pickle.load(f)
+    names = list(models)
+    bank = {f"{names[i % len(names)]}_{i}": models[names[i % len(names)]] for i in range(n_words)}
+
+    start = time.perf_counter()
+    ranker = WordRanker(bank)
+    build_s = time.perf_counter() - start
+
+    scaler = models[names[0]]["scaler"]
+    x = np.random.default_rng(0).standard_normal(scaler.mean_.shape[0]) * scaler.scale_ + scaler.mean_
+    ranker.rank(x)  # warm up BLAS
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ranker.rank(x, top_n=5)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    p50, p95 = np.percentile(timings, [50, 95])
+    print(f"Words: {n_words}, support vectors: {ranker.projection.shape[0]}, features: {ranker.projection.shape[1]}")
+    print(f"Build: {build_s:.2f}s, rank p50: {p50:.2f} ms, p95: {p95:.2f} ms")
+    print("[OK] Under target" if p95 < TARGET_MS else f"[WARN] p95 above {TARGET_MS:.0f} ms target")
+
+
+if __name__ == "__main__":
+    main()
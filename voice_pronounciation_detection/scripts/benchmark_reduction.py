@@ -0,0 +1,134 @@
+"""
+Accuracy, size and inference-latency comparison of projected vs full-dimension models.
+
+Trains every variant on the same per-word splits (training.train_word) and
+reports, per variant: mean held-out accuracy and CV accuracy, SVC input
+dimension, support vectors, pickled and compact model size, single-clip
+predict_features latency and all-words ranking latency.
+
+With --data-dir the features come from a labelled dataset (see
+scripts/train_models.py). Without it, a synthetic dataset is derived from the
+shipped models: feature vectors are drawn around each word's support vectors
+and labelled by the shipped SVC, so accuracy is agreement with those models.
+
+Usage:
+    python -m voice_pronounciation_detection.scripts.benchmark_reduction [--data-dir DIR]
+        [--variants none pca:0.95 pca:16 select:64] [--output results.json]
+"""
+import argparse
+import json
+import pickle
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from voice_pronounciation_detection.compact_model import model_arrays
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.predictor import PronunciationPredictor
+from voice_pronounciation_detection.training import FeatureMatrix, Sample, scan_dataset, train_models
+from voice_pronounciation_detection.word_ranker import WordRanker
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MODELS_PATH = BASE_DIR / "pronunciation_models.pkl"
+DEFAULT_VARIANTS = ('none', 'pca:0.95', 'pca:0.8', 'pca:16', 'select:64', 'select:32')
+
+
+def synthetic_matrix(models_path, clips_per_word=60, spread=0.5, seed=0):
+    """Feature vectors around each shipped word's support vectors, labelled by that word's SVC"""
+    with open(models_path, 'rb') as f:
+        teachers = pickle.load(f)
+    rng = np.random.default_rng(seed)
+    samples, rows = [], []
+    for word, model_data in teachers.items():
+        scaler, svc = model_data['scaler'], model_data['model']
+        picks = rng.integers(0, len(svc.support_vectors_), clips_per_word)
+        scaled = svc.support_vectors_[picks] + spread * rng.standard_normal((clips_per_word, svc.support_vectors_.shape[1]))
+        labels = model_data['encoder'].inverse_transform(svc.predict(scaled))
+        rows.append(scaled * scaler.scale_ + scaler.mean_)
+        samples.extend(Sample(word, str(label), '') for label in labels)
+    return FeatureMatrix(samples, np.vstack(rows))
+
+
+def _median_seconds(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def measure(models, matrix, repeats=200):
+    predictor = PronunciationPredictor(models, feature_extractor=None)
+    ranker = WordRanker(models)
+    x = matrix.X[0]
+    words = list(models)
+    return {
+        'words': len(models),
+        'accuracy': float(np.mean([m['accuracy'] for m in models.values()])),
+        'cv_accuracy': float(np.mean([np.mean(m['cv_scores']) for m in models.values() if len(m['cv_scores'])])),
+        'svc_input_dim': float(np.mean([m['model'].support_vectors_.shape[1] for m in models.values()])),
+        'support_vectors': int(sum(len(m['model'].support_vectors_) for m in models.values())),
+        'pickle_bytes': int(sum(len(pickle.dumps(m)) for m in models.values())),
+        'compact_bytes': int(sum(
+            a.nbytes for m in models.values() for a in model_arrays(m)['arrays'].values()
+        )),
+        'predict_ms': 1000 * float(np.median([
+            _median_seconds(lambda w=w: predictor.predict_features(x, w), repeats) for w in words
+        ])),
+        'rank_ms': 1000 * _median_seconds(lambda: ranker.correct_probabilities(x), repeats),
+    }
+
+
+def parse_variant(text):
+    method, _, components = text.partition(':')
+    return method, float(components) if components else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-dir', type=Path, help='Labelled dataset (default: synthetic data from the shipped models)')
+    parser.add_argument('--models', type=Path, default=DEFAULT_MODELS_PATH, help='Shipped models for the synthetic dataset')
+    parser.add_argument('--feature-cache', type=Path, help='Feature matrix .npz (default: <data_dir>/features.npz)')
+    parser.add_argument('--variants', nargs='+', default=list(DEFAULT_VARIANTS), help='none | pca:<components> | select:<components>')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore')
+
+    if args.data_dir:
+        matrix = FeatureMatrix.build(
+            scan_dataset(str(args.data_dir)), Config(),
+            cache_path=str(args.feature_cache or args.data_dir / "features.npz"), workers=args.workers
+        )
+    else:
+        matrix = synthetic_matrix(args.models)
+
+    results = {}
+    for variant in args.variants:
+        config = Config()
+        config.REDUCTION, config.REDUCTION_COMPONENTS = parse_variant(variant)
+        models, _ = train_models(matrix, config, workers=args.workers)
+        results[variant] = measure(models, matrix)
+
+    baseline = results.get('none')
+    print(f"\n{'variant':<12} {'acc':>6} {'cv':>6} {'dim':>6} {'SVs':>5} {'pickle KB':>10} "
+          f"{'compact KB':>11} {'predict ms':>11} {'rank ms':>8}")
+    for variant, r in results.items():
+        delta = f" ({r['accuracy'] - baseline['accuracy']:+.3f})" if baseline and variant != 'none' else ''
+        print(f"{variant:<12} {r['accuracy']:>6.3f} {r['cv_accuracy']:>6.3f} {r['svc_input_dim']:>6.0f} "
+              f"{r['support_vectors']:>5} {r['pickle_bytes'] / 1024:>10.1f} {r['compact_bytes'] / 1024:>11.1f} "
+              f"{r['predict_ms']:>11.3f} {r['rank_ms']:>8.3f}{delta}")
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            'source': str(args.data_dir) if args.data_dir else f"synthetic from {args.models}",
+            'results': results
+        }, indent=2))
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark voice-activity trimming on typical recording lengths.
+
+Each clip is room noise with a short word (a synthetic harmonic burst) in the
+middle, like the children's recordings the service receives. Reports feature
+extraction time with and without trimming, and the frames removed.
+
+Usage:
+    python -m voice_pronounciation_detection.scripts.benchmark_vad [word_seconds] [repeats]
+"""
+import sys
+import time
+
+import numpy as np
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.feature_engine import SpectralFeatureEngine
+from voice_pronounciation_detection.signals import recording, synthetic_clip
+from voice_pronounciation_detection.vad import VoiceActivityTrimmer
+
+CLIP_SECONDS = (1.5, 2.5, 3.5, 5.0)
+
+
+def _time_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    word_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 0.6
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    config = Config()
+    sr = config.SAMPLE_RATE
+    engine = SpectralFeatureEngine(config)
+    trimmer = VoiceActivityTrimmer(config)
+    engine.extract(synthetic_clip(config), sr)  # warm up librosa / numba
+
+    print(f"Word length: {word_seconds:.2f}s, median of {repeats} runs")
+    print(f"{'clip':>6} {'frames':>7} {'trimmed':>8} {'full ms':>8} {'vad ms':>7} {'saved ms':>9}")
+    for seconds in CLIP_SECONDS:
+        y = recording(config, seconds, word_seconds)
+        _, info = trimmer.trim(y, sr)
+
+        full_ms = _time_ms(lambda: engine.extract(y, sr), repeats)
+        trimmed_ms = _time_ms(lambda: engine.extract(trimmer.trim(y, sr)[0], sr), repeats)
+        print(f"{seconds:>5.1f}s {info['frames']:>7} {info['frames_trimmed']:>8} "
+              f"{full_ms:>8.1f} {trimmed_ms:>7.1f} {full_ms - trimmed_ms:>9.1f}")
+
+    print("[OK] Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Convert pronunciation_models.pkl into the compact, memory-mappable model format.
+
+Usage:
+    python -m voice_pronounciation_detection.scripts.export_compact_models [models.pkl] [output_dir]
+"""
+import pickle
+import sys
+from pathlib import Path
+
+from voice_pronounciation_detection.compact_model import export_compact_models
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MODELS_PATH = BASE_DIR / "pronunciation_models.pkl"
+DEFAULT_OUTPUT_DIR = BASE_DIR / "compact_models"
+
+
+def main():
+    models_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MODELS_PATH
+    output_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_OUTPUT_DIR
+
+    with open(models_path, "rb") as f:
+        models = pickle.load(f)
+
+    manifest = export_compact_models(models, str(output_dir))
+    print(f"[OK] Exported {len(manifest['words'])} word models to {output_dir}")
+    print(f"     Set PRONUNCIATION_MODEL_PATH={output_dir} to serve them without pickle.")
+
+
+if __name__ == "__main__":
+    main()
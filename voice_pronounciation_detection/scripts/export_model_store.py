@@ -0,0 +1,31 @@
+"""
+Split the monolithic pronunciation_models.pkl into a per-word model store.
+
+Usage:
+    python -m voice_pronounciation_detection.scripts.export_model_store [models.pkl] [output_dir]
+"""
+import pickle
+import sys
+from pathlib import Path
+
+from voice_pronounciation_detection.model_store import export_model_store
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MODELS_PATH = BASE_DIR / "pronunciation_models.pkl"
+DEFAULT_STORE_DIR = BASE_DIR / "model_store"
+
+
+def main():
+    models_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MODELS_PATH
+    store_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_STORE_DIR
+
+    with open(models_path, "rb") as f:
+        models = pickle.load(f)
+
+    index = export_model_store(models, str(store_dir))
+    print(f"[OK] Exported {len(index['words'])} word models to {store_dir}")
+    print(f"     Set PRONUNCIATION_MODEL_PATH={store_dir} to serve from the store.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Train the first stage of the two-stage cascade and evaluate it on held-out clips.
+
+Expects one directory per word with Correct/ and Incorrect/ recordings:
+
+    <data_dir>/<word>/Correct/*.wav
+    <data_dir>/<word>/Incorrect/*.wav
+
+For each word the clips are split into train / held-out (Config.TEST_SIZE,
+stratified). The first stage is fitted on the training split; on the held-out
+split every clip is scored by both the first stage and the serving SVC, and
+those records are stored in the bundle so the service can report hit rate and
+accuracy delta at whatever threshold it runs with. Use recordings the serving
+SVCs were not trained on, or the full path's held-out accuracy is optimistic.
+
+Features come from the same cached feature matrix as train_models.py.
+
+Usage:
+    python -m voice_pronounciation_detection.scripts.train_cascade <data_dir> [--models PATH] [--output cascade.pkl]
+        [--threshold 0.9] [--workers N] [--feature-cache features.npz]
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from voice_pronounciation_detection.cascade import (
+    evaluate_cascade, fast_features_from_full, save_cascade, train_first_stage
+)
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.model_registry import ModelRegistry
+from voice_pronounciation_detection.reduction import transform_features
+from voice_pronounciation_detection.training import FeatureMatrix, scan_dataset, trainable_words
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = BASE_DIR / "cascade_models.pkl"
+# Enough for a stratified held-out split that contains both labels
+MIN_CLIPS_PER_LABEL = 5
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('data_dir', type=Path)
+    parser.add_argument('--models', default=Config.MODEL_PATH, help='Serving models (pickle, store or compact directory)')
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--threshold', type=float, default=0.9, help='Default serving threshold stored in the bundle')
+    parser.add_argument('--workers', type=int, default=None, help='Feature extraction processes (default: all cores)')
+    parser.add_argument('--feature-cache', type=Path, help='Feature matrix .npz reused across runs (default: <data_dir>/features.npz)')
+    args = parser.parse_args()
+
+    config = Config()
+    serving_models = ModelRegistry(args.models, build_predictor=lambda models: None).load().models
+    matrix = FeatureMatrix.build(
+        scan_dataset(str(args.data_dir)), config,
+        cache_path=str(args.feature_cache or args.data_dir / "features.npz"), workers=args.workers
+    )
+    words, skipped = trainable_words(matrix, MIN_CLIPS_PER_LABEL)
+    for word, reason in skipped.items():
+        print(f"[SKIP] {word}: {reason}")
+
+    first_stage = {}
+    holdout = {'word': [], 'fast_confidence': [], 'fast_correct': [], 'full_correct': []}
+
+    for word in words:
+        if word not in serving_models:
+            print(f"[SKIP] {word}: no serving model")
+            continue
+        X, labels = matrix.word_data(word)
+
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, labels, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE, stratify=labels
+        )
+        model_data = train_first_stage(fast_features_from_full(X_train), y_train, config)
+        first_stage[word] = model_data
+
+        proba = model_data['model'].predict_proba(model_data['scaler'].transform(fast_features_from_full(X_test)))
+        fast_pred = model_data['encoder'].inverse_transform(proba.argmax(axis=1))
+        full = serving_models[word]
+        full_pred = full['encoder'].inverse_transform(full['model'].predict(transform_features(full, X_test)))
+
+        holdout['word'].extend([word] * len(y_test))
+        holdout['fast_confidence'].extend(proba.max(axis=1))
+        holdout['fast_correct'].extend(fast_pred == y_test)
+        holdout['full_correct'].extend(full_pred == y_test)
+        word_report = evaluate_cascade({k: np.array(v[-len(y_test):]) for k, v in holdout.items()}, args.threshold)
+        print(f"[OK] {word}: {len(labels)} clips, hit rate {word_report['hit_rate']:.2f}, "
+              f"accuracy delta {word_report['accuracy_delta']:+.3f}")
+
+    holdout = {key: np.array(values) for key, values in holdout.items()}
+    save_cascade(str(args.output), first_stage, holdout, args.threshold)
+
+    print(f"\nHeld-out results for {len(first_stage)} words ({len(holdout['word'])} clips):")
+    for threshold in (0.7, 0.8, 0.9, 0.95, 0.99):
+        report = evaluate_cascade(holdout, threshold)
+        if report['clips']:
+            print(f"  threshold {threshold:.2f}: hit rate {report['hit_rate']:.2f}, "
+                  f"cascade {report['cascade_accuracy']:.3f} vs full {report['full_accuracy']:.3f} "
+                  f"({report['accuracy_delta']:+.3f})")
+    print(f"[OK] Wrote {args.output}; set CASCADE_MODEL_PATH={args.output} to serve it.")
+
+
+if __name__ == "__main__":
+    main()
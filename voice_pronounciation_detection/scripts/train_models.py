@@ -0,0 +1,70 @@
+"""
+Train the per-word pronunciation models from a labelled dataset.
+
+Expects <data_dir>/<word>/{Correct,Incorrect}/*.wav. Features are extracted
+once (in parallel) into a cached feature matrix, then each word's SVC is
+trained and cross-validated in its own process.
+
+Usage:
+    python -m voice_pronounciation_detection.scripts.train_models <data_dir>
+        [--output model_store] [--format store|compact|pickle] [--workers N]
+        [--feature-cache features.npz] [--min-per-label 5]
+"""
+import argparse
+import pickle
+import time
+from pathlib import Path
+
+from voice_pronounciation_detection.compact_model import export_compact_models
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.model_store import export_model_store
+from voice_pronounciation_detection.training import FeatureMatrix, scan_dataset, train_models
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUTS = {
+    'store': BASE_DIR / "model_store",
+    'compact': BASE_DIR / "compact_models",
+    'pickle': BASE_DIR / "pronunciation_models.pkl",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('data_dir', type=Path)
+    parser.add_argument('--format', choices=sorted(DEFAULT_OUTPUTS), default='store')
+    parser.add_argument('--output', type=Path, help='Output path (default depends on --format)')
+    parser.add_argument('--workers', type=int, default=None, help='Processes for extraction and training (default: all cores)')
+    parser.add_argument('--feature-cache', type=Path, help='Feature matrix .npz reused across runs (default: <data_dir>/features.npz)')
+    parser.add_argument('--min-per-label', type=int, default=5, help='Skip words with fewer clips of either label')
+    args = parser.parse_args()
+
+    config = Config()
+    output = args.output or DEFAULT_OUTPUTS[args.format]
+    feature_cache = args.feature_cache or args.data_dir / "features.npz"
+
+    start = time.perf_counter()
+    samples = scan_dataset(str(args.data_dir))
+    print(f"Found {len(samples)} recordings for {len({s.word for s in samples})} words in {args.data_dir}")
+    matrix = FeatureMatrix.build(samples, config, cache_path=str(feature_cache), workers=args.workers)
+    print(f"Feature matrix {matrix.X.shape} ready in {time.perf_counter() - start:.1f}s")
+
+    models, skipped = train_models(matrix, config, workers=args.workers, min_per_label=args.min_per_label)
+    for word, reason in skipped.items():
+        print(f"[SKIP] {word}: {reason}")
+    if not models:
+        raise SystemExit("No word had enough data to train a model")
+
+    if args.format == 'store':
+        export_model_store(models, str(output))
+    elif args.format == 'compact':
+        export_compact_models(models, str(output))
+    else:
+        with open(output, 'wb') as f:
+            pickle.dump(models, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    print(f"[OK] Trained {len(models)} word models in {time.perf_counter() - start:.1f}s -> {output}")
+    print(f"     Set PRONUNCIATION_MODEL_PATH={output} to serve them.")
+
+
+if __name__ == "__main__":
+    main()
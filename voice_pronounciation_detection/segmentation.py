@@ -0,0 +1,105 @@
+"""
+Silence-based segmentation of a multi-word utterance.
+Frames are classified with the VAD's energy / ZCR rule on the feature
+extractors' framing, so segments map directly onto columns of the clip's
+spectrogram and each word's features can be taken from one shared STFT.
+"""
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from voice_pronounciation_detection.vad import VoiceActivityTrimmer
+
+
+class SegmentationError(ValueError):
+    """Raised when the recording can't be split into the requested number of words"""
+
+
+@dataclass(frozen=True)
+class Segment:
+    """One word's region: [start_frame, end_frame) spectrogram columns and [start, end) samples"""
+    start_frame: int
+    end_frame: int
+    start: int
+    end: int
+
+
+def voiced_regions(mask, min_gap_frames, min_frames):
+    """[start, end) runs of voiced frames, bridging gaps shorter than min_gap_frames and dropping short runs"""
+    regions = []
+    for frame in np.flatnonzero(mask):
+        if regions and frame - regions[-1][1] < min_gap_frames:
+            regions[-1][1] = frame + 1
+        else:
+            regions.append([frame, frame + 1])
+    return [(start, end) for start, end in regions if end - start >= min_frames]
+
+
+def fit_to_count(regions, n, level_db, min_frames):
+    """
+    Merge across the shortest gaps, or split the longest regions at their
+    quietest frame, until there are exactly n regions.
+    """
+    regions = list(regions)
+    while len(regions) > n:
+        gaps = [regions[i + 1][0] - regions[i][1] for i in range(len(regions) - 1)]
+        i = int(np.argmin(gaps))
+        regions[i:i + 2] = [(regions[i][0], regions[i + 1][1])]
+
+    while len(regions) < n:
+        i = max(range(len(regions)), key=lambda k: regions[k][1] - regions[k][0])
+        start, end = regions[i]
+        # Only split inside the middle of the region, so both halves stay word-sized
+        lo, hi = start + (end - start) // 5, end - (end - start) // 5
+        if hi - lo < 1 or min(lo - start, end - hi) < min_frames:
+            raise SegmentationError(f"Found {len(regions)} words in the recording, expected {n}")
+        cut = lo + int(np.argmin(level_db[lo:hi]))
+        regions[i:i + 1] = [(start, cut), (cut, end)]
+    return regions
+
+
+class UtteranceSegmenter:
+    """Splits a recording of several words, said with pauses in between, into one segment per word"""
+
+    def __init__(self, config):
+        self.config = config
+        self.vad = VoiceActivityTrimmer(config)
+        self.hop_length = config.HOP_LENGTH
+
+    def segment(self, y, sr, n_words) -> List[Segment]:
+        """
+        Exactly n_words segments in order, each padded by SEGMENT_PADDING seconds
+        on either side without reaching into its neighbour.
+
+        Raises:
+            SegmentationError: No speech could be told apart from the background,
+                or the pauses don't allow n_words segments
+        """
+        levels = self.vad.frame_levels(y)
+        mask = self.vad.voiced_mask(y, levels)
+        if mask is None or not mask.any():
+            raise SegmentationError("No speech found in the recording")
+
+        frames_per_second = sr / self.hop_length
+        min_frames = max(1, int(self.config.SEGMENT_MIN_SECONDS * frames_per_second))
+        regions = voiced_regions(mask, int(self.config.SEGMENT_MIN_SILENCE * frames_per_second), min_frames)
+        if not regions:
+            raise SegmentationError("No speech found in the recording")
+        regions = fit_to_count(regions, n_words, levels[0], min_frames)
+
+        n_frames = len(mask)
+        padding = int(self.config.SEGMENT_PADDING * frames_per_second)
+        segments = []
+        for i, (start, end) in enumerate(regions):
+            # Pad into the silence, but stop halfway to the neighbouring word
+            left = 0 if i == 0 else (regions[i - 1][1] + start) // 2
+            right = n_frames if i == len(regions) - 1 else (end + regions[i + 1][0]) // 2
+            start, end = max(left, start - padding), min(right, end + padding)
+            segments.append(Segment(
+                start_frame=start,
+                end_frame=end,
+                start=start * self.hop_length,
+                end=min(len(y), end * self.hop_length)
+            ))
+        return segments
@@ -0,0 +1,135 @@
+"""
+Everything one serving process needs: feature extraction (in-process or in
+the worker pool), the model registry, the optional cascade, metrics and the
+startup warm-up. Shared by the Flask app (app.py) and the ASGI router (api.py).
+"""
+import atexit
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from voice_pronounciation_detection.config import Config
+
+# numba picks its cache directory when librosa's kernels are defined (on import),
+# so this has to happen before anything below imports librosa
+if Config.JIT_CACHE_DIR:
+    os.makedirs(Config.JIT_CACHE_DIR, exist_ok=True)
+    os.environ.setdefault('NUMBA_CACHE_DIR', Config.JIT_CACHE_DIR)
+
+from voice_pronounciation_detection.cascade import CascadeClassifier
+from voice_pronounciation_detection.feature_cache import build_feature_cache
+from voice_pronounciation_detection.features import AudioFeatureExtractor
+from voice_pronounciation_detection.metrics import StageMetrics
+from voice_pronounciation_detection.model_registry import ModelRegistry
+from voice_pronounciation_detection.predictor import PronunciationPredictor
+from voice_pronounciation_detection.warmup import ServiceWarmup
+from voice_pronounciation_detection.worker_pool import FeatureWorkerPool, PooledFeatureExtractor
+
+
+LOOPBACK_HOSTS = ('127.0.0.1', '::1', 'localhost')
+
+
+def load_cascade(config):
+    """The cascade first stage from CASCADE_MODEL_PATH, or None (unset or unreadable)"""
+    if not config.CASCADE_MODEL_PATH:
+        return None
+    try:
+        cascade = CascadeClassifier.load(config.CASCADE_MODEL_PATH, threshold=config.CASCADE_THRESHOLD)
+        print(f"✓ Cascade first stage loaded for {len(cascade.models)} words (threshold {cascade.threshold})")
+        return cascade
+    except Exception as e:
+        print(f"Error loading cascade models, serving the full path only: {e}")
+        return None
+
+
+class PronunciationService:
+    """
+    The serving components of one process. Nothing heavy happens until start():
+    it starts the worker pool, loads the models and begins the warm-up.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or Config()
+        self.feature_cache = build_feature_cache(self.config)
+        self.feature_extractor = AudioFeatureExtractor(self.config, cache=self.feature_cache)
+        self.feature_pool = None
+        self.stage_metrics = StageMetrics() if self.config.METRICS_ENABLED else None
+        self.cascade = load_cascade(self.config)
+        self.batch_executor = ThreadPoolExecutor(max_workers=self.config.BATCH_WORKERS, thread_name_prefix='batch-features')
+
+        # Models are loaded once per process; requests read the current snapshot from the registry
+        self.model_registry = ModelRegistry(
+            self.config.MODEL_PATH,
+            build_predictor=lambda models: PronunciationPredictor(
+                models, self.feature_extractor, executor=self.batch_executor, cascade=self.cascade
+            ),
+            check_interval=self.config.MODEL_RELOAD_CHECK_INTERVAL,
+            store_options={
+                'max_models': self.config.MODEL_STORE_MAX_WORDS,
+                'max_bytes': self.config.MODEL_STORE_MAX_BYTES
+            }
+        )
+        self.warmup = None
+
+    def start_pool(self):
+        """Move CPU-bound extraction into warmed worker processes when FEATURE_WORKERS > 0"""
+        if self.config.FEATURE_WORKERS <= 0:
+            return
+        self.feature_pool = FeatureWorkerPool(
+            self.config,
+            workers=self.config.FEATURE_WORKERS,
+            max_queue=self.config.FEATURE_QUEUE_SIZE,
+            job_timeout=self.config.FEATURE_JOB_TIMEOUT,
+            start_method=self.config.FEATURE_POOL_START_METHOD,
+            max_stuck_jobs=self.config.FEATURE_MAX_STUCK_JOBS
+        )
+        self.feature_pool.start()
+        atexit.register(self.feature_pool.shutdown)
+        self.feature_extractor = PooledFeatureExtractor(self.feature_pool)
+
+    def admin_allowed(self, token, client_host):
+        """
+        Whether an admin request may proceed: it must carry ADMIN_TOKEN, or come
+        from a loopback address when no token is configured.
+
+        Args:
+            token: The request's 'X-Admin-Token' header (None if absent)
+            client_host: The client's address
+        """
+        if self.config.ADMIN_TOKEN:
+            return token is not None and hmac.compare_digest(token.encode('utf-8'), self.config.ADMIN_TOKEN.encode('utf-8'))
+        return client_host in LOOPBACK_HOSTS
+
+    def load_models(self):
+        """Load the models; on failure the service stays up and answers 500 / 503 until a reload succeeds"""
+        if not os.path.exists(self.model_registry.model_path):
+            print(f"Error: Model file not found at {self.model_registry.model_path}")
+            return
+
+        try:
+            self.model_registry.load()
+            print("✓ Pronunciation Predictor initialized.")
+        except Exception as e:
+            print(f"Error loading predictor: {e}")
+
+    def start(self, worker_pool=True):
+        """
+        Args:
+            worker_pool: False leaves extraction in this process whatever FEATURE_WORKERS says
+        """
+        if worker_pool:
+            self.start_pool()
+        self.load_models()
+
+        # Compile librosa's numba kernels before taking traffic; readiness fails until done
+        self.warmup = ServiceWarmup(self.config, self.feature_extractor, self.model_registry)
+        if self.config.WARMUP_ENABLED:
+            self.warmup.start()
+        else:
+            self.warmup.skip()
+        return self
+
+    def shutdown(self):
+        if self.feature_pool is not None:
+            self.feature_pool.shutdown()
+        self.batch_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,60 @@
+"""
+Synthetic audio signals and WAV encoding.
+Used by the startup warm-up, the tests and the benchmark scripts, so all of them
+exercise the service with exactly the same clips.
+"""
+import io
+import wave
+
+import numpy as np
+
+
+def synthetic_clip(config, seconds=1.0, seed=0, sr=None):
+    """Speech-like test signal: a modulated harmonic tone plus a little noise (at sr, default SAMPLE_RATE)"""
+    rng = np.random.default_rng(seed)
+    sr = sr or config.SAMPLE_RATE
+    t = np.arange(int(sr * seconds)) / sr
+    envelope = 0.5 * (1 - np.cos(2 * np.pi * t / seconds))
+    tone = sum(np.sin(2 * np.pi * 180 * k * t) / k for k in range(1, 6))
+    return (0.3 * envelope * tone + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def pcm16_wav(y, sr):
+    """16-bit mono WAV bytes, the format most clients upload"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes((np.clip(y, -1, 1) * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+def synthesize(kind, seconds, sr, seed=0):
+    """Mono float32 test signal in [-1, 1]"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sr)) / sr
+    if kind == 'tone':
+        y = 0.5 * np.sin(2 * np.pi * 440 * t)
+    elif kind == 'noise':
+        y = 0.1 * rng.standard_normal(len(t))
+    elif kind == 'speech':
+        # Gliding harmonic voice with syllable-rate amplitude modulation and breath noise
+        f0 = 160 + 40 * np.sin(2 * np.pi * 0.8 * t)
+        phase = 2 * np.pi * np.cumsum(f0) / sr
+        voice = sum(np.sin(k * phase) / k for k in range(1, 10))
+        syllables = np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+        y = 0.2 * syllables * voice + 0.005 * rng.standard_normal(len(t))
+    else:
+        raise ValueError(f"Unknown clip kind '{kind}'")
+    return np.clip(y, -1, 1).astype(np.float32)
+
+
+def recording(config, seconds, word_seconds, seed=0):
+    """Noise of the given length with a word-like burst centred in it"""
+    rng = np.random.default_rng(seed)
+    y = 0.005 * rng.standard_normal(int(seconds * config.SAMPLE_RATE)).astype(np.float32)
+    word = synthetic_clip(config, seconds=word_seconds, seed=seed)
+    start = (len(y) - len(word)) // 2
+    y[start:start + len(word)] += word
+    return y
@@ -0,0 +1,345 @@
+"""
+Incremental feature extraction for streamed audio.
+PCM chunks are framed as they arrive (same framing as librosa with
+center=True) and each new block of frames is folded into running per-dimension
+statistics, so a provisional feature vector is available at any point without
+re-processing the whole clip.
+"""
+import numpy as np
+import librosa
+import scipy.fft
+
+from voice_pronounciation_detection.feature_engine import chroma_filterbank, mel_filterbank
+
+try:
+    import soxr
+except ImportError:  # librosa pulls soxr in, but resampling falls back to librosa without it
+    soxr = None
+
+# power_to_db defaults used by the batch extractor
+_AMIN = 1e-10
+_TOP_DB = 80.0
+
+
+class RunningStats:
+    """Per-row count / mean / M2 / min / max, merged block by block (Chan et al.)"""
+
+    def __init__(self, dim):
+        self.count = 0
+        self.mean = np.zeros(dim)
+        self.m2 = np.zeros(dim)
+        self.min = np.full(dim, np.inf)
+        self.max = np.full(dim, -np.inf)
+
+    def update(self, block):
+        """Fold in a (dim, n_frames) block"""
+        n = block.shape[1]
+        if n == 0:
+            return
+        block_mean = block.mean(axis=1)
+        block_m2 = np.sum((block - block_mean[:, None]) ** 2, axis=1)
+        delta = block_mean - self.mean
+        total = self.count + n
+        self.mean += delta * (n / total)
+        self.m2 += block_m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+        np.minimum(self.min, block.min(axis=1), out=self.min)
+        np.maximum(self.max, block.max(axis=1), out=self.max)
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / self.count) if self.count else np.zeros_like(self.m2)
+
+
+# Bytes per sample of each supported stream format
+SAMPLE_WIDTHS = {'pcm16': 2, 'f32': 4}
+
+
+def decode_pcm_chunk(data, sample_format='pcm16'):
+    """
+    Mono float32 samples from a raw chunk ('pcm16' little-endian int16 or 'f32' float32).
+    The chunk must hold whole samples; StreamingAssessment.feed carries split ones over.
+    """
+    if sample_format == 'pcm16':
+        return np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768.0
+    if sample_format == 'f32':
+        return np.frombuffer(data, dtype='<f4').astype(np.float32)
+    raise ValueError(f"Unsupported sample format '{sample_format}' (expected 'pcm16' or 'f32')")
+
+
+class StreamingFeatureAccumulator:
+    """
+    Builds the 352-dim feature vector incrementally.
+
+    The final vector matches the batch extractor except for chroma: the batch
+    path estimates the chroma tuning from the whole clip, while streaming
+    estimates it from the first tuning_seconds and keeps it fixed afterwards.
+    """
+
+    def __init__(self, config, input_sr=None, tuning_seconds=1.0):
+        """
+        Args:
+            config: Config with the feature parameters
+            input_sr: Sample rate of the incoming PCM (default: config.SAMPLE_RATE)
+            tuning_seconds: Audio used to estimate the chroma tuning
+        """
+        self.config = config
+        self.sr = config.SAMPLE_RATE
+        self.input_sr = input_sr or self.sr
+        self.n_fft = config.N_FFT
+        self.hop_length = config.HOP_LENGTH
+        self.max_samples = int(config.DURATION * self.sr)
+
+        self._resampler = None
+        if self.input_sr != self.sr and soxr is not None:
+            # soxr_mq -> 'MQ' etc.; polyphase has no streaming form, so it streams at HQ
+            quality = config.RESAMPLE_QUALITY
+            quality = quality[len('soxr_'):].upper() if quality.startswith('soxr_') else 'HQ'
+            self._resampler = soxr.ResampleStream(self.input_sr, self.sr, 1, dtype='float32', quality=quality)
+
+        self._mel_basis = mel_filterbank(self.sr, self.n_fft, config.N_MEL)
+        # Chroma tuning is estimated from the first tuning_seconds of audio, then fixed
+        self._tuning_frames = 1 + int(tuning_seconds * self.sr) // self.hop_length
+        self._pending_power = []
+        self._chroma_basis = None
+
+        # Samples not yet consumed by a complete frame; _buffer[0] is absolute sample _buffer_start
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0
+        self._first_sample = None
+        self.samples = 0  # samples received, at self.sr
+        self.frames = 0  # frames folded into the statistics
+        self.finished = False
+        self._flushing = False
+
+        self._max_db = -np.inf
+        self._log_mel_min = np.inf
+        self._log_mel_frames = []
+        self._mfcc = RunningStats(config.N_MFCC)
+        self._chroma = RunningStats(config.N_CHROMA)
+        self._mel = RunningStats(config.N_MEL)
+        self._contrast = RunningStats(config.N_CONTRAST)
+        self._zcr = RunningStats(1)
+        self._rolloff = RunningStats(1)
+        self._rms = RunningStats(1)
+
+    @property
+    def seconds(self):
+        return self.samples / self.sr
+
+    def add(self, samples):
+        """Append float samples at input_sr and process every frame that is now complete"""
+        if self.finished:
+            raise RuntimeError("Stream already finished")
+        samples = np.asarray(samples, dtype=np.float32)
+        if self.input_sr != self.sr:
+            if self._resampler is not None:
+                samples = self._resampler.resample_chunk(samples)
+            else:
+                samples = librosa.resample(samples, orig_sr=self.input_sr, target_sr=self.sr)
+        self._append(samples)
+        self._process(final=False)
+
+    def finish(self):
+        """Flush the resampler and the trailing frames (right padding as with center=True)"""
+        if self.finished:
+            return
+        if self._resampler is not None:
+            self._append(self._resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+        self._flushing = True
+        self._process(final=True)
+        self.finished = True
+
+    def _append(self, samples):
+        room = self.max_samples - self.samples
+        samples = samples[:max(room, 0)]
+        if len(samples) == 0:
+            return
+        if self._first_sample is None:
+            self._first_sample = float(samples[0])
+        self._buffer = np.concatenate([self._buffer, samples])
+        self.samples += len(samples)
+
+    def _segment(self, start, end, pad):
+        """
+        Samples [start, end) in absolute coordinates, padded outside the signal
+        with zeros (pad='constant') or the edge sample (pad='edge').
+        """
+        out = np.zeros(end - start, dtype=np.float32)
+        lo, hi = max(start, self._buffer_start), min(end, self.samples)
+        if hi > lo:
+            out[lo - start:hi - start] = self._buffer[lo - self._buffer_start:hi - self._buffer_start]
+        if pad == 'edge':
+            if start < 0:
+                out[:min(-start, len(out))] = self._first_sample
+            if end > self.samples and self.samples > 0:
+                out[max(self.samples - start, 0):] = self._buffer[-1]
+        return out
+
+    def _process(self, final):
+        if self.samples == 0:
+            return
+        half = self.n_fft // 2
+        if final:
+            total_frames = 1 + self.samples // self.hop_length
+        else:
+            # Frame t spans [t*hop - n_fft/2, t*hop + n_fft/2) and needs all of it
+            total_frames = max(0, (self.samples - half) // self.hop_length + 1)
+        if total_frames <= self.frames:
+            return
+
+        start = self.frames * self.hop_length - half
+        end = (total_frames - 1) * self.hop_length + half
+        constant = self._segment(start, end, 'constant')
+        self._fold(constant, self._segment(start, end, 'edge'))
+        self.frames = total_frames
+
+        # Drop samples no future frame will touch
+        keep_from = self.frames * self.hop_length - half
+        if keep_from > self._buffer_start:
+            self._buffer = self._buffer[keep_from - self._buffer_start:]
+            self._buffer_start = keep_from
+
+    def _fold(self, y, y_edge):
+        """Compute per-frame features for one block (center=False framing) and update the statistics"""
+        n_fft, hop, sr = self.n_fft, self.hop_length, self.sr
+        magnitude = np.abs(librosa.stft(y, n_fft=n_fft, hop_length=hop, center=False))
+        power = magnitude ** 2
+
+        log_mel = 10.0 * np.log10(np.maximum(_AMIN, self._mel_basis @ power))
+        self._update_log_spectra(log_mel)
+        self._update_chroma(power)
+        self._contrast.update(librosa.feature.spectral_contrast(
+            S=magnitude, sr=sr, n_fft=n_fft, n_bands=self.config.N_CONTRAST - 1
+        ))
+        self._rolloff.update(librosa.feature.spectral_rolloff(S=magnitude, sr=sr, n_fft=n_fft))
+        self._zcr.update(librosa.feature.zero_crossing_rate(
+            y_edge, frame_length=n_fft, hop_length=hop, center=False
+        ))
+        self._rms.update(librosa.feature.rms(y=y, frame_length=n_fft, hop_length=hop, center=False))
+
+    def _update_log_spectra(self, log_mel):
+        """
+        MFCC and mel statistics. Both clip at (loudest frame - 80 dB); when a
+        louder frame raises that floor above values already folded in, the two
+        accumulators are rebuilt from the kept log-mel frames (bounded by
+        DURATION), otherwise the new block is merged incrementally.
+        """
+        self._log_mel_frames.append(log_mel)
+        old_floor = self._max_db - _TOP_DB
+        self._max_db = max(self._max_db, float(log_mel.max()))
+        floor = self._max_db - _TOP_DB
+
+        if floor > old_floor and self._log_mel_min < floor:
+            self._mfcc = RunningStats(self.config.N_MFCC)
+            self._mel = RunningStats(self.config.N_MEL)
+            block = np.hstack(self._log_mel_frames)
+        else:
+            block = log_mel
+        self._log_mel_min = min(self._log_mel_min, float(log_mel.min()))
+
+        block = np.maximum(block, floor)
+        self._mfcc.update(scipy.fft.dct(block, axis=0, type=2, norm='ortho')[:self.config.N_MFCC])
+        # Kept relative to 0 dB; shifted by the loudest frame (ref=np.max) at snapshot time
+        self._mel.update(block)
+
+    def _chroma_basis_for(self, power):
+        tuning = float(librosa.estimate_tuning(S=power, sr=self.sr, bins_per_octave=self.config.N_CHROMA))
+        return chroma_filterbank(self.sr, self.n_fft, self.config.N_CHROMA, tuning)
+
+    def _update_chroma(self, power):
+        if self._chroma_basis is None:
+            self._pending_power.append(power)
+            if self.frames + power.shape[1] < self._tuning_frames and not self._flushing:
+                return
+            power = np.hstack(self._pending_power)
+            self._pending_power = []
+            self._chroma_basis = self._chroma_basis_for(power)
+        self._chroma.update(librosa.util.normalize(self._chroma_basis @ power, norm=np.inf, axis=0))
+
+    def _chroma_stats(self):
+        """Chroma statistics, using a provisional tuning while it is still being estimated"""
+        if not self._pending_power:
+            return self._chroma
+        power = np.hstack(self._pending_power)
+        stats = RunningStats(self.config.N_CHROMA)
+        stats.update(librosa.util.normalize(self._chroma_basis_for(power) @ power, norm=np.inf, axis=0))
+        return stats
+
+    def features(self):
+        """Current 352-dim feature vector, or None before the first frame"""
+        if self.frames == 0:
+            return None
+
+        def mean_std(stats, shift=0.0):
+            return np.concatenate([stats.mean - shift, stats.std])
+
+        mfcc = self._mfcc
+        return np.concatenate([
+            mfcc.mean, mfcc.std, mfcc.min, mfcc.max,
+            mean_std(self._chroma_stats()),
+            mean_std(self._mel, shift=self._max_db),
+            mean_std(self._contrast),
+            mean_std(self._zcr),
+            mean_std(self._rolloff),
+            mean_std(self._rms),
+        ])
+
+
+class StreamingAssessment:
+    """
+    One streamed utterance scored against a target word.
+
+    Emits a provisional result every update_interval seconds of audio once
+    min_seconds have arrived, and a final verdict when the stream ends.
+    """
+
+    def __init__(self, predictor, target_word, config, input_sr=None, sample_format='pcm16'):
+        if sample_format not in SAMPLE_WIDTHS:
+            raise ValueError(f"Unsupported sample format '{sample_format}' (expected 'pcm16' or 'f32')")
+        if config.STREAM_UPDATE_INTERVAL <= 0:
+            # feed() steps the next update time by this interval until it passes the audio received
+            raise ValueError(f"STREAM_UPDATE_INTERVAL must be > 0 seconds, got {config.STREAM_UPDATE_INTERVAL}")
+        self.predictor = predictor
+        self.target_word = target_word.lower().strip()
+        self.sample_format = sample_format
+        # Bytes of a sample split across chunks, prepended to the next one
+        self._partial_sample = b''
+        self.accumulator = StreamingFeatureAccumulator(config, input_sr, tuning_seconds=config.STREAM_MIN_SECONDS)
+        self.min_seconds = config.STREAM_MIN_SECONDS
+        self.update_interval = config.STREAM_UPDATE_INTERVAL
+        self._next_update = self.min_seconds
+
+    def check(self):
+        """Error result if the target word has no model, else None"""
+        if self.target_word not in self.predictor.models:
+            return self.predictor._missing_model_result(self.target_word)
+        return None
+
+    def _score(self, kind):
+        features = self.accumulator.features()
+        if features is None:
+            result = {'success': False, 'error': 'Not enough audio to extract features'}
+        else:
+            result = self.predictor.predict_features(features, self.target_word)
+        return {'type': kind, **result, 'seconds': round(self.accumulator.seconds, 3)}
+
+    def feed(self, data):
+        """
+        Add one raw chunk; returns a provisional result when one is due, else None.
+        Chunks needn't end on a sample boundary: the trailing bytes wait for the next one.
+        """
+        data = self._partial_sample + bytes(data)
+        whole = len(data) - len(data) % SAMPLE_WIDTHS[self.sample_format]
+        self._partial_sample = data[whole:]
+        self.accumulator.add(decode_pcm_chunk(data[:whole], self.sample_format))
+        if self.accumulator.seconds >= self._next_update and self.accumulator.frames:
+            while self._next_update <= self.accumulator.seconds:
+                self._next_update += self.update_interval
+            return self._score('provisional')
+        return None
+
+    def finish(self):
+        """Flush the stream and return the final verdict (an incomplete last sample is dropped)"""
+        self.accumulator.finish()
+        return self._score('final')
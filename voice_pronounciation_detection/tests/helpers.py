@@ -0,0 +1,7 @@
+"""
+Signal builders for the tests; they live in voice_pronounciation_detection.signals,
+which the warm-up and the benchmark scripts use as well.
+"""
+from voice_pronounciation_detection.signals import pcm16_wav, recording, synthesize, synthetic_clip
+
+__all__ = ['pcm16_wav', 'recording', 'synthesize', 'synthetic_clip']
@@ -0,0 +1,97 @@
+import asyncio
+import pickle
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('fastapi')
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from voice_pronounciation_detection import api
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.tests.helpers import pcm16_wav, synthetic_clip
+from voice_pronounciation_detection.worker_pool import PoolBusyError
+
+MODELS_PATH = Path(__file__).resolve().parent.parent / "pronunciation_models.pkl"
+
+
+@pytest.fixture
+def client():
+    config = Config()
+    config.MODEL_PATH = str(MODELS_PATH)
+    config.MODEL_RELOAD_CHECK_INTERVAL = None
+    config.FEATURE_WORKERS = 0
+    config.WARMUP_ENABLED = False
+    api.start(config)
+
+    app = FastAPI()
+    app.include_router(api.router)
+    with TestClient(app) as test_client:
+        yield test_client
+    api.stop()
+
+
+def _word():
+    with open(MODELS_PATH, 'rb') as f:
+        return next(iter(pickle.load(f)))
+
+
+def test_predict_matches_the_flask_contract(client):
+    wav = pcm16_wav(synthetic_clip(Config(), 1.0), Config.SAMPLE_RATE)
+
+    response = client.post('/pronunciation/predict', files={'audio_file': ('a.wav', wav)}, data={'target_word': _word()})
+    assert response.status_code == 200
+    assert response.json()['success'] and response.json()['prediction'] in ('Correct', 'Incorrect')
+
+    response = client.post('/pronunciation/predict', files={'audio_file': ('a.wav', wav)}, data={'target_word': 'not-a-word'})
+    assert response.status_code == 400
+
+    response = client.post('/pronunciation/predict', data={'target_word': _word()})
+    assert response.status_code == 400 and 'Missing' in response.json()['error']
+
+
+def test_batch_and_readiness(client):
+    wav = pcm16_wav(synthetic_clip(Config(), 1.0), Config.SAMPLE_RATE)
+    response = client.post(
+        '/pronunciation/predict/batch',
+        files=[('audio_files', ('a.wav', wav)), ('audio_files', ('b.wav', wav))],
+        data={'target_word': _word()}
+    )
+    assert response.status_code == 200
+    assert response.json()['count'] == 2 and [r['filename'] for r in response.json()['results']] == ['a.wav', 'b.wav']
+
+    assert client.get('/pronunciation/ready').status_code == 200
+    assert client.get('/pronunciation/workers').json()['runner']['completed'] >= 1
+
+
+def test_reload_requires_the_admin_token(client):
+    # TestClient's address isn't loopback, so without a token configured it is refused too
+    assert client.post('/pronunciation/admin/reload-models').status_code == 403
+
+    api.service.config.ADMIN_TOKEN = 'secret'
+    assert client.post('/pronunciation/admin/reload-models', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    response = client.post('/pronunciation/admin/reload-models', headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 200 and response.json()['version'] == 2
+
+
+def test_runner_rejects_beyond_its_bound():
+    runner = api.BlockingRunner(max_workers=1, max_pending=0)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(runner.run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PoolBusyError):
+            await runner.run(lambda: None)
+        release.set()
+        await running
+        return await runner.run(lambda: 42)
+
+    try:
+        assert asyncio.run(scenario()) == 42
+        assert runner.stats()['rejected'] == 1
+    finally:
+        release.set()
+        runner.shutdown()
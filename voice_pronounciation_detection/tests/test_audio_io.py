@@ -0,0 +1,92 @@
+import io
+import wave
+
+import numpy as np
+import librosa
+import pytest
+
+from voice_pronounciation_detection import audio_io
+from voice_pronounciation_detection.audio_io import decode_audio, decode_pcm_wav, decode_soundfile, guess_suffix
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.tests.helpers import pcm16_wav, synthesize
+
+sf = pytest.importorskip('soundfile')
+SR = Config.SAMPLE_RATE
+
+
+def _pcm_wav(frames, sr, sample_width, channels=1):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as w:
+        w.setnchannels(channels)
+        w.setsampwidth(sample_width)
+        w.setframerate(sr)
+        w.writeframes(frames)
+    return buffer.getvalue()
+
+
+def _soundfile_bytes(y, sr, **kwargs):
+    buffer = io.BytesIO()
+    sf.write(buffer, y, sr, **kwargs)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('subtype, width', [('PCM_U8', 1), ('PCM_16', 2), ('PCM_24', 3), ('PCM_32', 4)])
+def test_wav_fast_path_matches_soundfile(subtype, width):
+    data = _soundfile_bytes(synthesize('speech', 0.5, SR), SR, format='WAV', subtype=subtype)
+
+    fast, fast_sr = decode_pcm_wav(data)
+    reference, reference_sr = decode_soundfile(data)
+
+    assert fast_sr == reference_sr == SR
+    np.testing.assert_allclose(fast, reference, atol=1e-6)
+
+
+def test_stereo_is_averaged_to_mono():
+    left = (synthesize('tone', 0.2, SR) * 32767).astype('<i2')
+    right = np.zeros_like(left)
+    data = _pcm_wav(np.column_stack([left, right]).tobytes(), SR, 2, channels=2)
+
+    y, _ = decode_pcm_wav(data)
+
+    np.testing.assert_allclose(y, left.astype(np.float32) / 32768.0 / 2, atol=1e-6)
+
+
+def test_float_wav_and_flac_fall_back_to_soundfile(monkeypatch):
+    y = synthesize('speech', 0.5, SR)
+    float_wav = _soundfile_bytes(y, SR, format='WAV', subtype='FLOAT')
+    flac = _soundfile_bytes(y, SR, format='FLAC', subtype='PCM_16')
+
+    def no_tempfile(*args, **kwargs):
+        raise AssertionError("decoded through a temp file")
+
+    monkeypatch.setattr(audio_io, 'decode_via_tempfile', no_tempfile)
+    assert decode_pcm_wav(float_wav) is None and decode_pcm_wav(flac) is None
+    np.testing.assert_allclose(decode_audio(float_wav, sr=SR)[0], y, atol=1e-6)
+    np.testing.assert_allclose(decode_audio(flac, sr=SR)[0], y, atol=1e-4)
+
+
+def test_sources_and_duration_match_librosa_load(tmp_path):
+    data = pcm16_wav(synthesize('speech', 2.0, 16000), 16000)
+    path = tmp_path / "clip.wav"
+    path.write_bytes(data)
+    expected, _ = librosa.load(str(path), sr=SR, duration=1.5)
+
+    for source in (data, bytearray(data), io.BytesIO(data), str(path), path):
+        y, sr = decode_audio(source, sr=SR, duration=1.5)
+        assert sr == SR and y.dtype == np.float32
+        np.testing.assert_allclose(y, expected, atol=1e-5)
+
+
+def test_resampling_changes_length_by_the_rate_ratio():
+    y, sr = decode_audio(pcm16_wav(synthesize('tone', 1.0, 44100), 44100), sr=SR)
+    assert sr == SR and len(y) == SR
+
+    y, sr = decode_audio(pcm16_wav(synthesize('tone', 1.0, 16000), 16000), sr=None)
+    assert sr == 16000 and len(y) == 16000
+
+
+def test_guess_suffix():
+    assert guess_suffix(b'RIFF\0\0\0\0WAVE') == '.wav'
+    assert guess_suffix(b'\0\0\0\x20ftypM4A ') == '.m4a'
+    assert guess_suffix(b'ID3\x04') == '.mp3'
+    assert guess_suffix(b'????') == '.bin'
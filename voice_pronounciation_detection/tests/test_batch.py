@@ -0,0 +1,86 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from voice_pronounciation_detection.predictor import PronunciationPredictor
+
+MODELS_PATH = Path(__file__).resolve().parent.parent / "pronunciation_models.pkl"
+
+
+class FakeExtractor:
+    """Feature vector seeded by the source; b'bad' fails like an undecodable clip"""
+
+    def extract_all_features(self, source):
+        if source == b'bad':
+            return None
+        if source == b'boom':
+            raise ValueError("decoder crashed")
+        return np.random.default_rng(int(source)).standard_normal(352)
+
+
+class CountingModel:
+    """Wraps an SVC to count predict_proba calls and the rows they got"""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = []
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+    def predict_proba(self, X):
+        self.calls.append(len(X))
+        return self.model.predict_proba(X)
+
+
+@pytest.fixture
+def models():
+    with open(MODELS_PATH, 'rb') as f:
+        models = pickle.load(f)
+    words = list(models)[:2]
+    return {word: {**models[word], 'model': CountingModel(models[word]['model'])} for word in words}
+
+
+@pytest.mark.parametrize('executor', [None, ThreadPoolExecutor(max_workers=3)])
+def test_batch_matches_single_predictions_and_groups_by_word(models, executor):
+    first, second = models
+    predictor = PronunciationPredictor(models, FakeExtractor(), executor=executor)
+    items = [(b'1', first), (b'2', second.upper()), (b'3', first), (b'4', f" {second} "), (b'5', first)]
+
+    results = predictor.predict_batch(items)
+
+    # One stacked predict_proba per word
+    assert models[first]['model'].calls == [3] and models[second]['model'].calls == [2]
+    assert [result['index'] for result in results] == list(range(len(items)))
+    for (audio, word), result in zip(items, results):
+        single = predictor.predict(audio, word)
+        assert result['success'] and result['word'] == single['word']
+        assert result['prediction'] == single['prediction']
+        assert result['confidence'] == pytest.approx(single['confidence'])
+
+
+def test_failures_are_reported_per_item(models):
+    first, _ = models
+    predictor = PronunciationPredictor(models, FakeExtractor())
+
+    results = predictor.predict_batch([(b'1', first), (b'bad', first), (b'boom', first), (b'2', 'no-such-word')])
+
+    assert results[0]['success']
+    assert not results[1]['success'] and 'Failed to extract features' in results[1]['error']
+    assert not results[2]['success'] and 'Failed to extract features' in results[2]['error']
+    assert not results[3]['success'] and 'No model found' in results[3]['error']
+    assert [result['index'] for result in results] == [0, 1, 2, 3]
+
+
+def test_a_word_that_fails_to_score_doesnt_fail_the_others(models):
+    first, second = models
+    models[second] = {**models[second], 'scaler': None}
+    predictor = PronunciationPredictor(models, FakeExtractor())
+
+    results = predictor.predict_batch([(b'1', first), (b'2', second)])
+
+    assert results[0]['success']
+    assert not results[1]['success'] and f"Error scoring '{second}'" in results[1]['error']
@@ -0,0 +1,104 @@
+import json
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from voice_pronounciation_detection.cascade import (
+    CascadeClassifier, evaluate_cascade, fast_features_from_full, train_first_stage
+)
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.features import AudioFeatureExtractor
+from voice_pronounciation_detection.predictor import PronunciationPredictor
+from voice_pronounciation_detection.tests.helpers import pcm16_wav, synthetic_clip
+
+
+def test_fast_features_are_a_slice_of_the_full_vector():
+    config = Config()
+    engine = AudioFeatureExtractor(config).engine
+    y = synthetic_clip(config, seconds=1.5)
+
+    fast = engine.fast_features(y, config.SAMPLE_RATE)
+
+    assert fast.shape == (56,)
+    np.testing.assert_allclose(fast, fast_features_from_full(engine.extract(y, config.SAMPLE_RATE)))
+
+
+def test_extract_cascade_falls_through_below_threshold():
+    config = Config()
+    extractor = AudioFeatureExtractor(config)
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((40, 56))
+    labels = np.where(X[:, 0] > 0, 'Correct', 'Incorrect')
+    first_stage = train_first_stage(X, labels, config)
+    audio = pcm16_wav(synthetic_clip(config), config.SAMPLE_RATE)
+
+    stage, probabilities = extractor.extract_cascade(audio, first_stage, threshold=0.0)
+    assert stage == 'fast' and probabilities.shape == (2,)
+
+    stage, features = extractor.extract_cascade(audio, first_stage, threshold=1.01)
+    assert stage == 'full'
+    np.testing.assert_allclose(features, extractor.extract_all_features(audio))
+
+
+def test_holdout_evaluation_and_hit_rate():
+    holdout = {
+        'fast_confidence': np.array([0.99, 0.95, 0.6, 0.55]),
+        'fast_correct': np.array([True, False, False, True]),
+        'full_correct': np.array([True, True, True, False]),
+    }
+
+    report = evaluate_cascade(holdout, threshold=0.9)
+    assert report['hit_rate'] == 0.5
+    assert report['full_accuracy'] == 0.75
+    assert report['accuracy_delta'] == -0.25
+
+    cascade = CascadeClassifier({}, threshold=0.9, holdout=holdout)
+    for stage in ('fast', 'full', 'fast', 'fast'):
+        cascade.record(stage)
+    assert cascade.stats()['hit_rate'] == 0.75
+
+
+class _FastStageExtractor:
+    """Always answers from the first stage with fixed probabilities"""
+
+    def extract_cascade(self, source, first_stage, threshold):
+        return 'fast', np.array([0.9, 0.1])
+
+
+def test_fast_answer_reports_both_models_accuracies():
+    with open(Path(__file__).resolve().parent.parent / "pronunciation_models.pkl", 'rb') as f:
+        models = pickle.load(f)
+    word = next(iter(models))
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((40, 56))
+    first_stage = train_first_stage(X, np.where(X[:, 0] > 0, 'Correct', 'Incorrect'), Config())
+    predictor = PronunciationPredictor(
+        {word: models[word]}, _FastStageExtractor(), cascade=CascadeClassifier({word: first_stage}, threshold=0.8)
+    )
+
+    result = predictor.predict(b'', word)
+
+    assert result['stage'] == 'fast' and result['success']
+    assert result['model_accuracy'] == models[word]['accuracy']
+    assert result['cv_accuracy'] == models[word]['cv_scores'].mean()
+    assert result['first_stage_accuracy'] == first_stage['accuracy']
+    assert result['first_stage_cv_accuracy'] == first_stage['cv_scores'].mean()
+
+
+def test_first_stage_without_cross_validation_reports_no_cv_accuracy():
+    with open(Path(__file__).resolve().parent.parent / "pronunciation_models.pkl", 'rb') as f:
+        models = pickle.load(f)
+    word = next(iter(models))
+    X = np.random.default_rng(0).standard_normal((3, 56))
+    first_stage = train_first_stage(X, ['Correct', 'Correct', 'Incorrect'], Config())
+    assert len(first_stage['cv_scores']) == 0
+
+    predictor = PronunciationPredictor(
+        {word: models[word]}, _FastStageExtractor(), cascade=CascadeClassifier({word: first_stage}, threshold=0.8)
+    )
+    result = predictor.predict(b'', word)
+
+    assert result['stage'] == 'fast' and result['first_stage_cv_accuracy'] is None
+    json.dumps(result, allow_nan=False)
+
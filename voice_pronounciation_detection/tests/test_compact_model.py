@@ -0,0 +1,74 @@
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from voice_pronounciation_detection.compact_model import CompactModelBank, export_compact_models
+
+MODELS_PATH = Path(__file__).resolve().parent.parent / "pronunciation_models.pkl"
+
+
+def _load_models():
+    with open(MODELS_PATH, "rb") as f:
+        return pickle.load(f)
+
+
+def test_compact_models_match_sklearn(tmp_path):
+    models = _load_models()
+    export_compact_models(models, str(tmp_path))
+    bank = CompactModelBank(str(tmp_path))
+    rng = np.random.default_rng(0)
+
+    assert set(bank.keys()) == set(models.keys())
+    for word, model_data in models.items():
+        compact = bank[word]
+        scaler = model_data['scaler']
+        # Points around the training distribution plus the support vectors themselves
+        X = np.vstack([
+            rng.standard_normal((100, scaler.mean_.shape[0])) * scaler.scale_ + scaler.mean_,
+            model_data['model'].support_vectors_ * scaler.scale_ + scaler.mean_,
+        ])
+
+        expected_scaled = scaler.transform(X)
+        scaled = compact['scaler'].transform(X)
+        np.testing.assert_allclose(scaled, expected_scaled, rtol=1e-12, atol=1e-12)
+
+        svc = model_data['model']
+        np.testing.assert_allclose(
+            compact['model'].decision_function(scaled), svc.decision_function(expected_scaled), atol=1e-9
+        )
+        np.testing.assert_array_equal(compact['model'].predict(scaled), svc.predict(expected_scaled))
+        np.testing.assert_allclose(
+            compact['model'].predict_proba(scaled), svc.predict_proba(expected_scaled), atol=1e-9
+        )
+        assert list(compact['encoder'].classes_) == list(model_data['encoder'].classes_)
+        assert compact['accuracy'] == model_data['accuracy']
+        np.testing.assert_allclose(compact['cv_scores'], model_data['cv_scores'])
+
+
+def test_compact_arrays_are_read_only_views(tmp_path):
+    export_compact_models(_load_models(), str(tmp_path))
+    bank = CompactModelBank(str(tmp_path))
+    word = next(iter(bank))
+
+    support_vectors = bank[word]['model'].support_vectors_
+    assert not support_vectors.flags.writeable
+    assert isinstance(support_vectors.base, np.memmap) or isinstance(support_vectors, np.memmap)
+
+
+def test_re_export_leaves_open_banks_their_own_weights(tmp_path):
+    models = _load_models()
+    first, second = list(models)[:2]
+    export_compact_models({first: models[first]}, str(tmp_path))
+    old_bank = CompactModelBank(str(tmp_path))
+    expected = np.array(old_bank.array(first, 'support_vectors'))
+
+    export_compact_models({second: models[second], first: models[first]}, str(tmp_path))
+    new_bank = CompactModelBank(str(tmp_path))
+
+    # The old manifest's offsets still read the old weights; the new bank has its own file
+    np.testing.assert_array_equal(old_bank.array(first, 'support_vectors'), expected)
+    np.testing.assert_array_equal(new_bank.array(first, 'support_vectors'), expected)
+    assert new_bank.manifest['weights'] != old_bank.manifest['weights']
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.bin')] == [new_bank.manifest['weights']]
@@ -0,0 +1,92 @@
+import os
+import time
+
+import numpy as np
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.feature_cache import FeatureCache, merge_cache_stats
+
+
+def _signal(seed, n=1600):
+    return np.random.default_rng(seed).standard_normal(n).astype(np.float32)
+
+
+def _vector(value):
+    return np.full(352, value, dtype=np.float32)
+
+
+def test_memory_tier_keeps_the_most_recently_used_entries():
+    cache = FeatureCache(Config(), max_entries=2)
+    keys = [cache.key(_signal(i), 16000) for i in range(3)]
+    cache.put(keys[0], _vector(0))
+    cache.put(keys[1], _vector(1))
+    cache.get(keys[0])  # keys[1] is now the least recently used
+    cache.put(keys[2], _vector(2))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0])[0] == 0 and cache.get(keys[2])[0] == 2
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['memory_hits'] == 3 and stats['misses'] == 1
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    key = FeatureCache(Config(), max_entries=0).key(_signal(0), 16000)
+    FeatureCache(Config(), max_entries=0, disk_dir=str(tmp_path)).put(key, _vector(7))
+
+    reader = FeatureCache(Config(), max_entries=4, disk_dir=str(tmp_path))
+    features = reader.get(key)
+    assert features.shape == (352,) and features[0] == 7
+    assert reader.stats()['disk_hits'] == 1
+    # Promoted to the memory tier
+    reader.get(key)
+    assert reader.stats()['memory_hits'] == 1
+
+
+def test_key_depends_on_samples_rate_and_feature_config():
+    config = Config()
+    y = _signal(0)
+    key = FeatureCache(config).key(y, 16000)
+
+    assert FeatureCache(Config()).key(y.copy(), 16000) == key
+    assert FeatureCache(config).key(_signal(1), 16000) != key
+    assert FeatureCache(config).key(y, 22050) != key
+
+    changed = Config()
+    changed.N_MFCC = config.N_MFCC + 1
+    assert FeatureCache(changed).key(y, 16000) != key
+
+
+def test_disk_tier_evicts_least_recently_used_files(tmp_path):
+    probe = FeatureCache(Config(), max_entries=0, disk_dir=str(tmp_path / "probe"))
+    probe_key = probe.key(_signal(0), 16000)
+    probe.put(probe_key, _vector(0))
+    size = probe.stats()['disk_bytes']
+
+    cache = FeatureCache(Config(), max_entries=0, disk_dir=str(tmp_path / "cache"), disk_max_bytes=3 * size)
+    keys = [cache.key(_signal(i), 16000) for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, _vector(i))
+        # mtime is the recency order; keep it unambiguous on coarse-grained filesystems
+        os.utime(cache._disk_path(key), (time.time() - 10 + i, time.time() - 10 + i))
+    cache.get(keys[0])  # refreshed: keys[1] is now the oldest
+
+    cache.put(keys[3], _vector(3))
+
+    # Pruned to below DISK_PRUNE_TARGET of the limit: the two oldest files go
+    assert cache.get(keys[1]) is None and cache.get(keys[2]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[3]) is not None
+    stats = cache.stats()
+    assert stats['disk_evictions'] == 2 and stats['disk_bytes'] == 2 * size
+
+
+def test_merged_stats_sum_counters_across_caches():
+    first = FeatureCache(Config(), max_entries=4)
+    second = FeatureCache(Config(), max_entries=4)
+    key = first.key(_signal(0), 16000)
+    first.put(key, _vector(0))
+    first.get(key)
+    second.get(key)
+
+    merged = merge_cache_stats([first.stats(), second.stats()])
+    assert merged['caches'] == 2 and merged['entries'] == 1 and merged['max_entries'] == 8
+    assert merged['memory_hits'] == 1 and merged['misses'] == 1 and merged['hit_rate'] == 0.5
@@ -0,0 +1,36 @@
+import numpy as np
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.features import AudioFeatureExtractor
+
+SR = Config.SAMPLE_RATE
+
+
+def _clip(seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(SR * seconds)) / SR
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    return (tone + 0.02 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def test_single_pass_matches_separate_extractors():
+    extractor = AudioFeatureExtractor(Config())
+
+    for seconds in (0.5, 2.0, Config.DURATION):
+        y = _clip(seconds)
+        reference = extractor.extract_features_separately(y, SR)
+        features = extractor.engine.extract(y, SR)
+
+        assert features.shape == reference.shape == (352,)
+        np.testing.assert_allclose(features, reference, rtol=1e-4, atol=1e-4)
+
+
+def test_filterbanks_are_reused_across_clips():
+    from voice_pronounciation_detection.feature_engine import mel_filterbank
+
+    extractor = AudioFeatureExtractor(Config())
+    extractor.engine.extract(_clip(1.0, seed=1), SR)
+    hits = mel_filterbank.cache_info().hits
+    extractor.engine.extract(_clip(1.0, seed=2), SR)
+
+    assert mel_filterbank.cache_info().hits > hits
@@ -0,0 +1,33 @@
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.feature_engine import SpectralFeatureEngine
+from voice_pronounciation_detection.metrics import StageMetrics, collect_stages, server_timing_header, stage
+from voice_pronounciation_detection.tests.helpers import synthetic_clip
+
+
+def test_stages_are_collected_only_inside_a_request():
+    config = Config()
+    engine = SpectralFeatureEngine(config)
+    y = synthetic_clip(config)
+
+    with stage('outside'):
+        pass
+    with collect_stages() as timings:
+        engine.extract(y, config.SAMPLE_RATE)
+
+    names = [name for name, _ in timings]
+    assert names == ['stft', 'mel', 'mfcc', 'chroma', 'contrast', 'rolloff', 'zcr', 'rms']
+    assert all(seconds >= 0 for _, seconds in timings)
+    assert 'stft;dur=' in server_timing_header(timings)
+
+
+def test_histograms_render_in_prometheus_format():
+    metrics = StageMetrics(buckets=(0.01, 0.1))
+    metrics.observe([('decode', 0.005), ('decode', 0.05), ('scale', 1.0)])
+
+    text = metrics.render()
+
+    assert '# TYPE pronunciation_stage_seconds histogram' in text
+    assert 'pronunciation_stage_seconds_bucket{stage="decode",le="0.01"} 1' in text
+    assert 'pronunciation_stage_seconds_bucket{stage="decode",le="0.1"} 2' in text
+    assert 'pronunciation_stage_seconds_bucket{stage="scale",le="+Inf"} 1' in text
+    assert 'pronunciation_stage_seconds_count{stage="decode"} 2' in text
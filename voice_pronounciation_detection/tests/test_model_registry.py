@@ -0,0 +1,77 @@
+import os
+import pickle
+import threading
+
+import pytest
+
+from voice_pronounciation_detection.model_registry import ModelRegistry
+
+
+class EchoPredictor:
+    """Remembers the models it was built from, so a reader can check the pair is consistent"""
+
+    def __init__(self, models):
+        self.models = models
+
+
+def _write_models(path, version):
+    with open(path, 'wb') as f:
+        pickle.dump({'word': version, 'other': version}, f)
+
+
+def test_readers_always_see_a_consistent_snapshot_during_reloads(tmp_path):
+    path = tmp_path / "models.pkl"
+    _write_models(path, 0)
+    registry = ModelRegistry(str(path), build_predictor=EchoPredictor)
+    registry.load()
+
+    stop = threading.Event()
+    problems = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = registry.get()
+            if snapshot.predictor.models is not snapshot.models or len(set(snapshot.models.values())) != 1:
+                problems.append(snapshot.version)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for version in range(1, 30):
+            _write_models(path, version)
+            registry.reload()
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+    assert problems == []
+    assert registry.get().version == 30 and registry.get().models['word'] == 29
+
+
+def test_failed_reload_keeps_the_served_snapshot(tmp_path):
+    path = tmp_path / "models.pkl"
+    _write_models(path, 1)
+    registry = ModelRegistry(str(path), build_predictor=EchoPredictor)
+    served = registry.load()
+
+    path.write_bytes(b'not a pickle')
+    with pytest.raises(Exception):
+        registry.reload()
+
+    assert registry.get() is served
+    stats = registry.stats()
+    assert stats['loaded'] and stats['version'] == 1 and stats['error']
+
+
+def test_hot_reload_picks_up_a_changed_file(tmp_path):
+    path = tmp_path / "models.pkl"
+    _write_models(path, 1)
+    registry = ModelRegistry(str(path), build_predictor=EchoPredictor, check_interval=0)
+    registry.load()
+
+    _write_models(path, 2)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+
+    assert registry.get().models['word'] == 2
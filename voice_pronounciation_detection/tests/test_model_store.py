@@ -0,0 +1,78 @@
+import os
+
+from voice_pronounciation_detection.model_registry import ModelRegistry
+from voice_pronounciation_detection.model_store import WordModelStore, export_model_store, is_model_store
+
+
+def _models(count):
+    return {f"word {i}": {'model': f"model-{i}", 'accuracy': i / count} for i in range(count)}
+
+
+def test_export_round_trips_every_word(tmp_path):
+    models = _models(5)
+    models['a/b'] = {'model': 'slash'}
+    export_model_store(models, str(tmp_path))
+
+    store = WordModelStore(str(tmp_path))
+    assert is_model_store(str(tmp_path))
+    assert set(store) == set(models) and len(store) == 6
+    assert all(store[word] == models[word] for word in models)
+    assert 'missing' not in store and store.get('missing') is None
+
+
+def test_least_recently_used_word_is_evicted_and_reloaded(tmp_path):
+    export_model_store(_models(4), str(tmp_path))
+    store = WordModelStore(str(tmp_path), max_models=2)
+
+    store['word 0']
+    store['word 1']
+    store['word 0']  # word 1 is now the least recently used
+    store['word 2']
+
+    stats = store.stats()
+    assert stats['resident_words'] == 2 and stats['evictions'] == 1
+    assert stats['hits'] == 1 and stats['misses'] == 3
+
+    # The evicted word is read from disk again on its next use
+    assert store['word 1'] == {'model': 'model-1', 'accuracy': 0.25}
+    assert store.stats()['misses'] == 4 and store.stats()['evictions'] == 2
+
+
+def test_byte_limit_keeps_at_least_the_word_just_loaded(tmp_path):
+    export_model_store(_models(3), str(tmp_path))
+    store = WordModelStore(str(tmp_path), max_bytes=1)
+
+    for word in store.keys():
+        assert store[word]['model'].startswith('model-')
+        assert store.stats()['resident_words'] == 1
+
+
+def test_re_export_leaves_a_live_store_its_own_artifacts(tmp_path):
+    export_model_store(_models(3), str(tmp_path))
+    old_store = WordModelStore(str(tmp_path))
+    first_files = set(os.listdir(tmp_path))
+
+    retrained = {word: {**data, 'model': f"retrained {word}"} for word, data in _models(3).items()}
+    export_model_store(retrained, str(tmp_path))
+
+    # Cold words of the old index still load the old models; a new store gets the new ones
+    assert old_store['word 1']['model'] == 'model-1'
+    assert WordModelStore(str(tmp_path))['word 1']['model'] == 'retrained word 1'
+    assert not any(name.endswith('.tmp') for name in os.listdir(tmp_path))
+
+    # One export later, files neither index refers to are removed
+    export_model_store({word: retrained[word] for word in ('word 0', 'word 1')}, str(tmp_path))
+    remaining = set(os.listdir(tmp_path))
+    assert not (first_files - {'index.json'}) & remaining
+    assert len([name for name in remaining if name.endswith('.pkl')]) == 3
+
+
+def test_registry_serves_a_store_and_reloads_a_re_export(tmp_path):
+    export_model_store(_models(3), str(tmp_path))
+    registry = ModelRegistry(str(tmp_path), build_predictor=lambda models: models, store_options={'max_models': 2})
+    registry.load()
+    assert isinstance(registry.get().models, WordModelStore) and registry.stats()['store']['max_models'] == 2
+
+    export_model_store(_models(5), str(tmp_path))
+    registry.reload()
+    assert registry.get().model_count == 5 and registry.get().version == 2
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from voice_pronounciation_detection.compact_model import CompactModelBank, export_compact_models
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.reduction import transform_features
+from voice_pronounciation_detection.training import train_word
+from voice_pronounciation_detection.word_ranker import WordRanker
+
+
+def _config(reduction, components):
+    config = Config()
+    config.REDUCTION = reduction
+    config.REDUCTION_COMPONENTS = components
+    return config
+
+
+@pytest.fixture(scope='module')
+def models():
+    rng = np.random.default_rng(0)
+    models = {}
+    for i, (reduction, components) in enumerate([('pca', 0.9), ('pca', 12), ('select', 40), ('none', 0)]):
+        X = rng.standard_normal((60, 352)) * rng.uniform(0.5, 3, 352) + rng.uniform(-2, 2, 352)
+        labels = np.where(X[:, i] + X[:, 100 + i] > 0, 'Correct', 'Incorrect')
+        models[f"word{i}"] = train_word(X, labels, _config(reduction, components))
+    return models
+
+
+def _correct_probability(model_data, x):
+    proba = model_data['model'].predict_proba(transform_features(model_data, x))[0]
+    return proba[list(model_data['encoder'].classes_).index('Correct')]
+
+
+def test_projection_shrinks_the_svc_input(models):
+    assert models['word1']['projection'].n_components == 12
+    assert models['word1']['model'].support_vectors_.shape[1] == 12
+    assert models['word2']['model'].support_vectors_.shape[1] == 40
+    assert 'projection' not in models['word3']
+
+
+def test_ranker_and_compact_models_apply_the_projection(models, tmp_path):
+    export_compact_models(models, str(tmp_path))
+    bank = CompactModelBank(str(tmp_path))
+    X = np.random.default_rng(1).standard_normal((5, 352))
+
+    for ranker in (WordRanker(models, dtype=np.float64), WordRanker(bank, dtype=np.float64)):
+        probabilities = ranker.correct_probabilities(X)
+        for x, row in zip(X, probabilities):
+            expected = [_correct_probability(models[word], x) for word in ranker.words]
+            np.testing.assert_allclose(row, expected, atol=1e-6)
+
+    for word in models:
+        np.testing.assert_allclose(
+            bank[word]['model'].predict_proba(transform_features(bank[word], X)),
+            models[word]['model'].predict_proba(transform_features(models[word], X)),
+            atol=1e-9
+        )
@@ -0,0 +1,54 @@
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import librosa
+import pytest
+
+from voice_pronounciation_detection.audio_io import RESAMPLE_QUALITIES, decode_audio
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.feature_engine import SpectralFeatureEngine
+from voice_pronounciation_detection.tests.helpers import pcm16_wav, synthesize
+from voice_pronounciation_detection.word_ranker import WordRanker
+
+MODELS_PATH = Path(__file__).resolve().parent.parent / "pronunciation_models.pkl"
+SR = Config.SAMPLE_RATE
+
+
+@lru_cache(maxsize=1)
+def _ranker():
+    with open(MODELS_PATH, "rb") as f:
+        return WordRanker(pickle.load(f), dtype=np.float64)
+
+
+def test_native_rate_skips_resampling(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("resampler called for native-rate input")
+
+    monkeypatch.setattr(librosa, 'resample', fail)
+    y, sr = decode_audio(pcm16_wav(synthesize('speech', 1.0, SR), SR), sr=SR)
+
+    assert sr == SR and len(y) == SR
+
+
+@pytest.mark.parametrize('quality', RESAMPLE_QUALITIES)
+@pytest.mark.parametrize('native_sr', [16000, 44100, 48000])
+def test_features_within_tolerance_of_training_resampler(quality, native_sr):
+    engine = SpectralFeatureEngine(Config())
+    ranker = _ranker()
+    data = pcm16_wav(synthesize('speech', 2.0, native_sr), native_sr)
+
+    reference, _ = decode_audio(data, sr=SR, quality='soxr_hq')
+    y, sr = decode_audio(data, sr=SR, quality=quality)
+    expected = engine.extract(reference, SR)
+    features = engine.extract(y, SR)
+
+    assert sr == SR
+    # Band-edge features move with the anti-aliasing filter, so compare in the
+    # models' own scaled units and on what they output
+    z = np.abs(features - expected) / ranker.scales.min(axis=0)
+    assert z.mean() < 0.6
+    np.testing.assert_allclose(
+        ranker.correct_probabilities(features), ranker.correct_probabilities(expected), atol=0.01
+    )
@@ -0,0 +1,63 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.features import AudioFeatureExtractor
+from voice_pronounciation_detection.predictor import PronunciationPredictor
+from voice_pronounciation_detection.segmentation import SegmentationError, fit_to_count
+from voice_pronounciation_detection.tests.helpers import pcm16_wav, synthetic_clip
+
+MODELS_PATH = Path(__file__).resolve().parent.parent / "pronunciation_models.pkl"
+SR = Config.SAMPLE_RATE
+
+
+def _utterance(word_seconds, pause=0.5):
+    """Synthetic words separated by quiet pauses, plus the true [start, end) of each word in seconds"""
+    rng = np.random.default_rng(0)
+    config = Config()
+    parts, spans, t = [], [], pause
+    parts.append(0.002 * rng.standard_normal(int(pause * SR)))
+    for i, seconds in enumerate(word_seconds):
+        parts.append(synthetic_clip(config, seconds, seed=i))
+        spans.append((t, t + seconds))
+        parts.append(0.002 * rng.standard_normal(int(pause * SR)))
+        t += seconds + pause
+    return np.concatenate(parts).astype(np.float32), spans
+
+
+def test_segments_follow_the_pauses():
+    y, spans = _utterance([0.6, 0.9, 0.5])
+    segments = AudioFeatureExtractor(Config()).segmenter.segment(y, SR, 3)
+
+    assert len(segments) == 3
+    for segment, (start, end) in zip(segments, spans):
+        assert abs(segment.start / SR - start) < 0.3
+        assert abs(segment.end / SR - end) < 0.3
+    assert all(a.end <= b.start for a, b in zip(segments, segments[1:]))
+
+
+def test_region_count_is_fitted_to_the_word_list():
+    levels = np.zeros(100)
+    levels[50] = -40
+    assert fit_to_count([(0, 10), (12, 20), (40, 60)], 2, levels, 2) == [(0, 20), (40, 60)]
+    assert fit_to_count([(0, 100)], 2, levels, 2) == [(0, 50), (50, 100)]
+    with pytest.raises(SegmentationError):
+        fit_to_count([(0, 4)], 3, levels, 2)
+
+
+def test_utterance_is_scored_per_word():
+    with open(MODELS_PATH, 'rb') as f:
+        models = pickle.load(f)
+    predictor = PronunciationPredictor(models, AudioFeatureExtractor(Config()))
+    words = list(models)[:2] + ['not-a-word']
+    y, _ = _utterance([0.6, 0.8, 0.7])
+
+    result = predictor.predict_utterance(pcm16_wav(y, SR), words)
+
+    assert result['success'] and result['count'] == 3 and result['failed'] == 1
+    assert [r['word'] for r in result['results']] == words
+    assert result['results'][0]['prediction'] in ('Correct', 'Incorrect')
+    assert result['results'][0]['end'] <= result['results'][1]['start']
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.feature_engine import SpectralFeatureEngine
+from voice_pronounciation_detection.streaming import RunningStats, StreamingAssessment, StreamingFeatureAccumulator
+from voice_pronounciation_detection.tests.helpers import synthetic_clip
+
+
+def test_running_stats_match_full_reductions():
+    block = np.random.default_rng(0).standard_normal((5, 97))
+    stats = RunningStats(5)
+    for start in range(0, 97, 10):
+        stats.update(block[:, start:start + 10])
+
+    np.testing.assert_allclose(stats.mean, block.mean(axis=1))
+    np.testing.assert_allclose(stats.std, block.std(axis=1))
+    np.testing.assert_array_equal(stats.min, block.min(axis=1))
+    np.testing.assert_array_equal(stats.max, block.max(axis=1))
+
+
+def test_streamed_features_match_batch_extraction():
+    config = Config()
+    y = synthetic_clip(config, seconds=2.3)
+    expected = SpectralFeatureEngine(config).extract(y, config.SAMPLE_RATE)
+
+    accumulator = StreamingFeatureAccumulator(config)
+    for start in range(0, len(y), 777):
+        accumulator.add(y[start:start + 777])
+    assert accumulator.features() is not None  # provisional vector before the end
+    accumulator.finish()
+
+    np.testing.assert_allclose(accumulator.features(), expected, rtol=1e-4, atol=1e-3)
+
+
+class _EchoPredictor:
+    models = {'cat': None}
+
+    def predict_features(self, features, target_word):
+        return {'success': True}
+
+
+def test_chunks_split_inside_a_sample_are_carried_over():
+    config = Config()
+    y = synthetic_clip(config, seconds=1.2)
+    pcm = (np.clip(y, -1.0, 1.0 - 1 / 32768) * 32768).astype('<i2')
+
+    expected = StreamingFeatureAccumulator(config, tuning_seconds=config.STREAM_MIN_SECONDS)
+    expected.add(pcm.astype(np.float32) / 32768.0)
+    expected.finish()
+
+    session = StreamingAssessment(_EchoPredictor(), 'cat', config)
+    data = pcm.tobytes()
+    for start in range(0, len(data), 777):  # odd sizes: every other chunk ends mid-sample
+        session.feed(data[start:start + 777])
+    final = session.finish()
+
+    assert final['type'] == 'final' and final['success']
+    assert session.accumulator.samples == len(pcm)
+    np.testing.assert_allclose(session.accumulator.features(), expected.features(), rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize('interval', [0.0, -0.5])
+def test_non_positive_update_interval_is_rejected(interval):
+    config = Config()
+    config.STREAM_UPDATE_INTERVAL = interval
+    with pytest.raises(ValueError, match='STREAM_UPDATE_INTERVAL'):
+        StreamingAssessment(_EchoPredictor(), 'cat', config)
@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.predictor import PronunciationPredictor
+from voice_pronounciation_detection.training import (
+    FeatureMatrix, Sample, config_digest, scan_dataset, train_models, train_word
+)
+from voice_pronounciation_detection.tests.helpers import pcm16_wav, synthetic_clip
+
+
+def _write_dataset(root, words=('apple', 'ball'), per_label=6):
+    config = Config()
+    for word in words:
+        for label, gain in (('Correct', 1.0), ('Incorrect', 0.2)):
+            folder = root / word / label
+            folder.mkdir(parents=True)
+            for i in range(per_label):
+                y = gain * synthetic_clip(config, seconds=0.5, seed=i)
+                (folder / f"{i:03d}.wav").write_bytes(pcm16_wav(y, config.SAMPLE_RATE))
+
+
+def test_feature_matrix_is_cached_across_runs(tmp_path, capsys):
+    _write_dataset(tmp_path / 'data', words=('apple',), per_label=2)
+    samples = scan_dataset(str(tmp_path / 'data'))
+    cache_path = str(tmp_path / 'features.npz')
+
+    first = FeatureMatrix.build(samples, Config(), cache_path=cache_path, workers=1)
+    second = FeatureMatrix.build(samples, Config(), cache_path=cache_path, workers=1)
+
+    assert first.X.shape == (4, 352)
+    assert 'Features: 4 cached, 0 to extract' in capsys.readouterr().out
+    np.testing.assert_array_equal(first.X, second.X)
+
+
+def test_digest_covers_the_decoding_settings():
+    config = Config()
+    digest = config_digest(config)
+    config.RESAMPLE_QUALITY = 'soxr_vhq' if config.RESAMPLE_QUALITY != 'soxr_vhq' else 'soxr_hq'
+    assert config_digest(config) != digest
+    config = Config()
+    config.VAD_ENABLED = not config.VAD_ENABLED
+    assert config_digest(config) != digest
+
+
+def test_trained_models_have_the_serving_layout(tmp_path):
+    _write_dataset(tmp_path / 'data')
+    matrix = FeatureMatrix.build(scan_dataset(str(tmp_path / 'data')), Config(), workers=2)
+
+    models, skipped = train_models(matrix, Config(), workers=2)
+
+    assert sorted(models) == ['apple', 'ball'] and skipped == {}
+    for model_data in models.values():
+        assert set(model_data) == {'model', 'scaler', 'encoder', 'accuracy', 'cv_scores'}
+        assert list(model_data['encoder'].classes_) == ['Correct', 'Incorrect']
+        assert 0.0 <= model_data['accuracy'] <= 1.0 and len(model_data['cv_scores']) >= 2
+
+
+def test_too_few_clips_to_cross_validate_reports_no_cv_accuracy():
+    config = Config()
+    config.CV_FOLDS = 1
+    rng = np.random.default_rng(0)
+    X = np.vstack([rng.standard_normal((6, 352)) + 2, rng.standard_normal((6, 352)) - 2])
+    labels = np.array(['Correct'] * 6 + ['Incorrect'] * 6)
+
+    model_data = train_word(X, labels, config)
+    assert len(model_data['cv_scores']) == 0
+
+    predictor = PronunciationPredictor({'apple': model_data}, feature_extractor=None)
+    result = predictor.predict_features(X[0], 'apple')
+    assert result['success'] and result['cv_accuracy'] is None
+    json.dumps(result, allow_nan=False)
+
+    # Models trained before scores could be empty stored [nan]
+    legacy = PronunciationPredictor({'apple': {**model_data, 'cv_scores': np.array([np.nan])}}, feature_extractor=None)
+    assert legacy.predict_features(X[0], 'apple')['cv_accuracy'] is None
+
+
+def test_a_word_that_fails_to_train_is_skipped():
+    rng = np.random.default_rng(0)
+    samples = [Sample(word, label, f"{word}-{label}-{i}.wav")
+               for word in ('apple', 'ball') for label in ('Correct', 'Incorrect') for i in range(6)]
+    X = rng.standard_normal((len(samples), 352))
+    X[:12] += np.repeat([[1.0], [-1.0]], 6, axis=0)
+    X[12] = np.nan  # ball can't be trained
+
+    models, skipped = train_models(FeatureMatrix(samples, X), Config(), workers=1)
+
+    assert list(models) == ['apple']
+    assert list(skipped) == ['ball'] and skipped['ball'].startswith('training failed: ')
+
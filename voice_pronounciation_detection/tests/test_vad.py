@@ -0,0 +1,32 @@
+import numpy as np
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.tests.helpers import recording
+from voice_pronounciation_detection.vad import VoiceActivityTrimmer
+
+SR = Config.SAMPLE_RATE
+
+
+def test_trims_silence_around_word():
+    config = Config()
+    trimmer = VoiceActivityTrimmer(config)
+    y = recording(config, seconds=4.0, word_seconds=0.6)
+
+    trimmed, info = trimmer.trim(y, SR)
+
+    word_start, word_end = (4.0 - 0.6) / 2, (4.0 + 0.6) / 2
+    assert info['trimmed']
+    assert info['start'] <= word_start and info['end'] >= word_end
+    assert info['end'] - info['start'] < 0.6 + 2 * config.VAD_PADDING + 0.2
+    assert info['frames_trimmed'] == info['frames'] - (1 + len(trimmed) // config.HOP_LENGTH)
+    assert trimmer.stats()['frames_trimmed'] == info['frames_trimmed']
+
+
+def test_leaves_noise_only_clip_untouched():
+    trimmer = VoiceActivityTrimmer(Config())
+    y = 0.01 * np.random.default_rng(0).standard_normal(2 * SR).astype(np.float32)
+
+    trimmed, info = trimmer.trim(y, SR)
+
+    assert not info['trimmed']
+    assert len(trimmed) == len(y)
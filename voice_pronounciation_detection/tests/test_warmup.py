@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import numpy as np
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.feature_cache import FeatureCache
+from voice_pronounciation_detection.features import AudioFeatureExtractor
+from voice_pronounciation_detection.model_registry import ModelRegistry
+from voice_pronounciation_detection.predictor import PronunciationPredictor
+from voice_pronounciation_detection.tests.helpers import pcm16_wav, synthetic_clip
+from voice_pronounciation_detection.warmup import ServiceWarmup, warm_extractor
+
+MODELS_PATH = Path(__file__).resolve().parent.parent / "pronunciation_models.pkl"
+
+
+def test_warm_extractor_matches_extraction_and_leaves_cache_alone():
+    config = Config()
+    extractor = AudioFeatureExtractor(config, cache=FeatureCache(config, max_entries=8))
+
+    features = warm_extractor(extractor)
+
+    assert features.shape == (352,)
+    assert extractor.cache.stats()['entries'] == extractor.cache.stats()['misses'] == 0
+    # The last warm-up clip went through the 16 kHz -> SAMPLE_RATE resampler
+    y, sr = extractor.load_audio(pcm16_wav(synthetic_clip(config, sr=16000), 16000))
+    np.testing.assert_allclose(features, extractor.engine.extract(y, sr))
+
+
+def test_service_is_ready_only_after_warmup():
+    config = Config()
+    extractor = AudioFeatureExtractor(config)
+    registry = ModelRegistry(str(MODELS_PATH), build_predictor=lambda models: PronunciationPredictor(models, extractor))
+    registry.load()
+    warmup = ServiceWarmup(config, extractor, registry)
+
+    assert not warmup.ready
+    warmup.run()
+
+    stats = warmup.stats()
+    assert stats['ready'] and stats['errors'] == {}
+    assert set(stats['steps']) == {'extraction', 'streaming', 'inference'}
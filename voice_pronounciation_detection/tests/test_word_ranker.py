@@ -0,0 +1,51 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from voice_pronounciation_detection.compact_model import CompactModelBank, export_compact_models
+from voice_pronounciation_detection.word_ranker import WordRanker
+
+MODELS_PATH = Path(__file__).resolve().parent.parent / "pronunciation_models.pkl"
+
+
+def _load_models():
+    with open(MODELS_PATH, "rb") as f:
+        return pickle.load(f)
+
+
+def _expected_correct_probabilities(models, words, x):
+    expected = []
+    for word in words:
+        model_data = models[word]
+        proba = model_data['model'].predict_proba(model_data['scaler'].transform(x.reshape(1, -1)))[0]
+        expected.append(proba[list(model_data['encoder'].classes_).index('Correct')])
+    return np.array(expected)
+
+
+def test_ranker_matches_per_word_models():
+    models = _load_models()
+    ranker = WordRanker(models)
+    scaler = next(iter(models.values()))['scaler']
+    X = np.random.default_rng(0).standard_normal((8, scaler.mean_.shape[0])) * scaler.scale_ + scaler.mean_
+
+    probabilities = ranker.correct_probabilities(X)
+    assert probabilities.shape == (len(X), len(models))
+    for x, row in zip(X, probabilities):
+        np.testing.assert_allclose(row, _expected_correct_probabilities(models, ranker.words, x), atol=1e-5)
+
+    ranking = ranker.rank(X[0], top_n=3)
+    assert [r['probability'] for r in ranking] == sorted((r['probability'] for r in ranking), reverse=True)
+    assert ranking[0]['word'] == ranker.words[int(np.argmax(ranker.correct_probabilities(X[0])))]
+
+
+def test_ranker_accepts_compact_models(tmp_path):
+    models = _load_models()
+    export_compact_models(models, str(tmp_path))
+    x = next(iter(models.values()))['scaler'].mean_
+
+    np.testing.assert_allclose(
+        WordRanker(CompactModelBank(str(tmp_path))).correct_probabilities(x),
+        WordRanker(models).correct_probabilities(x),
+        atol=1e-9
+    )
@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from voice_pronounciation_detection.config import Config
+from voice_pronounciation_detection.tests.helpers import pcm16_wav, synthetic_clip
+from voice_pronounciation_detection.worker_pool import (
+    ExtractionTimeoutError, FeatureWorkerPool, PoolBusyError, PooledFeatureExtractor
+)
+
+WORKERS = 2
+MAX_QUEUE = 1
+
+
+# Jobs run in the workers with the same signature as the pool's own: job(payload, *args, timed)
+
+def _wait_for_file_job(payload, path, timed=False):
+    while not os.path.exists(path):
+        time.sleep(0.01)
+    return os.getpid(), None
+
+
+def _sleep_job(payload, seconds, timed=False):
+    time.sleep(seconds)
+    return None, None
+
+
+def _crash_job(payload, timed=False):
+    os._exit(1)
+
+
+@pytest.fixture(scope='module')
+def pool():
+    config = Config()
+    config.FEATURE_CACHE_SIZE = 0
+    config.FEATURE_CACHE_DIR = None
+    pool = FeatureWorkerPool(config, workers=WORKERS, max_queue=MAX_QUEUE, job_timeout=30, start_method='fork')
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_start_initializes_every_worker(pool):
+    # Each startup ping waited for all the others, so every worker process answered one
+    assert len(pool.stats()['pids']) == WORKERS
+    assert set(pool.stats()['pids']) == set(pool._executor._processes)
+
+
+def test_admission_rejects_beyond_workers_plus_queue(pool, tmp_path):
+    path = str(tmp_path / "release")
+    rejected = pool.stats()['rejected']
+    futures = [pool.submit(b'', _wait_for_file_job, path) for _ in range(WORKERS + MAX_QUEUE)]
+
+    with pytest.raises(PoolBusyError):
+        pool.submit(b'', _wait_for_file_job, path)
+    assert pool.stats()['rejected'] == rejected + 1 and pool.stats()['in_flight'] == WORKERS + MAX_QUEUE
+
+    open(path, 'w').close()
+    for future in futures:
+        future.result(timeout=30)
+    # Slots are released by a done-callback that may run just after result() returns
+    deadline = time.monotonic() + 5
+    while pool.stats()['in_flight'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.stats()['in_flight'] == 0
+    pool.submit(b'', _sleep_job, 0).result(timeout=30)
+
+
+def _wait_for_stats(pool, key, value):
+    # Stats kept by done-callbacks may update just after a future completes
+    deadline = time.monotonic() + 5
+    while pool.stats()[key] != value and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.stats()[key] == value
+
+
+def test_slow_job_times_out(pool):
+    pool.job_timeout, pool.max_stuck_jobs = 0.2, 2
+    try:
+        with pytest.raises(ExtractionTimeoutError):
+            pool._wait(*pool._submit(b'', _sleep_job, 1.0))
+        # The caller gave up, but the job still holds its worker until it finishes
+        assert pool.stats()['timeouts'] == 1 and pool.stats()['stuck'] == 1
+        _wait_for_stats(pool, 'stuck', 0)
+    finally:
+        pool.job_timeout, pool.max_stuck_jobs = 30, 1
+
+
+def test_stuck_jobs_recycle_the_pool(pool):
+    stuck_executor = pool._executor
+    restarts = pool.stats()['restarts']
+    pool.job_timeout = 0.2
+    try:
+        with pytest.raises(ExtractionTimeoutError):
+            pool._wait(*pool._submit(b'', _sleep_job, 60))
+    finally:
+        pool.job_timeout = 30
+
+    # max_stuck_jobs (1) reached: the worker was killed and the pool replaced
+    assert pool.stats()['restarts'] == restarts + 1 and pool._executor is not stuck_executor
+    _wait_for_stats(pool, 'stuck', 0)
+    _wait_for_stats(pool, 'in_flight', 0)
+    pool.submit(b'', _sleep_job, 0).result(timeout=30)
+
+
+def test_killed_worker_restarts_the_pool(pool):
+    restarts = pool.stats()['restarts']
+    with pytest.raises(BrokenProcessPool):
+        pool._wait(*pool._submit(b'', _crash_job))
+    assert pool.stats()['restarts'] == restarts + 1
+
+    # The replacement pool serves real extractions
+    wav = pcm16_wav(synthetic_clip(pool.config, 1.0), pool.config.SAMPLE_RATE)
+    assert PooledFeatureExtractor(pool).extract_all_features(wav).shape == (352,)
+
+
+def test_stale_broken_executor_does_not_restart_the_current_pool(pool):
+    current = pool._executor
+    restarts = pool.stats()['restarts']
+
+    pool._restart(object())  # a pool another thread already replaced
+
+    assert pool._executor is current and pool.stats()['restarts'] == restarts
+
+
+def test_restart_starts_the_replacement_outside_the_lock(pool, monkeypatch):
+    launch, started = pool._launch, threading.Event()
+
+    def slow_launch():
+        started.wait(30)
+        return launch()
+
+    monkeypatch.setattr(pool, '_launch', slow_launch)
+    broken = pool._executor
+    restarts = pool.stats()['restarts']
+    restarter = threading.Thread(target=pool._restart, args=(broken,))
+    restarter.start()
+    try:
+        # stats() answers while the replacement is still starting
+        deadline = time.monotonic() + 5
+        while pool.stats()['restarts'] == restarts and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.stats()['restarts'] == restarts + 1 and pool._executor is broken
+
+        pool._restart(broken)  # a second caller doesn't start another pool
+        assert pool.stats()['restarts'] == restarts + 1
+    finally:
+        started.set()
+        restarter.join(60)
+
+    assert pool._executor is not broken and len(pool.stats()['pids']) == WORKERS
+    pool.submit(b'', _sleep_job, 0).result(timeout=30)
+
+
+def test_cache_stats_are_collected_from_the_workers():
+    config = Config()
+    config.FEATURE_CACHE_SIZE = 8
+    config.FEATURE_CACHE_DIR = None
+    cached_pool = FeatureWorkerPool(config, workers=1, max_queue=0, job_timeout=30, start_method='fork')
+    cached_pool.start()
+    try:
+        wav = pcm16_wav(synthetic_clip(config, 1.0), config.SAMPLE_RATE)
+        extractor = PooledFeatureExtractor(cached_pool)
+        extractor.extract_all_features(wav)
+        extractor.extract_all_features(wav)
+        # Stats arrive with the job's result, recorded by a done-callback
+        deadline = time.monotonic() + 5
+        while cached_pool.cache_stats()['memory_hits'] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stats = cached_pool.cache_stats()
+        assert stats['caches'] == 1 and stats['entries'] == 1
+        assert stats['memory_hits'] == 1 and stats['misses'] == 1
+    finally:
+        cached_pool.shutdown()
@@ -0,0 +1,255 @@
+"""
+Training pipeline for the per-word pronunciation models.
+
+Walks a labelled dataset directory, extracts every clip's features once into a
+cached feature matrix (rows are reused while a file's size and mtime don't
+change), then trains and cross-validates each word's SVC in its own process.
+The result has the {'model','scaler','encoder','accuracy','cv_scores'} layout
+the predictor serves, plus 'projection' when REDUCTION is enabled.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from voice_pronounciation_detection.feature_cache import FEATURE_VERSION, feature_config_fields
+from voice_pronounciation_detection.reduction import make_projection, to_linear_projection
+
+LABELS = ('Correct', 'Incorrect')
+AUDIO_SUFFIXES = ('.wav', '.flac', '.ogg', '.mp3', '.m4a')
+N_FEATURES = 352
+
+# Rows are cached by file, so decoding settings matter as well: resampling quality,
+# and VAD, which changes the extracted features as much as the feature parameters do
+_DECODE_CONFIG_FIELDS = ('RESAMPLE_QUALITY',)
+_VAD_CONFIG_FIELDS = (
+    'VAD_ENABLED', 'VAD_ENERGY_MARGIN_DB', 'VAD_ZCR_THRESHOLD', 'VAD_NOISE_PERCENTILE',
+    'VAD_MIN_DYNAMIC_DB', 'VAD_PADDING', 'VAD_MIN_SECONDS'
+)
+
+
+@dataclass(frozen=True)
+class Sample:
+    """One labelled recording"""
+    word: str
+    label: str
+    path: str
+
+
+def scan_dataset(data_dir: str) -> List[Sample]:
+    """
+    Labelled recordings under data_dir, laid out as
+
+        <data_dir>/<word>/Correct/*.wav
+        <data_dir>/<word>/Incorrect/*.wav
+    """
+    samples = []
+    for word_name in sorted(os.listdir(data_dir)):
+        word_dir = os.path.join(data_dir, word_name)
+        if not os.path.isdir(word_dir):
+            continue
+        word = word_name.lower().strip()
+        for label in LABELS:
+            label_dir = os.path.join(word_dir, label)
+            if not os.path.isdir(label_dir):
+                continue
+            for file_name in sorted(os.listdir(label_dir)):
+                if file_name.lower().endswith(AUDIO_SUFFIXES):
+                    samples.append(Sample(word, label, os.path.join(label_dir, file_name)))
+    return samples
+
+
+def config_digest(config) -> str:
+    """Feature, decoding and VAD parameters a cached feature matrix was built with"""
+    fields = feature_config_fields() + _DECODE_CONFIG_FIELDS + _VAD_CONFIG_FIELDS
+    return repr([FEATURE_VERSION] + [getattr(config, name) for name in fields])
+
+
+# ---- feature extraction (worker processes) ----
+
+_extractor = None
+
+
+def _init_extractor(config):
+    global _extractor
+    from voice_pronounciation_detection.features import AudioFeatureExtractor
+    _extractor = AudioFeatureExtractor(config)
+
+
+def _extract_path(path):
+    return _extractor.extract_all_features(path)
+
+
+class FeatureMatrix:
+    """
+    Features of every sample, persisted as one .npz.
+
+    Each row is keyed by path, file size and mtime; rebuilding with the same
+    config only extracts new or changed files. Rows that fail to decode are
+    dropped (and retried on the next build).
+    """
+
+    def __init__(self, samples: List[Sample], X: np.ndarray):
+        self.samples = samples
+        self.X = X
+
+    @staticmethod
+    def _stamp(path):
+        stat = os.stat(path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    @classmethod
+    def build(cls, samples: List[Sample], config, cache_path: Optional[str] = None,
+              workers: Optional[int] = None) -> "FeatureMatrix":
+        """
+        Args:
+            samples: Recordings to extract (see scan_dataset)
+            config: Config with the feature parameters
+            cache_path: .npz file reused and rewritten across runs (None = no cache)
+            workers: Extraction processes (default: all cores)
+        """
+        digest = config_digest(config)
+        cached = {}
+        if cache_path and os.path.exists(cache_path):
+            with np.load(cache_path, allow_pickle=False) as data:
+                if str(data['digest']) == digest:
+                    cached = {(str(p), str(s)): row for p, s, row in zip(data['paths'], data['stamps'], data['X'])}
+
+        stamps = [cls._stamp(sample.path) for sample in samples]
+        rows: List[Optional[np.ndarray]] = [cached.get((sample.path, stamp)) for sample, stamp in zip(samples, stamps)]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        print(f"Features: {len(samples) - len(missing)} cached, {len(missing)} to extract")
+
+        if missing:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_extractor, initargs=(config,)) as pool:
+                for i, features in zip(missing, pool.map(_extract_path, [samples[i].path for i in missing], chunksize=8)):
+                    rows[i] = features
+
+        keep = [i for i, row in enumerate(rows) if row is not None]
+        if len(keep) < len(samples):
+            print(f"Skipped {len(samples) - len(keep)} recordings that could not be decoded")
+        X = np.vstack([rows[i] for i in keep]) if keep else np.empty((0, N_FEATURES))
+        matrix = cls([samples[i] for i in keep], X)
+
+        if cache_path:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+            tmp_path = f"{cache_path}.tmp.npz"
+            np.savez(
+                tmp_path,
+                digest=np.array(digest),
+                paths=np.array([samples[i].path for i in keep], dtype=str),
+                stamps=np.array([stamps[i] for i in keep], dtype=str),
+                X=X
+            )
+            os.replace(tmp_path, cache_path)
+        return matrix
+
+    def words(self) -> List[str]:
+        return sorted({sample.word for sample in self.samples})
+
+    def word_data(self, word: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature rows and labels of one word"""
+        index = [i for i, sample in enumerate(self.samples) if sample.word == word]
+        return self.X[index], np.array([self.samples[i].label for i in index])
+
+
+# ---- per-word training ----
+
+def train_word(X: np.ndarray, labels: np.ndarray, config) -> Dict[str, Any]:
+    """
+    Fit one word's scaler, optional projection (config.REDUCTION) and RBF SVC.
+
+    accuracy is measured on a held-out split (config.TEST_SIZE, stratified);
+    cv_scores come from config.CV_FOLDS-fold cross-validation on the training split
+    and are empty when a label has fewer than 2 training clips.
+    """
+    from sklearn.model_selection import StratifiedKFold, cross_val_score, train_test_split
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+    from sklearn.svm import SVC
+
+    encoder = LabelEncoder()
+    y = encoder.fit_transform(labels)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE, stratify=y
+    )
+
+    def make_svc():
+        return SVC(kernel=config.SVM_KERNEL, C=config.SVM_C, gamma=config.SVM_GAMMA,
+                   probability=True, random_state=config.RANDOM_STATE)
+
+    folds = min(config.CV_FOLDS, int(np.bincount(y_train).min()))
+    if folds >= 2:
+        # Scaling and projection inside the pipeline keep each fold's validation rows out of their fit
+        cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=config.RANDOM_STATE)
+        fold_rows = len(X_train) * (folds - 1) // folds
+        steps = [StandardScaler(), make_projection(config, fold_rows, X.shape[1]), make_svc()]
+        cv_scores = cross_val_score(make_pipeline(*[s for s in steps if s is not None]), X_train, y_train, cv=cv)
+    else:
+        cv_scores = np.empty(0)
+
+    scaler = StandardScaler().fit(X_train)
+    X_train_scaled, X_test_scaled = scaler.transform(X_train), scaler.transform(X_test)
+    projection = make_projection(config, len(X_train), X.shape[1])
+    if projection is not None:
+        projection = to_linear_projection(projection.fit(X_train_scaled, y_train))
+        X_train_scaled, X_test_scaled = projection.transform(X_train_scaled), projection.transform(X_test_scaled)
+
+    model = make_svc().fit(X_train_scaled, y_train)
+    model_data = {
+        'model': model,
+        'scaler': scaler,
+        'encoder': encoder,
+        'accuracy': float(model.score(X_test_scaled, y_test)),
+        'cv_scores': np.asarray(cv_scores)
+    }
+    if projection is not None:
+        model_data['projection'] = projection
+    return model_data
+
+
+def _train_job(word, X, labels, config):
+    return word, train_word(X, labels, config)
+
+
+def trainable_words(matrix: FeatureMatrix, min_per_label: int) -> Tuple[List[str], Dict[str, str]]:
+    """Words with at least min_per_label clips of each label, and the reason each other word was skipped"""
+    words, skipped = [], {}
+    for word in matrix.words():
+        _, labels = matrix.word_data(word)
+        counts = {label: int(np.sum(labels == label)) for label in LABELS}
+        if min(counts.values()) < min_per_label:
+            skipped[word] = f"need at least {min_per_label} clips of each label, got {counts}"
+        else:
+            words.append(word)
+    return words, skipped
+
+
+def train_models(matrix: FeatureMatrix, config, workers: Optional[int] = None,
+                 min_per_label: int = 5) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Train every word with enough data, one process per word at a time.
+
+    A word whose training fails is skipped with the error; the others still train.
+
+    Returns:
+        (word -> model data, word -> reason for the words that were skipped)
+    """
+    words, skipped = trainable_words(matrix, min_per_label)
+    models = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_train_job, word, *matrix.word_data(word), config) for word in words]
+        for word, future in zip(words, futures):
+            try:
+                _, model_data = future.result()
+            except Exception as e:
+                skipped[word] = f"training failed: {e}"
+                print(f"[SKIP] {word}: {skipped[word]}")
+                continue
+            models[word] = model_data
+            cv_scores = model_data['cv_scores']
+            cv = f"{np.mean(cv_scores):.3f}" if len(cv_scores) else "n/a"
+            print(f"[OK] {word}: accuracy {model_data['accuracy']:.3f}, cv {cv}")
+    return models, skipped
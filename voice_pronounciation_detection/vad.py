@@ -0,0 +1,105 @@
+"""
+Energy / zero-crossing voice activity detection.
+Crops a recording to its voiced region (plus padding) before feature
+extraction, so silence and room noise around a short word neither cost
+extraction time nor dominate the mean/std statistics.
+"""
+import threading
+
+import numpy as np
+import librosa
+
+
+class VoiceActivityTrimmer:
+    """
+    Frames are classified on RMS level relative to the clip's noise floor (a
+    low percentile of frame levels): a frame is voiced if it is
+    VAD_ENERGY_MARGIN_DB above the floor, or half that with a zero-crossing
+    rate above VAD_ZCR_THRESHOLD (quiet fricatives at word edges). The clip is
+    cropped to the first..last voiced frame plus VAD_PADDING seconds each side.
+    Clips without a clear level difference are returned unchanged.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.frame_length = config.N_FFT
+        self.hop_length = config.HOP_LENGTH
+        self._lock = threading.Lock()
+        self.clips = 0
+        self.trimmed_clips = 0
+        self.frames_in = 0
+        self.frames_trimmed = 0
+
+    def _feature_frames(self, n_samples):
+        """STFT frames the feature extractors see for n_samples (center=True)"""
+        return 1 + n_samples // self.hop_length
+
+    def frame_levels(self, y):
+        """Per-frame RMS level (dB) and zero-crossing rate, on the feature extractors' framing"""
+        rms = librosa.feature.rms(y=y, frame_length=self.frame_length, hop_length=self.hop_length)[0]
+        zcr = librosa.feature.zero_crossing_rate(y, frame_length=self.frame_length, hop_length=self.hop_length)[0]
+        return librosa.amplitude_to_db(rms, ref=1.0, amin=1e-5, top_db=None), zcr
+
+    def voiced_mask(self, y, levels=None):
+        """
+        Per-frame voiced flags, or None when no voiced region can be told apart from the floor.
+        levels: frame_levels(y), if already computed
+        """
+        level_db, zcr = levels if levels is not None else self.frame_levels(y)
+
+        floor_db = np.percentile(level_db, self.config.VAD_NOISE_PERCENTILE)
+        if level_db.max() - floor_db < self.config.VAD_MIN_DYNAMIC_DB:
+            return None
+
+        margin = self.config.VAD_ENERGY_MARGIN_DB
+        loud = level_db > floor_db + margin
+        fricative = (level_db > floor_db + margin / 2) & (zcr > self.config.VAD_ZCR_THRESHOLD)
+        return loud | fricative
+
+    def trim(self, y, sr):
+        """
+        Crop y to its voiced region.
+
+        Returns:
+            (y_trimmed, info) where info has start/end (seconds), frames (feature
+            frames before trimming), frames_trimmed and trimmed (bool)
+        """
+        frames = self._feature_frames(len(y))
+        start, end = 0, len(y)
+
+        mask = self.voiced_mask(y) if len(y) > self.frame_length else None
+        if mask is not None and mask.any():
+            voiced = np.flatnonzero(mask)
+            padding = int(self.config.VAD_PADDING * sr)
+            # Frame t is centred on sample t * hop
+            start = max(0, voiced[0] * self.hop_length - self.frame_length // 2 - padding)
+            end = min(len(y), voiced[-1] * self.hop_length + self.frame_length // 2 + padding)
+            if end - start < int(self.config.VAD_MIN_SECONDS * sr):
+                start, end = 0, len(y)
+
+        y_trimmed = y[start:end]
+        frames_trimmed = frames - self._feature_frames(len(y_trimmed))
+        with self._lock:
+            self.clips += 1
+            self.frames_in += frames
+            self.frames_trimmed += frames_trimmed
+            if frames_trimmed:
+                self.trimmed_clips += 1
+
+        return y_trimmed, {
+            'start': start / sr,
+            'end': end / sr,
+            'frames': frames,
+            'frames_trimmed': frames_trimmed,
+            'trimmed': bool(frames_trimmed)
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                'clips': self.clips,
+                'trimmed_clips': self.trimmed_clips,
+                'frames_in': self.frames_in,
+                'frames_trimmed': self.frames_trimmed,
+                'trimmed_fraction': self.frames_trimmed / self.frames_in if self.frames_in else 0.0
+            }
@@ -0,0 +1,144 @@
+"""
+Startup warm-up for the pronunciation service.
+librosa's numba kernels compile on first use, so every serving path (decode,
+resample, VAD, shared-STFT features, streaming, inference, ranking) is run once
+on a synthetic clip before the process reports itself ready.
+"""
+import threading
+import time
+
+from voice_pronounciation_detection.model_store import WordModelStore
+from voice_pronounciation_detection.signals import pcm16_wav, synthetic_clip
+from voice_pronounciation_detection.streaming import StreamingAssessment
+from voice_pronounciation_detection.worker_pool import PooledFeatureExtractor
+
+# Non-native input rate used to compile the resampling path (typical phone/browser capture)
+WARMUP_RESAMPLE_RATE = 16000
+
+
+def warm_extractor(extractor, seconds=1.0):
+    """
+    Decode and extract a synthetic WAV at the model rate and at WARMUP_RESAMPLE_RATE.
+
+    Calls the stages directly rather than extract_all_features, so a disk cache
+    hit can't skip the compilation and warm-up clips stay out of the cache and
+    VAD statistics. Returns the last feature vector.
+    """
+    config = extractor.config
+    features = None
+    for input_sr in (config.SAMPLE_RATE, WARMUP_RESAMPLE_RATE):
+        y, sr = extractor.load_audio(pcm16_wav(synthetic_clip(config, seconds, sr=input_sr), input_sr))
+        if extractor.trimmer is not None:
+            extractor.trimmer.voiced_mask(y)
+        features = extractor.engine.extract(y, sr)
+    return features
+
+
+def warm_streaming(predictor, word, config, chunk_seconds=0.25):
+    """Stream a synthetic clip at both input rates through StreamingAssessment; returns the final features"""
+    seconds = config.STREAM_MIN_SECONDS + 2 * config.STREAM_UPDATE_INTERVAL
+    features = None
+    for input_sr in (config.SAMPLE_RATE, WARMUP_RESAMPLE_RATE):
+        session = StreamingAssessment(predictor, word, config, input_sr=input_sr)
+        pcm = (synthetic_clip(config, seconds, sr=input_sr) * 32767).astype('<i2').tobytes()
+        chunk = 2 * int(chunk_seconds * input_sr)
+        for start in range(0, len(pcm), chunk):
+            session.feed(pcm[start:start + chunk])
+        result = session.finish()
+        if not result['success']:
+            raise RuntimeError(f"Streaming warm-up failed: {result.get('error')}")
+        features = session.accumulator.features()
+    return features
+
+
+class ServiceWarmup:
+    """
+    Runs the warm-up once per process and reports readiness.
+
+    Each step is timed; a failing step is logged and recorded but doesn't keep
+    the process unready forever, since a slow first request beats no traffic.
+    """
+
+    def __init__(self, config, feature_extractor, model_registry):
+        """
+        Args:
+            config: Config of the service
+            feature_extractor: AudioFeatureExtractor, or PooledFeatureExtractor whose
+                workers warm themselves when the pool starts
+            model_registry: ModelRegistry whose current snapshot is warmed
+        """
+        self.config = config
+        self.feature_extractor = feature_extractor
+        self.model_registry = model_registry
+        self._done = threading.Event()
+        self._thread = None
+        self.steps = {}
+        self.errors = {}
+        self.started_at = None
+        self.seconds = None
+
+    @property
+    def ready(self):
+        """True once the warm-up finished and models are loaded"""
+        return self._done.is_set() and self.model_registry.get() is not None
+
+    def _step(self, name, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        except Exception as e:
+            self.errors[name] = str(e)
+            print(f"Warm-up step '{name}' failed: {e}")
+            return None
+        finally:
+            self.steps[name] = time.perf_counter() - start
+
+    def _warm_inference(self, snapshot, word, features):
+        snapshot.predictor.predict_features(features, word)
+        # Ranking needs every model in memory; a lazy store would lose its LRU bound
+        if not isinstance(snapshot.models, WordModelStore):
+            snapshot.predictor.ranker.rank(features)
+
+    def run(self):
+        """Warm every code path in this process, then mark the service ready"""
+        self.started_at = time.time()
+        start = time.perf_counter()
+        try:
+            if not isinstance(self.feature_extractor, PooledFeatureExtractor):
+                self._step('extraction', warm_extractor, self.feature_extractor)
+
+            snapshot = self.model_registry.get()
+            if snapshot is None or not snapshot.model_count:
+                self.errors['models'] = 'No models loaded'
+                return
+            word = next(iter(snapshot.models.keys()))
+            features = self._step('streaming', warm_streaming, snapshot.predictor, word, self.config)
+            if features is not None:
+                self._step('inference', self._warm_inference, snapshot, word, features)
+        finally:
+            self.seconds = time.perf_counter() - start
+            self._done.set()
+            print(f"✓ Warm-up finished in {self.seconds:.2f}s")
+
+    def start(self):
+        """Run the warm-up in a background thread so the server can answer /ready meanwhile"""
+        self._thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+        self._thread.start()
+
+    def skip(self):
+        """Report ready without warming (WARMUP_ENABLED=0)"""
+        self._done.set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def stats(self):
+        return {
+            'ready': self.ready,
+            'warmed_up': self._done.is_set(),
+            'models_loaded': self.model_registry.get() is not None,
+            'started_at': self.started_at,
+            'seconds': self.seconds,
+            'steps': dict(self.steps),
+            'errors': dict(self.errors)
+        }
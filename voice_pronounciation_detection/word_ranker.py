@@ -0,0 +1,146 @@
+"""
+"Which word was said" ranking across all per-word models in one vectorized pass.
+"""
+import numpy as np
+
+from voice_pronounciation_detection.compact_model import (
+    MIN_PROB, CompactSVC, sigmoid_predict, model_arrays, two_class_probability
+)
+
+
+def _word_parameters(model_data):
+    """Arrays and scalars of one word's model, from sklearn objects or a CompactModelBank entry"""
+    svc = model_data['model']
+    if isinstance(svc, CompactSVC):
+        params = {
+            'support_vectors': svc.support_vectors_,
+            'dual_coef': svc.dual_coef_,
+            'scaler_mean': model_data['scaler'].mean_,
+            'scaler_scale': model_data['scaler'].scale_,
+            'intercept': svc.intercept_,
+            'gamma': svc.gamma,
+            'prob_a': svc.prob_a,
+            'prob_b': svc.prob_b,
+            'classes': list(model_data['encoder'].classes_),
+        }
+    else:
+        exported = model_arrays(model_data)
+        params = {**exported.pop('arrays'), **exported}
+    # Projections are handled in their dense form (a selection becomes rows of the identity)
+    projection = model_data.get('projection')
+    params['projection_mean'] = None if projection is None else projection.mean_
+    params['projection_components'] = None if projection is None else projection.components_
+    return params
+
+
+class WordRanker:
+    """
+    Scores a feature vector against every word's SVC at once.
+
+    Each word has its own scaler, so the scaling is folded into the stacked
+    support vectors ahead of time: with x_w = (x - m_w) / s_w,
+
+        sv_j . x_w = (sv_j / s_w) . x - (sv_j . m_w / s_w)
+
+    so one (n_support_total x n_features) matrix-vector product gives the dot
+    products for all words. Squared distances, RBF kernels, per-word decision
+    values (a segmented sum) and Platt probabilities then follow elementwise.
+
+    A word with a projection z_w = P_w (x_w - mu_w) has support vectors in the
+    projected space; they are lifted back with sv_j . z_w = (sv_j P_w) . x_w -
+    sv_j . (P_w mu_w), and its ||z_w||^2 comes from one stacked affine map of x.
+    """
+
+    def __init__(self, models, dtype=np.float32):
+        """
+        Args:
+            models: word -> model data (dict, WordModelStore or CompactModelBank)
+            dtype: dtype of the stacked projection matrix; float32 halves memory
+                and is well within ranking precision
+        """
+        self.words = list(models.keys())
+        params = [_word_parameters(models[word]) for word in self.words]
+
+        self.means = np.stack([p['scaler_mean'] for p in params]).astype(np.float64)
+        self.scales = np.stack([p['scaler_scale'] for p in params]).astype(np.float64)
+        counts = np.array([len(p['dual_coef']) for p in params])
+        self.offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.intp)
+        word_index = np.repeat(np.arange(len(params)), counts)
+
+        lifted, lifted_shift = [], []
+        for p in params:
+            sv = np.asarray(p['support_vectors'], dtype=np.float64)
+            components = p['projection_components']
+            if components is None:
+                lifted.append(sv)
+                lifted_shift.append(np.zeros(len(sv)))
+            else:
+                lifted.append(sv @ components)
+                lifted_shift.append(sv @ (components @ p['projection_mean']))
+        support_vectors = np.vstack(lifted)
+        self.projection = (support_vectors / self.scales[word_index]).astype(dtype)
+        self.shift = (
+            np.einsum('ij,ij->i', support_vectors, self.means[word_index] / self.scales[word_index])
+            + np.concatenate(lifted_shift)
+        )
+        self.sv_sq_norms = np.concatenate([
+            np.einsum('ij,ij->i', p['support_vectors'], p['support_vectors']) for p in params
+        ])
+
+        # z_w = (P_w / s_w) x - P_w (m_w / s_w + mu_w), stacked over the projected words
+        projected = [i for i, p in enumerate(params) if p['projection_components'] is not None]
+        self.projected_words = np.array(projected, dtype=np.intp)
+        if projected:
+            maps = [params[i]['projection_components'] / self.scales[i] for i in projected]
+            self.word_maps = np.vstack(maps)
+            self.word_map_shift = np.concatenate([
+                params[i]['projection_components'] @ (self.means[i] / self.scales[i] + params[i]['projection_mean'])
+                for i in projected
+            ])
+            self.word_map_offsets = np.concatenate([[0], np.cumsum([len(m) for m in maps])[:-1]]).astype(np.intp)
+        self.dual_coef = np.concatenate([p['dual_coef'] for p in params])
+        self.sv_gamma = np.array([p['gamma'] for p in params])[word_index]
+        self.word_index = word_index
+
+        self.intercepts = np.array([p['intercept'] for p in params])
+        self.prob_a = np.array([p['prob_a'] for p in params])
+        self.prob_b = np.array([p['prob_b'] for p in params])
+        # Column of predict_proba that holds P(Correct) for each word
+        self.correct_column = np.array([p['classes'].index('Correct') for p in params])
+
+    def correct_probabilities(self, features):
+        """
+        P(Correct) of every word model for each feature vector.
+
+        Args:
+            features: (n_features,) or (n_clips, n_features)
+
+        Returns:
+            (n_words,) or (n_clips, n_words) array
+        """
+        X = np.atleast_2d(np.asarray(features, dtype=np.float64))
+
+        scaled = (X[:, None, :] - self.means[None]) / self.scales[None]       # (n, W, d)
+        x_sq_norms = np.einsum('nwd,nwd->nw', scaled, scaled)                 # (n, W)
+        if len(self.projected_words):
+            z = X @ self.word_maps.T - self.word_map_shift                     # (n, K)
+            x_sq_norms[:, self.projected_words] = np.add.reduceat(z * z, self.word_map_offsets, axis=1)
+        dots = (X.astype(self.projection.dtype) @ self.projection.T) - self.shift  # (n, N)
+
+        sq_dist = x_sq_norms[:, self.word_index] + self.sv_sq_norms - 2.0 * dots
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        weighted = np.exp(-self.sv_gamma * sq_dist) * self.dual_coef
+        decision = np.add.reduceat(weighted, self.offsets, axis=1) + self.intercepts  # (n, W)
+
+        pairwise = sigmoid_predict(-decision.ravel(), np.tile(self.prob_a, len(X)), np.tile(self.prob_b, len(X)))
+        proba = two_class_probability(np.clip(pairwise, MIN_PROB, 1 - MIN_PROB))
+        correct = proba[np.arange(len(proba)), np.tile(self.correct_column, len(X))].reshape(decision.shape)
+        return correct[0] if np.ndim(features) == 1 else correct
+
+    def rank(self, features, top_n=5):
+        """Top-N words by P(Correct) for one feature vector"""
+        probabilities = self.correct_probabilities(features)
+        top_n = min(top_n, len(self.words))
+        top = np.argpartition(-probabilities, top_n - 1)[:top_n]
+        top = top[np.argsort(-probabilities[top])]
+        return [{'word': self.words[i], 'probability': float(probabilities[i])} for i in top]
@@ -0,0 +1,340 @@
+"""
+Process pool for CPU-bound feature extraction.
+Workers are started and warmed (librosa imported, numba kernels compiled) up
+front; the web process only does I/O and SVM inference.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from voice_pronounciation_detection.audio_io import read_source
+from voice_pronounciation_detection.feature_cache import merge_cache_stats
+from voice_pronounciation_detection.metrics import add_timings, collect_stages, collecting
+
+
+class PoolBusyError(Exception):
+    """Raised when the extraction queue is full; the caller should answer 503"""
+
+
+class ExtractionTimeoutError(Exception):
+    """Raised when a job doesn't finish within the per-job timeout"""
+
+
+# ---- worker process side ----
+
+_worker_extractor = None
+_worker_barrier = None
+
+# Seconds the startup pings wait for every worker to come up (initializer included)
+START_TIMEOUT = 300
+
+
+def _init_worker(config, barrier=None):
+    """Build the extractor once per worker and run the decode/feature paths once to compile numba kernels"""
+    global _worker_extractor, _worker_barrier
+    _worker_barrier = barrier
+    from voice_pronounciation_detection.feature_cache import build_feature_cache
+    from voice_pronounciation_detection.features import AudioFeatureExtractor
+    from voice_pronounciation_detection.warmup import warm_extractor
+
+    # Each worker has its own memory tier; the disk tier (if configured) is shared
+    _worker_extractor = AudioFeatureExtractor(config, cache=build_feature_cache(config))
+    warm_extractor(_worker_extractor)
+
+
+def _ping():
+    """Startup ping: blocks until every worker holds one, so each process answers exactly one"""
+    if _worker_barrier is not None:
+        _worker_barrier.wait(START_TIMEOUT)
+    return os.getpid()
+
+
+def _run_job(job, payload, *job_args, timed=False):
+    """Run job(payload, *job_args, timed) and report this worker's pid and feature cache stats with its result"""
+    result, timings = job(payload, *job_args, timed=timed)
+    cache = _worker_extractor.cache if _worker_extractor is not None else None
+    return result, timings, os.getpid(), (cache.stats() if cache is not None else None)
+
+
+def _extract_job(source, timed=False):
+    """Features for one source, plus the worker's stage timings when the caller is collecting them"""
+    if not timed:
+        features, timings = _worker_extractor.extract_all_features(source), None
+    else:
+        with collect_stages() as timings:
+            features = _worker_extractor.extract_all_features(source)
+    # Cache hits may be memory-mapped; send a plain array back to the web process
+    return (None if features is None else np.asarray(features)), timings
+
+
+def _cascade_job(source, first_stage, threshold, timed=False):
+    """extract_cascade for one source, plus the worker's stage timings when the caller is collecting them"""
+    if not timed:
+        (stage, value), timings = _worker_extractor.extract_cascade(source, first_stage, threshold), None
+    else:
+        with collect_stages() as timings:
+            stage, value = _worker_extractor.extract_cascade(source, first_stage, threshold)
+    return (stage, None if value is None else np.asarray(value)), timings
+
+
+def _segments_job(source, n_words, timed=False):
+    """extract_segments for one source, plus the worker's stage timings when the caller is collecting them"""
+    if not timed:
+        result, timings = _worker_extractor.extract_segments(source, n_words), None
+    else:
+        with collect_stages() as timings:
+            result = _worker_extractor.extract_segments(source, n_words)
+    return result, timings
+
+
+# ---- web process side ----
+
+class FeatureWorkerPool:
+    """
+    Bounded pool of warmed extraction processes.
+
+    At most workers + max_queue jobs are admitted at once; further submissions
+    raise PoolBusyError immediately instead of queueing without bound. A job
+    that exceeds the timeout raises ExtractionTimeoutError; a job that already
+    started keeps its slot (and its worker) until it actually finishes, so
+    admission control never over-commits the workers. Once max_stuck_jobs
+    timed-out jobs are still running, the pool is recycled: its workers are
+    killed (failing their other jobs with BrokenProcessPool) and replaced.
+    """
+
+    def __init__(self, config, workers, max_queue, job_timeout, start_method=None, max_stuck_jobs=None):
+        """
+        Args:
+            config: Config passed to every worker's AudioFeatureExtractor
+            workers: Number of worker processes
+            max_queue: Jobs allowed to wait on top of the ones being processed
+            job_timeout: Seconds a caller waits for a job before giving up
+            start_method: multiprocessing start method (default: fork where available)
+            max_stuck_jobs: Timed-out jobs allowed to keep running before the workers are
+                killed and restarted (default: half the workers, at least 1)
+        """
+        self.config = config
+        self.workers = workers
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout
+        self.max_stuck_jobs = max_stuck_jobs if max_stuck_jobs is not None else max(1, workers // 2)
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.start_method = start_method
+
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._restarting = False  # A replacement pool is being started (see _restart)
+        self.pids = []  # Worker processes, as reported by their startup pings
+        self._cache_stats = {}  # pid -> that worker's feature cache stats, as of its last job
+        self._stuck = set()  # Futures of timed-out jobs that are still running
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    def start(self):
+        """Start all workers now and wait until each has run its warm-up"""
+        executor, pids = self._launch()
+        with self._lock:
+            self._executor, self.pids, self._cache_stats = executor, pids, {}
+        print(f"✓ Feature worker pool ready: {len(pids)} processes ({self.start_method})")
+
+    def _launch(self):
+        """A new executor with every worker started and warmed, and the workers' pids (touches no pool state)"""
+        context = multiprocessing.get_context(self.start_method)
+        # Workers inherit the barrier at process start (it can't be sent with a job)
+        barrier = context.Barrier(self.workers)
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.config, barrier)
+        )
+        try:
+            # One ping per worker; each waits at the barrier, so no warmed worker can answer
+            # for a cold one and every process has finished its initializer before we return
+            pids = sorted({f.result() for f in [executor.submit(_ping) for _ in range(self.workers)]})
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        return executor, pids
+
+    def _restart(self, broken_executor, kill=False):
+        """
+        Replace a pool whose worker died (BrokenProcessPool), or with kill=True
+        one whose workers are held by timed-out jobs.
+
+        The replacement starts and warms up (up to START_TIMEOUT) without holding
+        the lock, so stats() and slot releases don't wait on it; until it is
+        swapped in, submissions fail fast on the broken pool.
+        """
+        with self._lock:
+            if self._executor is not broken_executor or self._restarting:
+                return  # another thread already restarted it, or is doing so
+            self._restarting = True
+            self.restarts += 1
+        if kill:
+            # shutdown() alone would let the running jobs finish; their futures fail with BrokenProcessPool
+            for process in list(broken_executor._processes.values()):
+                process.terminate()
+        broken_executor.shutdown(wait=False, cancel_futures=True)
+
+        try:
+            executor, pids = self._launch()
+        except BaseException:
+            with self._lock:
+                self._restarting = False
+            raise
+
+        with self._lock:
+            self._restarting = False
+            if self._executor is broken_executor:
+                self._executor, self.pids, self._cache_stats = executor, pids, {}
+                executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)  # the pool was shut down meanwhile
+        else:
+            print(f"✓ Feature worker pool restarted: {len(pids)} processes")
+
+    def _release(self, future):
+        cache_stats = None
+        if not future.cancelled() and future.exception() is None:
+            _, _, pid, cache_stats = future.result()
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            if cache_stats is not None:
+                self._cache_stats[pid] = cache_stats
+        self._slots.release()
+
+    def submit(self, source, job=_extract_job, *job_args):
+        """Admit one extraction job (job(source, *job_args, timed)) or raise PoolBusyError"""
+        return self._submit(source, job, *job_args)[0]
+
+    def _submit(self, source, job=_extract_job, *job_args):
+        """submit(), also returning the executor the job went to (the one to restart if it breaks)"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PoolBusyError("Feature extraction queue is full")
+
+        # Only bytes or paths cross the process boundary
+        payload = read_source(source)
+        executor = self._executor
+        try:
+            future = executor.submit(_run_job, job, payload, *job_args, timed=collecting())
+        except BrokenProcessPool:
+            self._slots.release()
+            self._restart(executor)
+            raise
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.in_flight += 1
+        future.add_done_callback(self._release)
+        return future, executor
+
+    def extract(self, source):
+        """Run extract_all_features in a worker and wait for the result"""
+        return self._wait(*self._submit(source))
+
+    def extract_cascade(self, source, first_stage, threshold):
+        """Run extract_cascade in a worker and wait for the result"""
+        return self._wait(*self._submit(source, _cascade_job, first_stage, threshold))
+
+    def extract_segments(self, source, n_words):
+        """Run extract_segments in a worker and wait for the result"""
+        return self._wait(*self._submit(source, _segments_job, n_words))
+
+    def _wait(self, future, executor):
+        """
+        Args:
+            future: The job's future
+            executor: The executor it was submitted to; only that one is restarted if
+                it broke, never a replacement another thread already started
+        """
+        try:
+            result, timings, _, _ = future.result(timeout=self.job_timeout)
+            add_timings(timings)
+            return result
+        except FutureTimeoutError:
+            future.cancel()  # only works while the job is still queued
+            stuck = not future.done()
+            with self._lock:
+                self.timeouts += 1
+                if stuck:
+                    self._stuck.add(future)
+                recycle = len(self._stuck) >= self.max_stuck_jobs
+            if stuck:
+                future.add_done_callback(self._unstick)
+            if recycle:
+                self._restart(executor, kill=True)
+            raise ExtractionTimeoutError(f"Feature extraction took longer than {self.job_timeout}s")
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+
+    def _unstick(self, future):
+        with self._lock:
+            self._stuck.discard(future)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'pids': self.pids,
+                'max_queue': self.max_queue,
+                'job_timeout': self.job_timeout,
+                'in_flight': self.in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'stuck': len(self._stuck),  # timed-out jobs still holding a worker
+                'max_stuck_jobs': self.max_stuck_jobs,
+                'restarts': self.restarts
+            }
+
+    def cache_stats(self):
+        """
+        Feature cache stats summed over the current workers (see merge_cache_stats).
+
+        Each job brings back its worker's stats, so a worker that hasn't served a
+        job since the pool (re)started isn't counted yet; 'caches' says how many are.
+        """
+        with self._lock:
+            return merge_cache_stats([stats for pid, stats in self._cache_stats.items() if pid in self.pids])
+
+
+class PooledFeatureExtractor:
+    """Drop-in for AudioFeatureExtractor.extract_all_features that runs in the worker pool"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.config = pool.config
+
+    def extract_all_features(self, source):
+        return self.pool.extract(source)
+
+    def extract_cascade(self, source, first_stage, threshold):
+        return self.pool.extract_cascade(source, first_stage, threshold)
+
+    def extract_segments(self, source, n_words, executor=None):
+        # executor is ignored: one job decodes the recording and extracts its segments one after
+        # another in a worker, so an utterance takes a single admission slot and can't be rejected
+        # half-way; the pool parallelizes across requests
+        return self.pool.extract_segments(source, n_words)